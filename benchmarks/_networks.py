@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+from functools import cache
+from typing import ClassVar
+
+import numpy as np
+
+from earthkit.hydro._backends.find import get_array_backend
+from earthkit.hydro._readers import from_cama_nextxy, from_d8
+from earthkit.hydro._readers._core import create_network
+from earthkit.hydro.data_structures import RiverNetwork
+
+# name: (n_nodes, depth, branching)
+SYNTHETIC_NETWORKS = {
+    "chain_1e5": (100_000, 1_000, 1),
+    "binary_1e5": (100_000, 16, 2),
+    "bushy_1e5": (100_000, 5, 8),
+    "binary_1e6": (1_000_000, 19, 2),
+}
+
+# small hand-made networks of the test suite, to track the fixed overhead per call
+TEST_NETWORKS = ["d8_ldd_1", "cama_nextxy_1"]
+
+NETWORKS = TEST_NETWORKS + list(SYNTHETIC_NETWORKS)
+
+BACKENDS = ["numpy", "torch", "jax"]
+
+
+def synthetic_network(n_nodes, depth, branching):
+    """
+    Creates a forest of identical complete trees.
+
+    Every tree has its sink at depth 0 and each node above `depth` has `branching`
+    upstream nodes, so `depth` controls the number of levels of the topological sort
+    and `branching` its width. Trees are repeated until there are `n_nodes` nodes, the
+    last one being truncated.
+    """
+    if branching == 1:
+        tree_size = depth + 1
+    else:
+        tree_size = (branching ** (depth + 1) - 1) // (branching - 1)
+    tree_size = min(tree_size, n_nodes)
+
+    nodes = np.arange(n_nodes)
+    tree_start = nodes - nodes % tree_size
+    local = nodes - tree_start
+    has_downstream = local > 0
+    upstream_indices = nodes[has_downstream]
+    downstream_indices = (tree_start + (local - 1) // branching)[has_downstream]
+
+    nx = int(np.ceil(np.sqrt(n_nodes)))
+    shape = (int(np.ceil(n_nodes / nx)), nx)
+    missing_mask = np.zeros(shape[0] * shape[1], dtype=bool)
+    missing_mask[:n_nodes] = True
+
+    storage = create_network(upstream_indices, downstream_indices, missing_mask, shape)
+    storage.coords = {"y": np.arange(shape[0]), "x": np.arange(shape[1])}
+    return storage
+
+
+def small_network(name):
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+    try:
+        from _test_inputs import readers
+    finally:
+        sys.path.pop(0)
+
+    flow_directions = getattr(readers, name)
+    if name.startswith("d8_ldd"):
+        storage = from_d8(flow_directions)
+    else:
+        storage = from_cama_nextxy(*flow_directions)
+    ny, nx = storage.shape
+    storage.coords = {"y": np.arange(ny), "x": np.arange(nx)}
+    return storage
+
+
+@cache
+def network_storage(name):
+    if name in SYNTHETIC_NETWORKS:
+        return synthetic_network(*SYNTHETIC_NETWORKS[name])
+    return small_network(name)
+
+
+def get_network(name, backend):
+    """
+    Returns a river network on the cpu of the given array backend.
+
+    Raises NotImplementedError, which asv reports as a skipped benchmark, if the
+    backend is not installed.
+    """
+    try:
+        __import__(backend)
+    except ImportError:
+        raise NotImplementedError(f"{backend} is not installed.")
+    return RiverNetwork(network_storage(name)).to_device("cpu", backend)
+
+
+def random_field(river_network, backend, gridded=False, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(size=tuple(river_network.shape) if gridded else river_network.n_nodes)
+    return get_array_backend(backend).asarray(values)
+
+
+class NetworkBenchmark:
+    """
+    Base class for benchmarks of an operation on every network and backend.
+
+    The network and a random masked field are created in `setup`, so they are not
+    part of the timings. Peak memory benchmarks also measure the process peak RSS,
+    which includes them.
+    """
+
+    params: ClassVar = [NETWORKS, BACKENDS]
+    param_names: ClassVar = ["network", "backend"]
+    timeout = 600
+
+    def setup(self, network, backend, *args):
+        self.river_network = get_network(network, backend)
+        self.field = random_field(self.river_network, backend)
+
+
+def get_rust():
+    try:
+        from earthkit.hydro import _rust
+    except ImportError:
+        raise NotImplementedError("The Rust extension is not available.")
+    return _rust
+
+
+def random_locations(river_network, n_locations=50, seed=0):
+    rng = np.random.default_rng(seed)
+    n_locations = min(n_locations, max(river_network.n_nodes // 4, 1))
+    return rng.choice(river_network.n_nodes, n_locations, replace=False).tolist()
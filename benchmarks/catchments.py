@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import earthkit.hydro as ekh
+
+from ._networks import NetworkBenchmark, random_locations
+
+METRICS = ["sum", "mean", "max", "min", "var", "std", "skewness"]
+
+
+class Find(NetworkBenchmark):
+    def setup(self, network, backend):
+        super().setup(network, backend)
+        self.locations = random_locations(self.river_network)
+
+    def time_find(self, network, backend):
+        ekh.catchments.array.find(self.river_network, self.locations, return_type="masked")
+
+    def peakmem_find(self, network, backend):
+        ekh.catchments.array.find(self.river_network, self.locations, return_type="masked")
+
+
+class Metric(NetworkBenchmark):
+    params = NetworkBenchmark.params + [METRICS]
+    param_names = NetworkBenchmark.param_names + ["metric"]
+
+    def setup(self, network, backend, metric):
+        super().setup(network, backend)
+        self.locations = random_locations(self.river_network)
+
+    def time_metric(self, network, backend, metric):
+        getattr(ekh.catchments.array, metric)(self.river_network, self.field, self.locations)
+
+    def peakmem_metric(self, network, backend, metric):
+        getattr(ekh.catchments.array, metric)(self.river_network, self.field, self.locations)
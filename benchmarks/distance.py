@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import earthkit.hydro as ekh
+
+from ._networks import NetworkBenchmark, random_locations
+
+
+class FromLocations(NetworkBenchmark):
+    params = NetworkBenchmark.params + [["min", "max"]]
+    param_names = NetworkBenchmark.param_names + ["metric"]
+
+    def setup(self, network, backend, metric):
+        super().setup(network, backend)
+        self.locations = random_locations(self.river_network)
+
+    def time_metric(self, network, backend, metric):
+        getattr(ekh.distance.array, metric)(
+            self.river_network, self.locations, upstream=True, downstream=True, return_type="masked"
+        )
+
+    def peakmem_metric(self, network, backend, metric):
+        getattr(ekh.distance.array, metric)(
+            self.river_network, self.locations, upstream=True, downstream=True, return_type="masked"
+        )
+
+
+class ToSinkSource(NetworkBenchmark):
+    params = NetworkBenchmark.params + [["shortest", "longest"]]
+    param_names = NetworkBenchmark.param_names + ["path"]
+
+    def time_to_sink(self, network, backend, path):
+        ekh.distance.array.to_sink(self.river_network, path=path, return_type="masked")
+
+    def time_to_source(self, network, backend, path):
+        ekh.distance.array.to_source(self.river_network, path=path, return_type="masked")
+
+    def peakmem_to_sink(self, network, backend, path):
+        ekh.distance.array.to_sink(self.river_network, path=path, return_type="masked")
@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import ClassVar
+
+import earthkit.hydro as ekh
+
+from ._networks import NETWORKS, NetworkBenchmark, get_rust, random_field
+
+METRICS = ["sum", "mean", "max", "min", "var", "std", "skewness"]
+
+
+class Metric(NetworkBenchmark):
+    params = NetworkBenchmark.params + [METRICS]
+    param_names = NetworkBenchmark.param_names + ["metric"]
+
+    def time_metric(self, network, backend, metric):
+        getattr(ekh.downstream.array, metric)(self.river_network, self.field, return_type="masked")
+
+    def peakmem_metric(self, network, backend, metric):
+        getattr(ekh.downstream.array, metric)(self.river_network, self.field, return_type="masked")
+
+
+class Gridded(NetworkBenchmark):
+    def setup(self, network, backend):
+        super().setup(network, backend)
+        self.field = random_field(self.river_network, backend, gridded=True)
+
+    def time_sum(self, network, backend):
+        ekh.downstream.array.sum(self.river_network, self.field, return_type="gridded")
+
+
+class Percentile(NetworkBenchmark):
+    # percentiles and modes are computed by the Rust extension on numpy arrays only
+    params: ClassVar = [NETWORKS, ["numpy"]]
+
+    def setup(self, network, backend):
+        get_rust()
+        super().setup(network, backend)
+
+    def time_percentile(self, network, backend):
+        ekh.downstream.array.percentile(self.river_network, self.field, 0.5, return_type="masked")
+
+    def time_mode(self, network, backend):
+        ekh.downstream.array.mode(self.river_network, self.field, return_type="masked")
@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import earthkit.hydro as ekh
+
+from ._networks import NetworkBenchmark
+
+METRICS = ["sum", "mean", "max", "var"]
+
+
+class Move(NetworkBenchmark):
+    params = NetworkBenchmark.params + [METRICS]
+    param_names = NetworkBenchmark.param_names + ["metric"]
+
+    def time_upstream(self, network, backend, metric):
+        ekh.move.array.upstream(self.river_network, self.field, metric=metric, return_type="masked")
+
+    def time_downstream(self, network, backend, metric):
+        ekh.move.array.downstream(self.river_network, self.field, metric=metric, return_type="masked")
+
+    def peakmem_downstream(self, network, backend, metric):
+        ekh.move.array.downstream(self.river_network, self.field, metric=metric, return_type="masked")
@@ -0,0 +1,17 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import earthkit.hydro as ekh
+
+from ._networks import NetworkBenchmark
+
+
+class StreamOrder(NetworkBenchmark):
+    def time_strahler(self, network, backend):
+        ekh.streamorder.array.strahler(self.river_network, return_type="masked")
+
+    def time_shreve(self, network, backend):
+        ekh.streamorder.array.shreve(self.river_network, return_type="masked")
+
+    def peakmem_strahler(self, network, backend):
+        ekh.streamorder.array.strahler(self.river_network, return_type="masked")
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from typing import ClassVar
+
+import numpy as np
+
+import earthkit.hydro as ekh
+from earthkit.hydro._core import accumulate
+
+from ._networks import NETWORKS, SYNTHETIC_NETWORKS, NetworkBenchmark, get_network, get_rust, random_field
+
+METRICS = ["sum", "mean", "max", "min", "var", "std", "skewness"]
+
+
+class Metric(NetworkBenchmark):
+    params = NetworkBenchmark.params + [METRICS]
+    param_names = NetworkBenchmark.param_names + ["metric"]
+
+    def time_metric(self, network, backend, metric):
+        getattr(ekh.upstream.array, metric)(self.river_network, self.field, return_type="masked")
+
+    def peakmem_metric(self, network, backend, metric):
+        getattr(ekh.upstream.array, metric)(self.river_network, self.field, return_type="masked")
+
+
+class Gridded(NetworkBenchmark):
+    def setup(self, network, backend):
+        super().setup(network, backend)
+        self.field = random_field(self.river_network, backend, gridded=True)
+
+    def time_sum(self, network, backend):
+        ekh.upstream.array.sum(self.river_network, self.field, return_type="gridded")
+
+
+class Percentile(NetworkBenchmark):
+    # percentiles and modes are computed by the Rust extension on numpy arrays only
+    params: ClassVar = [NETWORKS, ["numpy"]]
+
+    def setup(self, network, backend):
+        get_rust()
+        super().setup(network, backend)
+
+    def time_percentile(self, network, backend):
+        ekh.upstream.array.percentile(self.river_network, self.field, 0.5, return_type="masked")
+
+    def time_mode(self, network, backend):
+        ekh.upstream.array.mode(self.river_network, self.field, return_type="masked")
+
+
+class Layout:
+    """
+    Batched numpy accumulations in the batch-major and node-major layouts.
+
+    "50x365" is the production shape of 50 ensemble members by 365 days, the smaller batches
+    locate the crossover that `NODE_MAJOR_MIN_BATCH` should be set to. Shapes whose field
+    does not fit in the available memory eight times over are skipped.
+    """
+
+    params: ClassVar = [["binary_1e5", "binary_1e6"], ["64", "1024", "50x365"], ["batch_major", "node_major"]]
+    param_names: ClassVar = ["network", "batch", "layout"]
+    timeout = 3600
+
+    def setup(self, network, batch, layout):
+        shape = tuple(int(n) for n in batch.split("x"))
+        n_nodes = SYNTHETIC_NETWORKS[network][0]
+        # the mean stacks two moments, which are copied to node-major and accumulated into a result
+        required = 8 * 8 * n_nodes * int(np.prod(shape))
+        if required > os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES"):
+            raise NotImplementedError(f"{required / 1024**3:.0f} GiB of memory is not available.")
+
+        self.river_network = get_network(network, "numpy")
+        self.field = np.random.default_rng(0).uniform(size=(*shape, n_nodes))
+        self.min_batch = accumulate.NODE_MAJOR_MIN_BATCH
+        accumulate.NODE_MAJOR_MIN_BATCH = 1 if layout == "node_major" else np.inf
+        self.use_rust = os.environ.get("USE_RUST")
+        os.environ["USE_RUST"] = "0"
+
+    def teardown(self, network, batch, layout):
+        accumulate.NODE_MAJOR_MIN_BATCH = self.min_batch
+        if self.use_rust is None:
+            del os.environ["USE_RUST"]
+        else:
+            os.environ["USE_RUST"] = self.use_rust
+
+    def time_sum(self, network, batch, layout):
+        ekh.upstream.array.sum(self.river_network, self.field, return_type="masked")
+
+    def time_mean(self, network, batch, layout):
+        ekh.upstream.array.mean(self.river_network, self.field, return_type="masked")
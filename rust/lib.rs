@@ -7,6 +7,7 @@ use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use rayon::prelude::*;
 use std::sync::atomic::{AtomicI64, Ordering};
+mod accumulate;
 mod metric;
 mod mode;
 mod percentile;
@@ -72,9 +73,109 @@ fn compute_topological_labels_rust<'py>(
     Ok(array.to_owned().into())
 }
 
+#[pyfunction]
+fn compute_topological_labels_bifurcations_rust<'py>(
+    py: Python<'py>,
+    down_ids: PyReadonlyArray1<'py, usize>,
+    offsets: PyReadonlyArray1<'py, usize>,
+    sources: PyReadonlyArray1<'py, usize>,
+    sinks: PyReadonlyArray1<'py, usize>,
+) -> PyResult<Py<PyArray1<i64>>> {
+    // the successors of node i are down_ids[offsets[i]..offsets[i + 1]]
+    let down_ids = down_ids.as_slice()?;
+    let offsets = offsets.as_slice()?;
+    let n_nodes = offsets.len() - 1;
+
+    let mut in_degree = vec![0usize; n_nodes];
+    for &d in down_ids {
+        in_degree[d] += 1;
+    }
+
+    // Kahn's algorithm, labelling every node with its longest distance from a source
+    let mut labels = vec![0i64; n_nodes];
+    let mut queue: Vec<usize> = sources.as_slice()?.to_vec();
+    let mut head = 0;
+    while head < queue.len() {
+        let i = queue[head];
+        head += 1;
+        let label = labels[i] + 1;
+        for &d in &down_ids[offsets[i]..offsets[i + 1]] {
+            if labels[d] < label {
+                labels[d] = label;
+            }
+            in_degree[d] -= 1;
+            if in_degree[d] == 0 {
+                queue.push(d);
+            }
+        }
+    }
+
+    if queue.len() != n_nodes {
+        return Err(PyErr::new::<PyValueError, _>(
+            "River Network contains a cycle.",
+        ));
+    }
+
+    // put all sinks in last group in topological ordering
+    let max_label = labels.iter().copied().max().unwrap_or(0);
+    for &i in sinks.as_slice()? {
+        labels[i] = max_label;
+    }
+
+    let array = PyArray1::from_vec(py, labels);
+    Ok(array.to_owned().into())
+}
+
+#[pyfunction]
+fn find_cycles_rust<'py>(
+    py: Python<'py>,
+    down_nodes: PyReadonlyArray1<'py, usize>,
+) -> PyResult<Py<PyArray1<bool>>> {
+    // every node has at most one downstream node, n_nodes meaning none
+    let down_nodes = down_nodes.as_slice()?;
+    let n_nodes = down_nodes.len();
+
+    // 0: unvisited, 1: on the current path, 2: done
+    let mut state = vec![0u8; n_nodes];
+    let mut in_cycle = vec![false; n_nodes];
+    let mut path = Vec::new();
+    for start in 0..n_nodes {
+        let mut i = start;
+        while i != n_nodes && state[i] == 0 {
+            state[i] = 1;
+            path.push(i);
+            i = down_nodes[i];
+        }
+        // the path came back onto itself, so it ends with the cycle through i
+        if i != n_nodes && state[i] == 1 {
+            let mut j = i;
+            loop {
+                in_cycle[j] = true;
+                j = down_nodes[j];
+                if j == i {
+                    break;
+                }
+            }
+        }
+        for &j in &path {
+            state[j] = 2;
+        }
+        path.clear();
+    }
+
+    let array = PyArray1::from_vec(py, in_cycle);
+    Ok(array.to_owned().into())
+}
+
 #[pymodule]
 fn _rust(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(compute_topological_labels_rust, m)?)?;
+    m.add_function(wrap_pyfunction!(
+        compute_topological_labels_bifurcations_rust,
+        m
+    )?)?;
+    m.add_function(wrap_pyfunction!(find_cycles_rust, m)?)?;
+    m.add_function(wrap_pyfunction!(accumulate::flow_accumulate, m)?)?;
     m.add_function(wrap_pyfunction!(mode::calc_mode, m)?)?;
     m.add_function(wrap_pyfunction!(mode::calc_mode_downstream, m)?)?;
     m.add_function(wrap_pyfunction!(percentile::calc_perc, m)?)?;
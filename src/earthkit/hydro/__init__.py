@@ -1,20 +1,42 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
-from earthkit.hydro import (
-    catchments,
-    distance,
-    downstream,
-    length,
-    move,
-    river_network,
-    streamorder,
-    subnetwork,
-    upstream,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+from ._utils.profiling import profile
 from ._version import __version__
 
+if TYPE_CHECKING:
+    from . import (
+        catchments,
+        distance,
+        downstream,
+        length,
+        move,
+        path,
+        river_network,
+        streaming,
+        streamorder,
+        subnetwork,
+        upstream,
+    )
+
+# subpackages are imported on first access, so that importing earthkit.hydro stays cheap
+_subpackages = [
+    "catchments",
+    "distance",
+    "downstream",
+    "length",
+    "move",
+    "path",
+    "river_network",
+    "streaming",
+    "streamorder",
+    "subnetwork",
+    "upstream",
+]
+
 __all__ = [
     "__version__",
     "catchments",
@@ -22,8 +44,21 @@ __all__ = [
     "downstream",
     "length",
     "move",
+    "path",
+    "profile",
     "river_network",
+    "streaming",
     "streamorder",
     "subnetwork",
     "upstream",
 ]
+
+
+def __getattr__(name):
+    if name in _subpackages:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_subpackages))
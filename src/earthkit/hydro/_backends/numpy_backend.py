@@ -25,14 +25,67 @@ class NumPyBackend(ArrayBackend):
         target[..., indices] = updates
         return target
 
-    def scatter_add(self, target, indices, updates):
+    def scatter_add(self, target, indices, updates, segments=None):
+        if segments is not None:
+            return _scatter_segments(np.add, target, indices, updates, segments)
         np.add.at(target, (*[slice(None)] * (target.ndim - 1), indices), updates)
         return target
 
-    def scatter_max(self, target, indices, updates):
+    def scatter_max(self, target, indices, updates, segments=None):
+        if segments is not None:
+            return _scatter_segments(np.maximum, target, indices, updates, segments)
         np.maximum.at(target, (*[slice(None)] * (target.ndim - 1), indices), updates)
         return target
 
-    def scatter_min(self, target, indices, updates):
+    def scatter_min(self, target, indices, updates, segments=None):
+        if segments is not None:
+            return _scatter_segments(np.minimum, target, indices, updates, segments)
         np.minimum.at(target, (*[slice(None)] * (target.ndim - 1), indices), updates)
         return target
+
+
+def _scatter_segments(ufunc, target, indices, updates, segments, axis=-1):
+    # indices are sorted, with each run of equal values starting at an entry of segments
+    if indices.shape[0] == 0:
+        return target
+    unique_indices = indices[segments]
+    reduced = ufunc.reduceat(updates, segments, axis=axis)
+    index = (unique_indices,) if axis == 0 else (..., unique_indices)
+    target[index] = ufunc(target[index], reduced)
+    return target
+
+
+class NodeMajorNumPyBackend(NumPyBackend):
+    """
+    NumPy backend for fields laid out node-major, i.e. with the node axis first.
+
+    The `axis=-1` arguments of the base backend refer to the node axis, which is
+    the leading axis here. Gathering and scattering whole rows keeps every batch
+    of values belonging to a node contiguous in memory.
+    """
+
+    def gather(self, arr, indices, axis=-1):
+        assert axis == -1
+        return arr[indices]
+
+    def scatter_assign(self, target, indices, updates):
+        target[indices] = updates
+        return target
+
+    def scatter_add(self, target, indices, updates, segments=None):
+        if segments is not None:
+            return _scatter_segments(np.add, target, indices, updates, segments, axis=0)
+        np.add.at(target, indices, updates)
+        return target
+
+    def scatter_max(self, target, indices, updates, segments=None):
+        if segments is not None:
+            return _scatter_segments(np.maximum, target, indices, updates, segments, axis=0)
+        np.maximum.at(target, indices, updates)
+        return target
+
+    def scatter_min(self, target, indices, updates, segments=None):
+        if segments is not None:
+            return _scatter_segments(np.minimum, target, indices, updates, segments, axis=0)
+        np.minimum.at(target, indices, updates)
+        return target
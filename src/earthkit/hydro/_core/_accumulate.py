@@ -14,6 +14,7 @@ def _ufunc_to_downstream(
     edge_multiplicative_weight,
     func,
     xp,
+    segments=None,
 ):
     """
     Updates field in-place by applying a ufunc at the downstream nodes
@@ -40,6 +41,9 @@ def _ufunc_to_downstream(
         A universal function from the numpy library to be applied to the field data.
         Available ufuncs: https://numpy.org/doc/2.2/reference/ufuncs.html.
         Note: must allow two operands.
+    segments : numpy.ndarray, optional
+        Start indices of the runs of equal downstream nodes in the grouping.
+        If given, the scatter reduces contiguous segments instead of single elements.
 
     Returns
     -------
@@ -62,6 +66,8 @@ def _ufunc_to_downstream(
     if edge_multiplicative_weight is not None:
         update = xp.gather(edge_multiplicative_weight, eid, axis=-1)
         modifier_field *= update
+    if segments is not None:
+        return func(field, did, modifier_field, segments=segments)
     return func(
         field,
         did,
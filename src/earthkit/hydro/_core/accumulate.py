@@ -1,11 +1,31 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+
+import numpy as np
+
+from earthkit.hydro._backends.numpy_backend import NodeMajorNumPyBackend
+from earthkit.hydro._utils.profiling import call_rust
 from earthkit.hydro.data_structures._network import RiverNetwork
 
 from ._accumulate import _ufunc_to_downstream
 from .flow import propagate
 
+# scatter functions with a native equivalent in the Rust extension
+RUST_REDUCTIONS = {"scatter_add": "sum", "scatter_max": "max", "scatter_min": "min"}
+
+# scatter functions whose elementwise counterpart is associative, allowing prefix scans along chains
+CHAIN_REDUCTIONS = {"scatter_add": "add", "scatter_max": "maximum", "scatter_min": "minimum"}
+
+# scatter functions available on the node-major numpy backend
+NODE_MAJOR_FUNCS = {"scatter_add", "scatter_max", "scatter_min", "scatter_assign"}
+
+# smallest number of values per node for which numpy fields are transposed to node-major.
+# Since levels scatter presorted segments with reduceat, the batch-major layout was as fast
+# or faster for every batch measured (benchmarks/upstream.py:Layout), so it is off by default
+NODE_MAJOR_MIN_BATCH = np.inf
+
 
 def flow_downstream(
     xp,
@@ -71,6 +91,27 @@ def flow(
     edge_additive_weight=None,
     edge_multiplicative_weight=None,
 ):
+    reduction = RUST_REDUCTIONS.get(getattr(func, "__name__", None))
+    if (
+        reduction is not None
+        and xp.name == "numpy"
+        and field.dtype == np.float64
+        and node_additive_weight is None
+        and node_multiplicative_weight is None
+        and edge_additive_weight is None
+        # the kernel only takes one weight per edge, batched weights fall back to numpy
+        and (edge_multiplicative_weight is None or np.ndim(edge_multiplicative_weight) == 1)
+    ):
+        rust_flow = get_rust_flow()
+        if rust_flow is not None:
+            return flow_rust(
+                rust_flow,
+                river_network,
+                field,
+                reduction,
+                invert_graph,
+                edge_multiplicative_weight,
+            )
 
     return flow_python(
         xp,
@@ -97,6 +138,65 @@ def flow_python(
     node_modifier_use_upstream=True,
     edge_additive_weight=None,
     edge_multiplicative_weight=None,
+):
+    if (
+        river_network.chains is not None
+        and not invert_graph
+        and getattr(func, "__name__", None) in CHAIN_REDUCTIONS
+        and node_additive_weight is None
+        and node_multiplicative_weight is None
+        and edge_additive_weight is None
+        and edge_multiplicative_weight is None
+    ):
+        return flow_chains(xp, river_network, field, func)
+
+    if (
+        xp.name == "numpy"
+        and getattr(func, "__name__", None) in NODE_MAJOR_FUNCS
+        and field.size >= NODE_MAJOR_MIN_BATCH * river_network.n_nodes
+    ):
+        return flow_node_major(
+            river_network,
+            field,
+            func,
+            invert_graph,
+            node_additive_weight,
+            node_multiplicative_weight,
+            node_modifier_use_upstream,
+            edge_additive_weight,
+            edge_multiplicative_weight,
+        )
+
+    # presorted segments are only available for numpy and for targets on the downstream side
+    segments = river_network.segments if xp.name == "numpy" and not invert_graph else None
+
+    return flow_levels(
+        xp,
+        river_network,
+        field,
+        func,
+        invert_graph,
+        node_additive_weight,
+        node_multiplicative_weight,
+        node_modifier_use_upstream,
+        edge_additive_weight,
+        edge_multiplicative_weight,
+        segments,
+    )
+
+
+def flow_levels(
+    xp,
+    river_network,
+    field,
+    func,
+    invert_graph=False,
+    node_additive_weight=None,
+    node_multiplicative_weight=None,
+    node_modifier_use_upstream=True,
+    edge_additive_weight=None,
+    edge_multiplicative_weight=None,
+    segments=None,
 ):
     op = _ufunc_to_downstream
 
@@ -110,6 +210,7 @@ def flow_python(
         node_modifier_use_upstream,
         edge_additive_weight,
         edge_multiplicative_weight,
+        segments=None,
     ):
         return op(
             field,
@@ -123,6 +224,7 @@ def flow_python(
             edge_multiplicative_weight,
             func=func,
             xp=xp,
+            segments=segments,
         )
 
     return propagate(
@@ -136,4 +238,113 @@ def flow_python(
         node_modifier_use_upstream,
         edge_additive_weight,
         edge_multiplicative_weight,
+        segments=segments,
+    )
+
+
+def flow_chains(xp, river_network, field, func):
+    reduce = getattr(xp, CHAIN_REDUCTIONS[func.__name__])
+
+    for junctions, nodes, positions, index, max_position in river_network.chains:
+        did, uid, _ = junctions
+        if did.shape[0] > 0:
+            field = func(field, did, xp.gather(field, uid, axis=-1))
+
+        # inclusive Hillis-Steele scan, every chain being a contiguous run starting at position 0
+        values = xp.gather(field, nodes, axis=-1)
+        stride = 1
+        while stride <= max_position:
+            valid = positions >= stride
+            previous = xp.gather(values, xp.where(valid, index - stride, index), axis=-1)
+            values = xp.where(valid, reduce(values, previous), values)
+            stride *= 2
+        field = xp.scatter_assign(field, nodes, values)
+
+    return field
+
+
+def flow_node_major(
+    river_network,
+    field,
+    func,
+    invert_graph=False,
+    node_additive_weight=None,
+    node_multiplicative_weight=None,
+    node_modifier_use_upstream=True,
+    edge_additive_weight=None,
+    edge_multiplicative_weight=None,
+):
+    # with many values per node, gathering and scattering contiguous rows of a
+    # node-major field outweighs the cost of transposing it there and back
+    xp = NodeMajorNumPyBackend()
+    ndim = field.ndim
+
+    out = flow_levels(
+        xp,
+        river_network,
+        to_node_major(field, ndim),
+        getattr(xp, func.__name__),
+        invert_graph,
+        to_node_major(node_additive_weight, ndim),
+        to_node_major(node_multiplicative_weight, ndim),
+        node_modifier_use_upstream,
+        to_node_major(edge_additive_weight, ndim),
+        to_node_major(edge_multiplicative_weight, ndim),
+        river_network.segments if not invert_graph else None,
+    )
+    return np.ascontiguousarray(np.moveaxis(out, 0, -1))
+
+
+def to_node_major(x, ndim):
+    """
+    Move the last axis of an array broadcastable against an `ndim`-dimensional
+    field to the front, keeping the remaining axes aligned for broadcasting.
+    """
+    if x is None:
+        return None
+    x = np.asarray(x)
+    x = np.moveaxis(x, -1, 0)
+    return np.ascontiguousarray(x.reshape(x.shape[:1] + (1,) * (ndim - x.ndim) + x.shape[1:]))
+
+
+def get_rust_flow():
+    use_rust = int(os.environ.get("USE_RUST", "-1"))
+
+    if use_rust == 0:
+        return None
+    elif use_rust == 1:
+        from earthkit.hydro._rust import flow_accumulate as func
+    else:
+        try:
+            from earthkit.hydro._rust import flow_accumulate as func
+        except ImportError:
+            return None
+
+    return func
+
+
+def flow_rust(
+    rust_flow,
+    river_network,
+    field,
+    reduction,
+    invert_graph=False,
+    edge_multiplicative_weight=None,
+):
+    if field.size == 0:
+        # nothing to accumulate, and older builds of the kernel reject empty networks
+        return field.copy()
+
+    if edge_multiplicative_weight is not None:
+        edge_multiplicative_weight = np.ascontiguousarray(edge_multiplicative_weight, dtype=np.float64)
+
+    out = call_rust(
+        rust_flow,
+        river_network.groups,
+        np.ascontiguousarray(field).reshape(-1),
+        river_network.n_nodes,
+        edge_multiplicative_weight,
+        reduction,
+        invert_graph,
     )
+    return out.reshape(field.shape)
@@ -3,6 +3,7 @@
 
 import numpy as np
 
+from earthkit.hydro._utils.profiling import active_profile
 from earthkit.hydro.data_structures import RiverNetwork
 
 
@@ -13,11 +14,19 @@ def propagate(
     invert_graph: bool,
     operation,
     *args,
+    segments=None,
     **kwargs,
 ):
+    profile = active_profile()
+    if profile is not None:
+        operation = profile.profile_levels(operation, len(groups), invert_graph, river_network.n_nodes)
+
     if invert_graph:
         for uid, did, eid in groups[::-1]:
             field = operation(field, did, uid, eid, *args, **kwargs)
+    elif segments is not None:
+        for (did, uid, eid), group_segments in zip(groups, segments):
+            field = operation(field, did, uid, eid, *args, segments=group_segments, **kwargs)
     else:
         for did, uid, eid in groups:
             field = operation(field, did, uid, eid, *args, **kwargs)
@@ -26,3 +26,48 @@ def metrics_func_finder(metric, xp):
         "min": MinBased,
     }
     return metrics_dict[metric]
+
+
+# highest power of the field accumulated for each moment-based metric
+MOMENT_ORDERS = {
+    "mean": 1,
+    "var": 2,
+    "std": 2,
+    "skewness": 3,
+}
+
+
+def stack_moments(xp, field, node_weights, metric):
+    """
+    Stack the weighted moments needed by a moment-based metric along a new
+    leading axis, so that they can all be accumulated in a single sweep.
+
+    The stacked array holds the weights followed by the weighted field raised
+    to the powers 1 up to `MOMENT_ORDERS[metric]`.
+    """
+    moments = [field * node_weights]
+    for power in range(2, MOMENT_ORDERS[metric] + 1):
+        moments.append(field**power * node_weights)
+    weights = xp.broadcast_to(node_weights, moments[0].shape)
+    return xp.stack([weights, *moments])
+
+
+def moments_to_metric(xp, moments, metric):
+    """
+    Compute a moment-based metric from moments accumulated with `stack_moments`.
+    """
+    counts = moments[0]
+    mean = moments[1] / counts
+    if metric == "mean":
+        return mean
+
+    mean_of_squares = moments[2] / counts
+    var = mean_of_squares - mean**2
+    var = xp.clip(var, 0, xp.inf)
+    if metric == "var":
+        return var
+    elif metric == "std":
+        return xp.sqrt(var)
+
+    third_moment = moments[3] / counts - 3 * mean * mean_of_squares + 2 * mean**3
+    return xp.where(var == 0, xp.nan, third_moment / var**1.5)
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from ._move import move_python as flow
-from .metrics import metrics_func_finder
+from .metrics import MOMENT_ORDERS, metrics_func_finder, moments_to_metric, stack_moments
 
 
 def calculate_move_metric(
@@ -13,6 +13,7 @@ def calculate_move_metric(
     node_weights,
     edge_weights,
     flow_direction,
+    overwrite_input=False,
 ):
     if flow_direction == "up":
         invert_graph = True
@@ -23,75 +24,43 @@ def calculate_move_metric(
     else:
         raise ValueError(f"flow_direction must be 'up' or 'down', got {flow_direction}.")
 
-    if node_weights is None:
-        if metric in {"mean", "std", "var", "skewness"}:
-            node_weights = xp.ones(river_network.n_nodes, dtype=xp.float64)
-    else:
-        node_weights = xp.copy(node_weights)
-
     if edge_weights is not None:
         edge_weights = xp.copy(edge_weights)
 
     func = metrics_func_finder(metric, xp).func
 
-    weighted_field = flow(
-        xp,
-        river_network,
-        xp.zeros(field.shape),
-        func,
-        invert_graph,
-        node_additive_weight=field if node_weights is None else field * node_weights,
-        node_modifier_use_upstream=node_modifier_use_upstream,
-        edge_multiplicative_weight=edge_weights,
-    )
+    if metric in MOMENT_ORDERS:
+        if node_weights is None:
+            node_weights = xp.ones(river_network.n_nodes, dtype=xp.float64)
 
-    if metric in {"mean", "std", "var", "skewness"}:
-        counts = flow(
+        # all moments are moved in a single step as one stacked field
+        moments = stack_moments(xp, field, node_weights, metric)
+        moments = flow(
             xp,
             river_network,
-            xp.zeros(field.shape),
+            xp.zeros(moments.shape),
             func,
             invert_graph,
-            node_additive_weight=xp.copy(node_weights),
+            node_additive_weight=moments,
             node_modifier_use_upstream=node_modifier_use_upstream,
             edge_multiplicative_weight=edge_weights,
         )
+        return moments_to_metric(xp, moments, metric)
 
-        if metric == "mean":
-            weighted_field /= counts
-            return weighted_field
-        elif metric in {"var", "std", "skewness"}:
-            weighted_sum_of_squares = flow(
-                xp,
-                river_network,
-                xp.zeros(field.shape),
-                func,
-                invert_graph,
-                node_additive_weight=(field**2 if node_weights is None else field**2 * node_weights),
-                node_modifier_use_upstream=node_modifier_use_upstream,
-                edge_multiplicative_weight=edge_weights,
-            )
-            mean = weighted_field / counts
-            var = weighted_sum_of_squares / counts - mean**2
-            var = xp.clip(var, 0, xp.inf)
-            if metric == "var":
-                return var
-            elif metric == "std":
-                return xp.sqrt(var)
-            elif metric == "skewness":
-                weighted_sum_of_cubes = flow(
-                    xp,
-                    river_network,
-                    xp.zeros(field.shape),
-                    func,
-                    invert_graph,
-                    node_additive_weight=(field**3 if node_weights is None else field**3 * node_weights),
-                    node_modifier_use_upstream=node_modifier_use_upstream,
-                    edge_multiplicative_weight=edge_weights,
-                )
-                third_moment = (
-                    weighted_sum_of_cubes / counts - 3 * mean * (weighted_sum_of_squares / counts) + 2 * mean**3
-                )
-                return xp.where(var == 0, xp.nan, third_moment / var**1.5)
-    else:
-        return weighted_field
+    if node_weights is not None:
+        # the weighted field only reuses the caller's field if it keeps its dtype
+        if overwrite_input and xp.result_type(field, node_weights) == field.dtype:
+            field *= node_weights
+        else:
+            field = field * node_weights
+
+    return flow(
+        xp,
+        river_network,
+        xp.zeros(field.shape),
+        func,
+        invert_graph,
+        node_additive_weight=field,
+        node_modifier_use_upstream=node_modifier_use_upstream,
+        edge_multiplicative_weight=edge_weights,
+    )
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+
+from earthkit.hydro._backends.find import get_array_backend
+from earthkit.hydro._utils.decorators.masking import mask_last2_dims, scatter_and_reshape
+
+from .accumulate import flow
+from .metrics import MOMENT_ORDERS, metrics_func_finder, moments_to_metric, stack_moments
+
+
+class AccumulationPlan:
+    """
+    A metric accumulation bound to a river network, ready to be applied to many fields.
+
+    The array backend, the accumulation function, the masked node weights and the
+    edge weights are resolved once when the plan is built, so calling the plan only
+    masks the field and runs the accumulation. With `out`, numpy results are written
+    into a preallocated array instead of a new one.
+
+    Parameters
+    ----------
+    river_network : RiverNetwork
+        A river network object.
+    metric : str
+        One of "sum", "mean", "var", "std", "skewness", "max" or "min".
+    flow_direction : str
+        "down" to accumulate over all upstream nodes, "up" over all downstream nodes.
+    node_weights : array-like, optional
+        Array of weights for each river network node or gridcell. Default is None (unweighted).
+    edge_weights : array-like, optional
+        Array of weights for each edge. Default is None (unweighted).
+    return_type : str, optional
+        Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    """
+
+    def __init__(
+        self,
+        river_network,
+        metric,
+        flow_direction,
+        node_weights=None,
+        edge_weights=None,
+        return_type=None,
+    ):
+        if flow_direction not in ["up", "down"]:
+            raise ValueError(f"flow_direction must be 'up' or 'down', got {flow_direction}.")
+        return_type = river_network.return_type if return_type is None else return_type
+        if return_type not in ["gridded", "masked"]:
+            raise ValueError("return_type must be either 'gridded' or 'masked'.")
+
+        xp = get_array_backend(river_network.groups[0])
+        try:
+            self.func = metrics_func_finder(metric, xp).func
+        except KeyError:
+            raise ValueError(f"Unsupported metric for accumulation plans: {metric}.")
+
+        self.xp = xp
+        self.river_network = river_network
+        self.metric = metric
+        self.invert_graph = flow_direction == "up"
+        self.return_grid = return_type == "gridded"
+
+        if hasattr(node_weights, "shape") and node_weights.shape[-2:] == river_network.shape:
+            node_weights = mask_last2_dims(xp, node_weights, river_network.mask, node_weights.shape)
+        if node_weights is None and metric in MOMENT_ORDERS:
+            node_weights = xp.ones(river_network.n_nodes, dtype=xp.float64)
+        self.node_weights = node_weights
+        self.edge_weights = None if edge_weights is None else xp.copy(edge_weights)
+
+        self._outside_mask = None
+        self._buffers = {}
+
+    def __call__(self, field, out=None):
+        """
+        Accumulates a field.
+
+        Parameters
+        ----------
+        field : array-like
+            An array containing field values defined on river network nodes or gridcells.
+        out : array-like, optional
+            A C-contiguous numpy array of the result's shape and dtype to write the result
+            into. Default is None, which allocates a new array.
+
+        Returns
+        -------
+        array-like
+            Array of metric values for every river network node or gridcell, depending on
+            the plan's `return_type`. This is `out` if given.
+        """
+        xp = self.xp
+        river_network = self.river_network
+        if out is not None and xp.name != "numpy":
+            raise NotImplementedError("out is only supported for the numpy backend.")
+
+        if field.shape[-2:] == river_network.shape:
+            field = mask_last2_dims(xp, field, river_network.mask, field.shape)
+
+        if self.metric in MOMENT_ORDERS:
+            moments = flow(
+                xp,
+                river_network,
+                stack_moments(xp, field, self.node_weights, self.metric),
+                self.func,
+                self.invert_graph,
+                edge_multiplicative_weight=self.edge_weights,
+            )
+            result = moments_to_metric(xp, moments, self.metric)
+        else:
+            result = flow(
+                xp,
+                river_network,
+                self._initial_values(field, out),
+                self.func,
+                self.invert_graph,
+                edge_multiplicative_weight=self.edge_weights,
+            )
+
+        if self.return_grid:
+            if out is None:
+                out_shape = result.shape[:-1] + tuple(river_network.shape)
+                return scatter_and_reshape(xp, river_network.mask, result, out_shape, device=river_network.device)
+            self._scatter_into(result, out)
+        elif out is not None and result is not out:
+            out[...] = result
+        return result if out is None else out
+
+    def _initial_values(self, field, out):
+        # the accumulation runs in place on the returned array
+        if out is None:
+            return self.xp.copy(field) if self.node_weights is None else field * self.node_weights
+
+        if self.return_grid:
+            shape = np.broadcast_shapes(field.shape, np.shape(self.node_weights))
+            key = (shape, out.dtype)
+            if key not in self._buffers:
+                self._buffers[key] = np.empty(shape, dtype=out.dtype)
+            values = self._buffers[key]
+        else:
+            values = out
+
+        if self.node_weights is None:
+            np.copyto(values, field)
+        else:
+            np.multiply(field, self.node_weights, out=values)
+        return values
+
+    def _scatter_into(self, result, out):
+        if not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous.")
+        if self._outside_mask is None:
+            grid_size = int(np.prod(self.river_network.shape))
+            self._outside_mask = np.setdiff1d(np.arange(grid_size), self.river_network.mask)
+        out_flat = out.reshape(out.shape[:-2] + (-1,))
+        out_flat[..., self.river_network.mask] = result
+        out_flat[..., self._outside_mask] = np.nan
@@ -4,4 +4,4 @@
 from ._cama import from_cama_downxy, from_cama_nextxy
 from ._core import assign_coords, find_main_var, import_earthkit_or_prompt_install
 from ._d8 import from_d8
-from ._grit import from_grit
+from ._grit import from_grit, from_grit_columnar
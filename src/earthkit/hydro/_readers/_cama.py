@@ -1,6 +1,8 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+
 import numpy as np
 
 from earthkit.hydro._utils.coords import get_core_grid_dims
@@ -25,7 +27,46 @@ def load_cama_data(path, river_network_format, source="file"):
     return (x, y), coords
 
 
-def from_cama_nextxy(x, y):
+def load_cama_bin_data(path):
+    """
+    Memory-maps the nextx and nexty planes of a CaMa-Flood nextxy.bin file.
+
+    Parameters
+    ----------
+    path : str
+        The path to a CaMa-Flood map directory, or to its nextxy.bin file. The grid is read
+        from the params.txt file next to it.
+
+    Returns
+    -------
+    tuple
+        The memory-mapped (x, y) planes and the coordinates of the grid cell centres.
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, "nextxy.bin")
+    with open(os.path.join(os.path.dirname(path), "params.txt")) as f:
+        # one value per line, followed by a comment
+        params = [line.split()[0] for line in f if line.strip()]
+    nx, ny = int(params[0]), int(params[1])
+    gsize, west, north = float(params[3]), float(params[4]), float(params[6])
+
+    # a wrong params.txt or a file of another dtype would otherwise be read as a wrong grid
+    expected_size = 2 * 4 * nx * ny
+    size = os.path.getsize(path)
+    if size != expected_size:
+        raise ValueError(
+            f"{path} holds {size} bytes, but the {ny}x{nx} grid of params.txt needs {expected_size} bytes "
+            "of int32 nextx and nexty values."
+        )
+    data = np.memmap(path, dtype="<i4", mode="r", shape=(2, ny, nx))
+    coords = {
+        "lat": north - (np.arange(ny) + 0.5) * gsize,
+        "lon": west + (np.arange(nx) + 0.5) * gsize,
+    }
+    return (data[0], data[1]), coords
+
+
+def from_cama_nextxy(x, y, compress_chains=False):
     """
     Create a river network from CaMa nextxy data.
 
@@ -35,6 +76,8 @@ def from_cama_nextxy(x, y):
         The x-coordinates of the next downstream cell.
     y : numpy.ndarray
         The y-coordinates of the next downstream cell.
+    compress_chains : bool, optional
+        Whether to also build a schedule contracting unbranched chains. Default is False.
 
     Returns
     -------
@@ -42,10 +85,10 @@ def from_cama_nextxy(x, y):
         The created river network.
     """
     upstream_indices, downstream_indices, missing_mask, shape = preprocess_cama_nextxy_data(x, y)
-    return create_network(upstream_indices, downstream_indices, missing_mask, shape)
+    return create_network(upstream_indices, downstream_indices, missing_mask, shape, compress_chains)
 
 
-def from_cama_downxy(dx, dy):
+def from_cama_downxy(dx, dy, compress_chains=False):
     """
     Create a river network from CaMa downxy data.
 
@@ -55,6 +98,8 @@ def from_cama_downxy(dx, dy):
         The x-offsets of the next downstream cell.
     dy : numpy.ndarray
         The y-offsets of the next downstream cell.
+    compress_chains : bool, optional
+        Whether to also build a schedule contracting unbranched chains. Default is False.
 
     Returns
     -------
@@ -72,7 +117,7 @@ def from_cama_downxy(dx, dy):
     upstream_indices, downstream_indices = find_upstream_downstream_indices_from_offsets(
         x_offsets, y_offsets, missing_mask, mask_upstream, shape
     )
-    return create_network(upstream_indices, downstream_indices, missing_mask, shape)
+    return create_network(upstream_indices, downstream_indices, missing_mask, shape, compress_chains)
 
 
 def preprocess_cama_nextxy_data(x, y):
@@ -3,8 +3,9 @@
 
 import numpy as np
 
-from earthkit.hydro.data_structures._network_storage import RiverNetworkStorage
+from earthkit.hydro.data_structures._network_storage import RiverNetworkStorage, compute_segments
 
+from .chains import compute_chain_schedule
 from .group_labels import compute_topological_labels
 
 
@@ -191,12 +192,64 @@ def create_initial_graph(upstream_indices, downstream_indices, missing_mask, sha
     return up_ids, down_ids, edge_indices, mask, n_nodes, n_edges
 
 
-def create_network(upstream_indices, downstream_indices, missing_mask, shape):
+def create_network(upstream_indices, downstream_indices, missing_mask, shape, compress_chains=False):
 
     nodes, downstream, has_downstream, n_nodes, n_edges = create_graph_nodes_edges(
         upstream_indices, downstream_indices, missing_mask
     )
-    up_ids, down_ids, edge_indices, mask = get_up_down_edge_mask(has_downstream, nodes, downstream, missing_mask, shape)
+    return build_network(
+        nodes, downstream, has_downstream, n_nodes, n_edges, np.flatnonzero(missing_mask), shape, compress_chains
+    )
+
+
+def create_network_from_edges(node_indices, upstream_indices, downstream_indices, shape, compress_chains=False):
+    """
+    Creates a river network from flat grid indices, without any full grid array.
+
+    Parameters
+    ----------
+    node_indices : numpy.ndarray
+        The sorted flat grid indices of the river network nodes.
+    upstream_indices : numpy.ndarray
+        The flat grid indices of the upstream node of every edge.
+    downstream_indices : numpy.ndarray
+        The flat grid indices of the downstream cell of every edge. Edges to cells that are not
+        nodes are dropped, making their upstream node a sink.
+    shape : tuple
+        The shape of the grid.
+    compress_chains : bool, optional
+        Whether to also build a schedule contracting unbranched chains. Default is False.
+
+    Returns
+    -------
+    RiverNetworkStorage
+        The created river network.
+    """
+    n_nodes = node_indices.size
+    nodes = np.arange(n_nodes, dtype=np.uintp)
+    upstream_nodes = np.searchsorted(node_indices, upstream_indices)
+    downstream_nodes = np.searchsorted(node_indices, downstream_indices)
+    del upstream_indices
+
+    is_node = downstream_nodes < n_nodes
+    is_node[is_node] = node_indices[downstream_nodes[is_node]] == downstream_indices[is_node]
+    del downstream_indices
+    downstream = np.full(n_nodes, n_nodes, dtype=np.uintp)
+    downstream[upstream_nodes[is_node]] = downstream_nodes[is_node]
+    del upstream_nodes, downstream_nodes, is_node
+
+    has_downstream = downstream != n_nodes
+    n_edges = int(has_downstream.sum())
+
+    return build_network(
+        nodes, downstream, has_downstream, n_nodes, n_edges, node_indices.astype(np.intp), shape, compress_chains
+    )
+
+
+def build_network(nodes, downstream, has_downstream, n_nodes, n_edges, mask, shape, compress_chains):
+    edge_indices = np.arange(n_edges).astype(np.uintp)
+    up_ids = nodes[has_downstream]
+    down_ids = downstream[has_downstream]
 
     bifurcates = False
     sources = get_sources(n_nodes, down_ids)
@@ -213,7 +266,8 @@ def create_network(upstream_indices, downstream_indices, missing_mask, shape):
         n_nodes,
     )[has_downstream]
 
-    sort_indices = np.lexsort((nodes[has_downstream], distances))  # np.argsort(distances)
+    # sort by level, then by downstream node so that scatters can reduce contiguous segments
+    sort_indices = np.lexsort((nodes[has_downstream], down_ids, distances))
     sorted_distances = distances[sort_indices]  # from source to sink
 
     up_ids_sort = up_ids[sort_indices]
@@ -226,19 +280,25 @@ def create_network(upstream_indices, downstream_indices, missing_mask, shape):
     pixarea = None
     edge_weights = None
 
+    sorted_data = np.vstack([down_ids_sort, up_ids_sort, edge_ids_sort]).astype(np.int64)
+
+    chains = compute_chain_schedule(n_nodes, sorted_data, splits) if compress_chains else None
+
     return RiverNetworkStorage(
         n_nodes,
         n_edges,
-        np.vstack([down_ids_sort, up_ids_sort, edge_ids_sort]).astype(np.int64),
+        sorted_data,
         sources,
         sinks,
         coords,
         splits,
         pixarea,
-        np.where(mask.flatten())[0],
-        mask.shape,
+        mask,
+        tuple(shape),
         bifurcates,
         edge_weights,
+        compute_segments(sorted_data, splits),
+        chains,
     )
 
 
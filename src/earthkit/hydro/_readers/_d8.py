@@ -9,13 +9,14 @@ from earthkit.hydro._utils.readers import from_file
 from ._core import (
     create_initial_graph,
     create_network,
+    create_network_from_edges,
     find_main_var,
     find_upstream_downstream_indices_from_offsets,
     import_earthkit_or_prompt_install,
 )
 
 
-def load_d8_data(path, river_network_format, source="file"):
+def load_d8_data(path, river_network_format, source="file", lazy=False):
     if path.endswith(".map"):
         data = from_file(path, mask=False)
         coords = None
@@ -28,19 +29,13 @@ def load_d8_data(path, river_network_format, source="file"):
             coord2: data[coord2].values,
         }
         var_name = find_main_var(data)
-        data = data[var_name].values
+        data = data[var_name]
+        if not lazy:
+            data = data.values
     return data, coords
 
 
-def preprocess_d8_data(
-    data,
-    river_network_format="pcr_d8",
-    truncate_domain=False,
-    missing_to_sink_if_connected=False,
-):
-    shape = data.shape
-    data_flat = data.flatten()
-    del data
+def get_d8_masks(data_flat, river_network_format):
     if river_network_format == "pcr_d8":
         missing_mask = np.isin(data_flat, range(1, 10))
         mask_upstream = data_flat != 5
@@ -53,16 +48,39 @@ def preprocess_d8_data(
     else:
         raise ValueError(f"Unsupported river network format: {river_network_format}.")
     mask_upstream = (mask_upstream) & (missing_mask)
-    directions = data_flat[mask_upstream].astype("int")
-    del data_flat
+    return missing_mask, mask_upstream
+
+
+def get_d8_offsets(directions, river_network_format):
     if river_network_format == "pcr_d8":
         x_offsets = np.array([0, -1, 0, +1, -1, 0, +1, -1, 0, +1])[directions]
         y_offsets = -np.array([0, -1, -1, -1, 0, 0, 0, 1, 1, 1])[directions]
     elif river_network_format in {"esri_d8", "merit_d8"}:
         x_mapping = {32: -1, 64: 0, 128: +1, 16: -1, 1: +1, 8: -1, 4: 0, 2: +1}
         y_mapping = {32: 1, 64: 1, 128: 1, 16: 0, 1: 0, 8: -1, 4: -1, 2: -1}
-        x_offsets = np.vectorize(x_mapping.get)(directions)
-        y_offsets = -np.vectorize(y_mapping.get)(directions)
+        # lookup tables indexed by direction, as directions are powers of two up to 128
+        x_lut = np.zeros(129, dtype=int)
+        y_lut = np.zeros(129, dtype=int)
+        x_lut[list(x_mapping)] = list(x_mapping.values())
+        y_lut[list(y_mapping)] = list(y_mapping.values())
+        x_offsets = x_lut[directions]
+        y_offsets = -y_lut[directions]
+    return x_offsets, y_offsets
+
+
+def preprocess_d8_data(
+    data,
+    river_network_format="pcr_d8",
+    truncate_domain=False,
+    missing_to_sink_if_connected=False,
+):
+    shape = data.shape
+    data_flat = data.flatten()
+    del data
+    missing_mask, mask_upstream = get_d8_masks(data_flat, river_network_format)
+    directions = data_flat[mask_upstream].astype("int")
+    del data_flat
+    x_offsets, y_offsets = get_d8_offsets(directions, river_network_format)
     del directions
     upstream_indices, downstream_indices = find_upstream_downstream_indices_from_offsets(
         x_offsets,
@@ -76,6 +94,42 @@ def preprocess_d8_data(
     return upstream_indices, downstream_indices, missing_mask, shape
 
 
+def preprocess_d8_tiles(data, river_network_format="pcr_d8", tile_rows=1024):
+    """
+    Reads d8 data in tiles of rows and returns the flat grid indices of its nodes and edges.
+
+    Only a tile of the grid is held in memory at a time, and indices are stored as uint32
+    when the grid allows it, so memory scales with the number of nodes rather than with
+    the grid size. Downstream cells wrap around the grid as in :func:`preprocess_d8_data`.
+
+    Returns
+    -------
+    tuple of numpy.ndarray and tuple
+        The sorted node indices, the upstream and downstream indices of the edges and the grid shape.
+    """
+    ny, nx = shape = tuple(data.shape)
+    index_dtype = np.uint32 if ny * nx <= np.iinfo(np.uint32).max else np.uint64
+
+    node_indices, upstream_indices, downstream_indices = [], [], []
+    for start in range(0, ny, tile_rows):
+        tile = np.asarray(data[start : start + tile_rows]).ravel()
+        missing_mask, mask_upstream = get_d8_masks(tile, river_network_format)
+        node_indices.append((np.flatnonzero(missing_mask) + start * nx).astype(index_dtype))
+        del missing_mask
+
+        upstream = np.flatnonzero(mask_upstream)
+        x_offsets, y_offsets = get_d8_offsets(tile[upstream].astype("int"), river_network_format)
+        del tile, mask_upstream
+        upstream += start * nx
+        down_rows = (upstream // nx + y_offsets) % ny
+        down_cols = (upstream % nx + x_offsets) % nx
+        upstream_indices.append(upstream.astype(index_dtype))
+        downstream_indices.append((down_rows * nx + down_cols).astype(index_dtype))
+        del upstream, x_offsets, y_offsets, down_rows, down_cols
+
+    return np.concatenate(node_indices), np.concatenate(upstream_indices), np.concatenate(downstream_indices), shape
+
+
 def from_d8_raw(data, river_network_format="pcr_d8"):
     upstream_indices, downstream_indices, missing_mask, shape = preprocess_d8_data(
         data,
@@ -89,7 +143,7 @@ def from_d8_raw(data, river_network_format="pcr_d8"):
     return up_ids, down_ids, edge_indices, mask, n_nodes, n_edges
 
 
-def from_d8(data, river_network_format="pcr_d8"):
+def from_d8(data, river_network_format="pcr_d8", compress_chains=False, tile_rows=None):
     """
     Create a river network from PCRaster d8 data.
 
@@ -97,11 +151,26 @@ def from_d8(data, river_network_format="pcr_d8"):
     ----------
     data : numpy.ndarray
         The PCRaster d8 drain direction data.
+    river_network_format : str, optional
+        The d8 convention of the data. Default is `'pcr_d8'`.
+    compress_chains : bool, optional
+        Whether to also build a schedule contracting unbranched chains. Default is False.
+    tile_rows : int, optional
+        If given, `data` is read `tile_rows` rows at a time and no full grid array is created,
+        so that peak memory scales with the number of river cells. `data` can then be any
+        array-like that loads row slices on demand, e.g. a numpy.memmap or a lazily loaded
+        xarray.DataArray. Default is None, which reads `data` at once.
 
     Returns
     -------
     earthkit.hydro.network.RiverNetwork
         The created river network.
     """
+    if tile_rows is not None:
+        node_indices, upstream_indices, downstream_indices, shape = preprocess_d8_tiles(
+            data, river_network_format, tile_rows
+        )
+        return create_network_from_edges(node_indices, upstream_indices, downstream_indices, shape, compress_chains)
+
     upstream_indices, downstream_indices, missing_mask, shape = preprocess_d8_data(data, river_network_format)
-    return create_network(upstream_indices, downstream_indices, missing_mask, shape)
+    return create_network(upstream_indices, downstream_indices, missing_mask, shape, compress_chains)
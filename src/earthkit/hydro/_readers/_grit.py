@@ -1,38 +1,76 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+
 import numpy as np
 
-from earthkit.hydro.data_structures._network_storage import RiverNetworkStorage
+from earthkit.hydro._utils.profiling import call_rust
+from earthkit.hydro.data_structures._network_storage import RiverNetworkStorage, compute_segments
 
 from ._core import get_sources
 
 
 def get_edge_indices(offsets, grouping):
-    lengths = offsets[grouping + 1] - offsets[grouping]
-    total_len = np.sum(lengths)
-    result = np.empty(total_len, dtype=int)
-    pos = 0
-
-    for node, length in zip(grouping, lengths):
-        start = offsets[node]
-        for j in range(length):
-            result[pos + j] = start + j
-        pos += length
-    return result
+    # concatenated ranges offsets[node]:offsets[node + 1] for every node of the grouping
+    starts = offsets[grouping]
+    lengths = offsets[grouping + 1] - starts
+    run_starts = np.cumsum(lengths) - lengths
+    return np.repeat(starts - run_starts, lengths) + np.arange(lengths.sum())
 
 
 def compute_topological_labels_bifurcations(down_ids, offsets, sources, sinks):
+    use_rust = int(os.environ.get("USE_RUST", "-1"))
+
+    if use_rust == 0:
+        func = compute_topological_labels_bifurcations_python
+    elif use_rust == 1:
+        from earthkit.hydro._rust import compute_topological_labels_bifurcations_rust as func
+    else:
+        try:
+            from earthkit.hydro._rust import compute_topological_labels_bifurcations_rust as func
+        except ImportError:
+            func = compute_topological_labels_bifurcations_python
+
+    if func is compute_topological_labels_bifurcations_python:
+        return func(down_ids, offsets, sources, sinks)
+    return call_rust(
+        func,
+        down_ids.astype(np.uintp),
+        offsets.astype(np.uintp),
+        sources.astype(np.uintp),
+        sinks.astype(np.uintp),
+    )
+
+
+def compute_topological_labels_bifurcations_python(down_ids, offsets, sources, sinks):
+    # Kahn's algorithm one level at a time: a node enters the frontier once all of its
+    # upstream nodes have been labelled, so every edge is visited exactly once
     n_nodes = offsets.size - 1
+    in_degree = np.bincount(down_ids, minlength=n_nodes)
     labels = np.zeros(n_nodes, dtype=int)
+    position = np.empty(n_nodes, dtype=np.intp)
     inlets = sources
+    n_labelled = inlets.size
 
-    for n in range(1, n_nodes + 1):
-        inlets = np.unique(down_ids[get_edge_indices(offsets, inlets)])
+    n = 0
+    while True:
+        downstream = down_ids[get_edge_indices(offsets, inlets)]
+        np.subtract.at(in_degree, downstream, 1)
+        inlets = downstream[in_degree[downstream] == 0]
+        # a node appears once per incoming edge in the frontier, so keep only its last occurrence
+        index = np.arange(inlets.size)
+        position[inlets] = index
+        inlets = inlets[position[inlets] == index]
         if inlets.size == 0:
-            labels[sinks] = n - 1
             break
+        n += 1
         labels[inlets] = n
+        n_labelled += inlets.size
+
+    if n_labelled != n_nodes:
+        raise ValueError("River Network contains a cycle.")
+    labels[sinks] = n  # put all sinks in last group in topological ordering
 
     return labels
 
@@ -44,36 +82,156 @@ def from_grit(path):
     lines_df = gpd.read_file(path, layer="lines")
 
     try:
-        nodes_df["x"] = nodes_df.geometry.x
-        nodes_df["y"] = nodes_df.geometry.y
+        x = nodes_df.geometry.x.to_numpy()
+        y = nodes_df.geometry.y.to_numpy()
     except AttributeError:
-        nodes_df["geometry"] = nodes_df["geometry"].apply(lambda geom: geom.geoms[0])
-        nodes_df["x"] = nodes_df.geometry.x
-        nodes_df["y"] = nodes_df.geometry.y
-
-    nodes_df.sort_values(by=["y", "x"], inplace=True, ascending=[False, True])
-    nodes_df.reset_index(inplace=True)
-
-    ref = nodes_df["global_id"]
-
-    value_to_index = dict(zip(ref.values, ref.index.values))
-    lines_df["UPID"] = lines_df["upstream_node_id"].map(value_to_index)
-    lines_df["DOWNID"] = lines_df["downstream_node_id"].map(value_to_index)
-    lines_df.sort_values(by=["UPID", "DOWNID"], inplace=True)
-    up_ids = lines_df["UPID"].to_numpy()
-    down_ids = lines_df["DOWNID"].to_numpy()
-    edge_weights = lines_df["width_adjusted"].to_numpy()
+        geometry = nodes_df["geometry"].apply(lambda geom: geom.geoms[0])
+        x = geometry.x.to_numpy()
+        y = geometry.y.to_numpy()
+
+    return from_vector_arrays(
+        nodes_df["global_id"].to_numpy(),
+        x,
+        y,
+        lines_df["upstream_node_id"].to_numpy(),
+        lines_df["downstream_node_id"].to_numpy(),
+        lines_df["width_adjusted"].to_numpy(dtype=np.float64),
+    )
+
+
+def from_grit_columnar(path):
+    """
+    Reads a GRIT network from a directory of GeoParquet or Arrow IPC files.
+
+    The directory holds a `nodes` and a `lines` table, each as `.parquet`, `.arrow` or
+    `.feather`. Only the needed columns are read, and Arrow IPC files are memory-mapped.
+    Node coordinates are read from `x` and `y` columns if present, otherwise from the
+    point (or first multipoint) of the `geometry` column, encoded as WKB or as native
+    geoarrow points.
+
+    Parameters
+    ----------
+    path : str
+        The directory holding the tables.
+
+    Returns
+    -------
+    RiverNetworkStorage
+        The river network storage.
+    """
+    nodes = _read_table(path, "nodes", ["global_id", "x", "y", "geometry"])
+    lines = _read_table(path, "lines", ["upstream_node_id", "downstream_node_id", "width_adjusted"])
+
+    if "x" in nodes.column_names and "y" in nodes.column_names:
+        x = _column_to_numpy(nodes, "x")
+        y = _column_to_numpy(nodes, "y")
+    else:
+        x, y = _point_coords(nodes.column("geometry"))
+
+    return from_vector_arrays(
+        _column_to_numpy(nodes, "global_id"),
+        x,
+        y,
+        _column_to_numpy(lines, "upstream_node_id"),
+        _column_to_numpy(lines, "downstream_node_id"),
+        _column_to_numpy(lines, "width_adjusted").astype(np.float64),
+    )
+
+
+def _read_table(path, name, columns):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError(
+            "pyarrow is required for reading columnar river networks.\nTo install it, run `pip install pyarrow`"
+        )
+
+    for ext in [".parquet", ".arrow", ".feather"]:
+        filepath = os.path.join(path, name + ext)
+        if not os.path.isfile(filepath):
+            continue
+        if ext == ".parquet":
+            schema = pq.read_schema(filepath)
+            return pq.read_table(filepath, columns=[c for c in columns if c in schema.names], memory_map=True)
+        # memory-mapped, so the columns are read without copying
+        table = pa.ipc.open_file(pa.memory_map(filepath, "r")).read_all()
+        return table.select([c for c in columns if c in table.column_names])
+
+    raise FileNotFoundError(f"No {name}.parquet, {name}.arrow or {name}.feather in {path}.")
+
+
+def _column_to_numpy(table, name):
+    column = table.column(name)
+    # a single chunk without nulls is a view of the arrow buffer
+    array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _point_coords(column):
+    import pyarrow as pa
+
+    array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if isinstance(array, pa.ExtensionArray):
+        array = array.storage
+
+    if pa.types.is_struct(array.type):
+        return array.field("x").to_numpy(zero_copy_only=False), array.field("y").to_numpy(zero_copy_only=False)
+
+    if not (pa.types.is_binary(array.type) or pa.types.is_large_binary(array.type)):
+        raise ValueError(f"Unsupported geometry encoding: {array.type}.")
+
+    offset_dtype = np.int64 if pa.types.is_large_binary(array.type) else np.int32
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_dtype)[array.offset : array.offset + len(array) + 1]
+    data = np.frombuffer(data_buffer, dtype=np.uint8)
+    starts = offsets[:-1].astype(np.int64)
+
+    if not np.all(data[starts] == 1):
+        raise ValueError("Only little-endian WKB geometries are supported.")
+    geometry_types = data[starts[:, None] + np.arange(1, 5)].view("<u4")[:, 0] % 1000
+
+    # a point is followed by its coordinates, a multipoint by its size and its first point
+    coords_starts = np.where(geometry_types == 1, starts + 5, starts + 14)
+    if not np.all((geometry_types == 1) | (geometry_types == 4)):
+        raise ValueError("Node geometries must be points or multipoints.")
+    coords = data[coords_starts[:, None] + np.arange(16)].view("<f8")
+    return coords[:, 0], coords[:, 1]
+
+
+def from_vector_arrays(node_ids, x, y, upstream_node_ids, downstream_node_ids, edge_weights):
+    # nodes are ordered from north to south, then west to east
+    node_order = np.lexsort((x, -y))
+    node_ids = node_ids[node_order]
+    x = x[node_order]
+    y = y[node_order]
+
+    # map node ids to their index through the sorted ids
+    id_order = np.argsort(node_ids, kind="stable")
+    sorted_ids = node_ids[id_order]
+
+    def to_index(ids):
+        positions = np.searchsorted(sorted_ids, ids)
+        positions[positions == sorted_ids.size] = 0
+        if not np.all(sorted_ids[positions] == ids):
+            raise ValueError("Lines refer to node ids that are not in the nodes table.")
+        return id_order[positions]
+
+    up_ids = to_index(upstream_node_ids)
+    down_ids = to_index(downstream_node_ids)
+    line_order = np.lexsort((down_ids, up_ids))
+    up_ids = up_ids[line_order]
+    down_ids = down_ids[line_order]
+    edge_weights = edge_weights[line_order]
     np.nan_to_num(edge_weights, copy=False, nan=1)
 
     shape = None
-    n_nodes = nodes_df.shape[0]
-    n_edges = lines_df.shape[0]
+    n_nodes = node_ids.size
+    n_edges = up_ids.size
     pixarea = None
     bifurcates = True
     mask = None
-    coords = {"y": nodes_df["y"].to_numpy(), "x": nodes_df["x"].to_numpy()}
-
-    del nodes_df, lines_df
+    coords = {"y": y, "x": x}
 
     sources = get_sources(n_nodes, down_ids)
     sinks = get_sources(n_nodes, up_ids)
@@ -88,7 +246,8 @@ def from_grit(path):
     topological_labels = compute_topological_labels_bifurcations(down_ids, offsets, sources, sinks)
     topological_labels = topological_labels[up_ids]
 
-    sort_indices = np.argsort(topological_labels)
+    # sort by level, then by downstream node so that scatters can reduce contiguous segments
+    sort_indices = np.lexsort((up_ids, down_ids, topological_labels))
     sorted_distances = topological_labels[sort_indices]  # from source to sink
 
     edge_indices = np.arange(n_edges)
@@ -108,10 +267,12 @@ def from_grit(path):
     edge_weights /= edge_weights_norm
     del edge_weights_norm
 
+    sorted_data = np.vstack([down_ids_sort, up_ids_sort, edge_ids_sort]).astype(np.int64)
+
     return RiverNetworkStorage(
         n_nodes,
         n_edges,
-        np.vstack([down_ids_sort, up_ids_sort, edge_ids_sort]).astype(np.int64),
+        sorted_data,
         sources,
         sinks,
         coords,
@@ -121,4 +282,5 @@ def from_grit(path):
         shape,
         bifurcates,
         edge_weights,
+        compute_segments(sorted_data, splits),
     )
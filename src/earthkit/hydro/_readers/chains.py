@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+
+from earthkit.hydro.data_structures._network_storage import ChainSchedule
+
+
+def compute_chain_schedule(n_nodes, sorted_data, splits):
+    """
+    Contract a non-bifurcating river network into chains that can be accumulated with prefix scans.
+
+    Every node continues the chain of its upstream node with the largest contributing area, so
+    chains start at sources and all other upstream nodes join a chain through a junction edge.
+    A chain is processed once every chain joining it is complete: its junction edges are first
+    scattered into it, after which a single prefix scan along the chain finishes the accumulation.
+    Chains are grouped into stages such that all chains of a stage can be processed together. As
+    chains follow the largest upstream area, the number of stages grows at most logarithmically
+    with the number of nodes, instead of linearly with the length of the longest river.
+
+    Parameters
+    ----------
+    n_nodes : int
+        The number of nodes in the river network.
+    sorted_data : numpy.ndarray
+        The (3, n_edges) array of downstream, upstream and edge ids grouped by topological level.
+    splits : numpy.ndarray
+        Indices of where to split `sorted_data` into groups.
+
+    Returns
+    -------
+    ChainSchedule
+        The contracted schedule.
+    """
+    did, uid = sorted_data[0], sorted_data[1]
+    groups = np.split(np.arange(did.shape[0]), splits)
+
+    area = np.ones(n_nodes, dtype=np.int64)
+    for group in groups:
+        np.add.at(area, did[group], area[uid[group]])
+
+    # the first upstream edge of every node, ordered by decreasing area, continues the chain
+    order = np.lexsort((uid, -area[uid], did))
+    first = np.ones(did.shape[0], dtype=bool)
+    first[1:] = did[order[1:]] != did[order[:-1]]
+    continues = np.zeros(did.shape[0], dtype=bool)
+    continues[order[first]] = True
+    del area, order, first
+
+    # stage counts the junctions that have to be crossed to reach a node from any source
+    stage = np.zeros(n_nodes, dtype=np.int64)
+    position = np.zeros(n_nodes, dtype=np.int64)
+    for group in groups:
+        np.maximum.at(stage, did[group], stage[uid[group]] + ~continues[group])
+        chain_group = group[continues[group]]
+        position[did[chain_group]] = position[uid[chain_group]] + 1
+
+    # identify chains by their most downstream node
+    tail = np.arange(n_nodes)
+    for group in groups[::-1]:
+        chain_group = group[continues[group]]
+        tail[uid[chain_group]] = tail[did[chain_group]]
+
+    node_stage = stage[tail]
+    n_stages = int(node_stage.max()) + 1 if n_nodes > 0 else 0
+    stage_starts = np.arange(1, n_stages)
+
+    chain_nodes = np.lexsort((position, tail, node_stage))
+    chain_splits = np.searchsorted(node_stage[chain_nodes], stage_starts)
+
+    junctions = np.flatnonzero(~continues)
+    junction_stage = node_stage[did[junctions]]
+    junctions = junctions[np.lexsort((uid[junctions], did[junctions], junction_stage))]
+    junction_splits = np.searchsorted(node_stage[did[junctions]], stage_starts)
+
+    return ChainSchedule(
+        sorted_data[:, junctions].astype(np.int64),
+        junction_splits,
+        chain_nodes.astype(np.int64),
+        position[chain_nodes],
+        chain_splits,
+    )
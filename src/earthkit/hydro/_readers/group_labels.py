@@ -5,6 +5,8 @@ import os
 
 import numpy as np
 
+from earthkit.hydro._utils.profiling import call_rust
+
 
 def compute_topological_labels(sources, sinks, downstream_nodes, n_nodes):
 
@@ -20,25 +22,42 @@ def compute_topological_labels(sources, sinks, downstream_nodes, n_nodes):
         except ImportError:
             func = compute_topological_labels_python
 
-    return func(sources, sinks, downstream_nodes, n_nodes)
+    if func is compute_topological_labels_python:
+        return func(sources, sinks, downstream_nodes, n_nodes)
+    return call_rust(func, sources, sinks, downstream_nodes, n_nodes)
 
 
 def compute_topological_labels_python(
     sources: np.ndarray, sinks: np.ndarray, downstream_nodes: np.ndarray, n_nodes: int
 ):
+    # Kahn's algorithm one level at a time: a node enters the frontier once all of its
+    # upstream nodes have been labelled, so every node is visited exactly once
     n_nodes = downstream_nodes.shape[0]
-    inlets = downstream_nodes[sources]
+    downstream_nodes = downstream_nodes.astype(np.intp, copy=False)
+    in_degree = np.bincount(downstream_nodes[downstream_nodes != n_nodes], minlength=n_nodes)
     labels = np.zeros(n_nodes, dtype=np.intp)
-
-    for n in range(1, n_nodes + 1):
-        inlets = np.unique(inlets[inlets != n_nodes])  # subset to valid nodes
+    position = np.empty(n_nodes, dtype=np.intp)
+    inlets = sources
+    n_labelled = sources.shape[0]
+
+    n = 0
+    while True:
+        downstream = downstream_nodes[inlets]
+        downstream = downstream[downstream != n_nodes]
+        np.subtract.at(in_degree, downstream, 1)
+        inlets = downstream[in_degree[downstream] == 0]
+        # a node appears once per upstream node in the frontier, so keep only its last occurrence
+        index = np.arange(inlets.shape[0])
+        position[inlets] = index
+        inlets = inlets[position[inlets] == index]
         if inlets.shape[0] == 0:
             break
-        labels[inlets] = n  # update furthest distance from source
-        inlets = downstream_nodes[inlets]
+        n += 1
+        labels[inlets] = n  # furthest distance from source
+        n_labelled += inlets.shape[0]
 
-    if inlets.shape[0] != 0:
+    if n_labelled != n_nodes:
         raise ValueError("River Network contains a cycle.")
-    labels[sinks] = n - 1  # put all sinks in last group in topological ordering
+    labels[sinks] = n  # put all sinks in last group in topological ordering
 
     return labels
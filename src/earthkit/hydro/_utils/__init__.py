@@ -1,5 +1,2 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
-
-import earthkit.hydro._utils.decorators
-import earthkit.hydro._utils.readers
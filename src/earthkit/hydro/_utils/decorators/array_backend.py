@@ -4,6 +4,7 @@
 from functools import wraps
 
 from earthkit.hydro._backends.find import get_array_backend
+from earthkit.hydro._utils.profiling import active_profile, operation_name
 
 
 def multi_backend(allow_jax_jit=True, jax_static_args=None):
@@ -15,7 +16,16 @@ def multi_backend(allow_jax_jit=True, jax_static_args=None):
             xp = get_array_backend(kwargs["river_network"].groups[0])
             backend_name = xp.name
             kwargs["xp"] = xp
-            if backend_name == "jax" and allow_jax_jit:
+            use_jit = backend_name == "jax" and allow_jax_jit
+
+            profile = active_profile()
+            if profile is None:
+                return call(use_jit, kwargs)
+            with profile.operation(operation_name(func), backend_name, trace_levels=not use_jit):
+                return call(use_jit, kwargs)
+
+        def call(use_jit, kwargs):
+            if use_jit:
                 nonlocal compiled_jax_fn
                 if compiled_jax_fn is None:
                     from jax import jit
@@ -3,45 +3,56 @@
 
 from functools import wraps
 
+from earthkit.hydro._utils.profiling import timer
+
 
 def mask(unmask=True):
 
     def decorator(func):
 
         @wraps(func)
-        def wrapper(xp, river_network, field, *args, **kwargs):
+        def wrapper(xp, river_network, field, *args, out=None, **kwargs):
+
+            if out is not None and xp.name not in ["numpy", "cupy", "torch"]:
+                raise NotImplementedError(f"out is not supported for the {xp.name} backend.")
 
             if field.shape[-2:] == river_network.shape:
-                args, kwargs = process_args_kwargs(xp, river_network, args, kwargs)
-                field_1d = mask_last2_dims(xp, field, river_network.mask, field.shape)
+                with timer("mask"):
+                    args, kwargs = process_args_kwargs(xp, river_network, args, kwargs)
+                    field_1d = mask_last2_dims(xp, field, river_network.mask, field.shape)
 
                 out_1d = func(xp, river_network, field_1d, *args, **kwargs)
 
                 if unmask:
                     out_shape = field.shape
-                    return scatter_and_reshape(
-                        xp,
-                        river_network.mask,
-                        out_1d,
-                        out_shape,
-                        device=river_network.device,
-                    )
+                    with timer("unmask"):
+                        return scatter_and_reshape(
+                            xp,
+                            river_network.mask,
+                            out_1d,
+                            out_shape,
+                            device=river_network.device,
+                            out=out,
+                        )
                 else:
-                    return out_1d
+                    return assign_out(out_1d, out)
             else:
-                args, kwargs = process_args_kwargs(xp, river_network, args, kwargs)
+                with timer("mask"):
+                    args, kwargs = process_args_kwargs(xp, river_network, args, kwargs)
                 out_1d = func(xp, river_network, field, *args, **kwargs)
                 if unmask:
                     out_shape = field.shape[:-1] + river_network.shape
-                    return scatter_and_reshape(
-                        xp,
-                        river_network.mask,
-                        out_1d,
-                        out_shape,
-                        device=river_network.device,
-                    )
+                    with timer("unmask"):
+                        return scatter_and_reshape(
+                            xp,
+                            river_network.mask,
+                            out_1d,
+                            out_shape,
+                            device=river_network.device,
+                            out=out,
+                        )
                 else:
-                    return out_1d
+                    return assign_out(out_1d, out)
 
         return wrapper
 
@@ -56,13 +67,37 @@ def mask_last2_dims(xp, tensor, mask, target_shape):
     return xp.gather(tensor_flat, mask, axis=-1)
 
 
-def scatter_and_reshape(xp, mask, out_1d, target_shape, device):
+def scatter_and_reshape(xp, mask, out_1d, target_shape, device, out=None):
     B = target_shape[:-2]
     M, N = target_shape[-2], target_shape[-1]
     flat_shape = B + (M * N,)
-    out_flat = xp.full(flat_shape, xp.nan, device=device, dtype=out_1d.dtype)
+    if out is None:
+        out_flat = xp.full(flat_shape, xp.nan, device=device, dtype=out_1d.dtype)
+    else:
+        check_out(out, target_shape, out_1d.dtype)
+        # reshaping a non-contiguous out would copy it, and the scatter would miss out
+        contiguous = out.is_contiguous() if hasattr(out, "is_contiguous") else out.flags.c_contiguous
+        if not contiguous:
+            raise ValueError("out must be C-contiguous.")
+        out_flat = xp.reshape(out, flat_shape)
+        out_flat[...] = xp.nan
     out_flat = xp.scatter_assign(out_flat, mask, out_1d)
-    return xp.reshape(out_flat, target_shape)
+    return xp.reshape(out_flat, target_shape) if out is None else out
+
+
+def assign_out(out_1d, out):
+    if out is None or out_1d is out:
+        return out_1d
+    check_out(out, out_1d.shape, out_1d.dtype)
+    out[...] = out_1d
+    return out
+
+
+def check_out(out, shape, dtype):
+    if tuple(out.shape) != tuple(shape):
+        raise ValueError(f"out must be of shape {tuple(shape)}, not {tuple(out.shape)}.")
+    if out.dtype != dtype:
+        raise ValueError(f"out must be of dtype {dtype}, not {out.dtype}.")
 
 
 def process_args_kwargs(xp, river_network, args, kwargs):
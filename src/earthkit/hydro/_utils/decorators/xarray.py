@@ -5,7 +5,6 @@ from functools import wraps
 from inspect import signature
 
 import numpy as np
-import xarray as xr
 
 from earthkit.hydro._utils.coords import get_core_dims, node_default_coord
 
@@ -24,6 +23,8 @@ def assert_xr_compatible_backend(network):
 
 
 def sort_xr_nonxr_args(all_args):
+    import xarray as xr
+
     xr_args = []
     non_xr_kwargs = {}
     arg_order = []
@@ -73,10 +74,28 @@ def get_input_output_core_dims(input_core_dims, output_core_dims, xr_args, river
     return input_core_dims, output_core_dims
 
 
+def get_node_coords(river_network):
+    coords = list(river_network.coords.values())[::-1]
+    coords_grid = np.meshgrid(*coords)[::-1]
+    return {k: v.flat[river_network.mask] for k, v in zip(river_network.coords.keys(), coords_grid)}
+
+
+def reject_array_only_args(func, kwargs):
+    # results are always new xarray objects, so output buffers and in-place inputs are left to the array functions
+    for name in ["out", "overwrite_input"]:
+        if name in kwargs:
+            package = func.__module__.rsplit(".", 1)[0]
+            raise TypeError(f"{func.__name__}() does not support {name}, use {package}.array.{func.__name__} instead.")
+
+
 def xarray(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        # imported on first call rather than with earthkit.hydro, as it is slow to import
+        import xarray as xr
+
+        reject_array_only_args(func, kwargs)
 
         # Inspect the function signature and bind all arguments
         all_args = get_full_signature(func, *args, **kwargs)
@@ -113,12 +132,7 @@ def xarray(func):
             result = xr.DataArray(output, dims=dim_names, coords=coords, name="out")
 
             if not return_grid:
-                coords = list(river_network.coords.values())[::-1]
-                coords_grid = np.meshgrid(*coords)[::-1]
-                assign_dict = {
-                    k: (node_default_coord, v.flat[river_network.mask])
-                    for k, v in zip(river_network.coords.keys(), coords_grid)
-                }
+                assign_dict = {k: (node_default_coord, v) for k, v in get_node_coords(river_network).items()}
                 result = result.assign_coords(**assign_dict)
         else:
             reshuffled_func = get_reshuffled_func(func, arg_order)
@@ -146,12 +160,7 @@ def xarray(func):
             )
 
             if len(output_core_dims[0]) == 1:
-                coords = list(river_network.coords.values())[::-1]
-                coords_grid = np.meshgrid(*coords)[::-1]
-                assign_dict = {
-                    k: (output_core_dims[0], v.flat[river_network.mask])
-                    for k, v in zip(river_network.coords.keys(), coords_grid)
-                }
+                assign_dict = {k: (output_core_dims[0], v) for k, v in get_node_coords(river_network).items()}
                 result = result.assign_coords(**assign_dict)
 
         return result
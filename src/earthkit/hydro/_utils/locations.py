@@ -31,15 +31,10 @@ def locations_to_1d(xp, river_network, locations):
         # TODO: make this code actually xp agnostic
         rows, cols = stations[:, 0], stations[:, 1]
         flat_indices = rows * river_network.shape[1] + cols
+        # the mask holds the sorted flat indices of the nodes, so no lookup table the size of the grid is needed
         flat_mask = river_network.mask
-        reverse_map = -xp.ones(
-            river_network.shape[0] * river_network.shape[1],
-            dtype=int,
-            device=river_network.device,
-        )
-        reverse_map[flat_mask] = xp.arange(flat_mask.shape[0], device=river_network.device)
-        masked_indices = reverse_map[flat_indices]
-        if xp.any(masked_indices < 0):
+        masked_indices = xp.searchsorted(flat_mask, flat_indices)
+        if xp.any(masked_indices >= flat_mask.shape[0]) or xp.any(flat_mask[masked_indices] != flat_indices):
             raise ValueError("Some station points are not included in the masked array.")
         stations = xp.asarray(masked_indices, device=river_network.device)
     else:
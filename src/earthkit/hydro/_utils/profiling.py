@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+
+# the profile collecting records, if any. Every hook checks it once and does nothing else when unset
+_active = ContextVar("earthkit_hydro_profile", default=None)
+
+_null_timer = nullcontext()
+
+
+def active_profile():
+    return _active.get()
+
+
+def timer(event, **fields):
+    """
+    Times the enclosed block as an `event` of the active profile, if any.
+    """
+    profile = _active.get()
+    if profile is None:
+        return _null_timer
+    return profile.timer(event, **fields)
+
+
+def call_rust(func, *args, **kwargs):
+    """
+    Calls a function of the Rust extension, timing it if profiling.
+    """
+    profile = _active.get()
+    if profile is None:
+        return func(*args, **kwargs)
+    with profile.timer("rust", function=func.__name__):
+        return func(*args, **kwargs)
+
+
+def operation_name(func):
+    # e.g. earthkit.hydro.upstream.array._operations.sum -> upstream.sum
+    module = func.__module__.split(".")
+    package = module[2] if len(module) > 2 and module[:2] == ["earthkit", "hydro"] else func.__module__
+    return f"{package}.{func.__name__}"
+
+
+def itemsize(x):
+    try:
+        return x.dtype.itemsize
+    except AttributeError:  # torch < 2.1
+        return x.element_size()
+
+
+class Profile:
+    """
+    Timings collected by :func:`profile`.
+
+    Every record is a dict with at least the keys "event", "op" (the operation being
+    run, e.g. "upstream.sum", or None outside of one) and "time" (in seconds). Events are:
+
+    - "call": a whole operation, with its array "backend",
+    - "mask" and "unmask": the conversion of gridded inputs to masked ones and back,
+    - "level": one level of the topological sort, with its "level" index, its number of
+      "edges" and the "bytes_gathered" from upstream nodes and "bytes_scattered" to
+      downstream nodes,
+    - "rust": a call to the Rust extension, with the name of its "function".
+
+    Attributes
+    ----------
+    records : list of dict
+        The records, in order of completion.
+    """
+
+    def __init__(self, trace=None):
+        self.records = []
+        self._ops = []
+        self._suspended = 0
+        self._trace = trace
+        self._trace_file = None
+
+    def record(self, event, time, **fields):
+        record = {"event": event, "op": self._ops[-1] if self._ops else None, "time": time, **fields}
+        self.records.append(record)
+        if self._trace_file is not None:
+            self._trace_file.write(json.dumps(record) + "\n")
+
+    @contextmanager
+    def timer(self, event, **fields):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(event, perf_counter() - start, **fields)
+
+    @contextmanager
+    def operation(self, name, backend, trace_levels=True):
+        # levels of jitted functions only run while tracing, so their timings would be misleading
+        self._ops.append(name)
+        self._suspended += not trace_levels
+        try:
+            with self.timer("call", backend=backend):
+                yield
+        finally:
+            self._suspended -= not trace_levels
+            self._ops.pop()
+
+    def profile_levels(self, operation, n_levels, reverse, n_nodes):
+        """
+        Wraps the per-level operation of a propagation to record every level.
+
+        The batch size is the number of values per node of the field, whether the node
+        axis comes last or first (node-major).
+        """
+        if self._suspended:
+            return operation
+        levels = iter(range(n_levels - 1, -1, -1) if reverse else range(n_levels))
+
+        def profiled_operation(field, did, uid, eid, *args, **kwargs):
+            level = next(levels)
+            start = perf_counter()
+            field = operation(field, did, uid, eid, *args, **kwargs)
+            elapsed = perf_counter() - start
+
+            n_edges = int(did.shape[0])
+            n_values = 1
+            for size in field.shape:
+                n_values *= size
+            n_bytes = n_edges * (n_values // n_nodes) * itemsize(field)
+            self.record(
+                "level",
+                elapsed,
+                level=level,
+                edges=n_edges,
+                bytes_gathered=n_bytes,
+                bytes_scattered=n_bytes,
+            )
+            return field
+
+        return profiled_operation
+
+    def summary(self):
+        """
+        Aggregates the records per operation and event.
+
+        Returns
+        -------
+        dict
+            Maps every operation to a dict mapping its events to their "count", total
+            "time" and, for levels, total "edges", "bytes_gathered" and "bytes_scattered".
+        """
+        summary = {}
+        for record in self.records:
+            totals = summary.setdefault(record["op"], {}).setdefault(record["event"], {"count": 0, "time": 0.0})
+            totals["count"] += 1
+            totals["time"] += record["time"]
+            for key in ["edges", "bytes_gathered", "bytes_scattered"]:
+                if key in record:
+                    totals[key] = totals.get(key, 0) + record[key]
+        return summary
+
+    def __enter__(self):
+        if isinstance(self._trace, (str, os.PathLike)):
+            self._trace_file = open(self._trace, "w")
+        else:
+            self._trace_file = self._trace
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _active.reset(self._token)
+        if isinstance(self._trace, (str, os.PathLike)):
+            self._trace_file.close()
+        elif self._trace_file is not None:
+            self._trace_file.flush()
+        self._trace_file = None
+
+
+def profile(trace=None):
+    """
+    Context manager collecting timings of the earthkit-hydro operations run inside it.
+
+    Records the time of every operation, of masking and unmasking gridded fields, of
+    every level of the topological sort (with its edge count and the bytes gathered
+    and scattered) and of every call to the Rust extension. Outside of this context,
+    no timings are collected and the hooks cost a single check per call.
+
+    Timings on asynchronous devices (e.g. GPUs) are dispatch times, and jitted jax
+    operations are only timed as a whole.
+
+    Parameters
+    ----------
+    trace : str or path-like or file-like, optional
+        Where to write every record as a line of JSON as soon as it is collected.
+        Default is None, which only keeps the records in memory.
+
+    Returns
+    -------
+    Profile
+        The profile, whose `records` and `summary()` are available inside and after the context.
+
+    Examples
+    --------
+    >>> import earthkit.hydro as ekh
+    >>> with ekh.profile(trace="trace.jsonl") as prof:
+    ...     ekh.upstream.sum(network, field)
+    >>> prof.summary()["upstream.sum"]["level"]["time"]
+    """
+    return Profile(trace)
@@ -25,69 +25,73 @@ CR_REAL4 = 0x5A  # single scalar and single directional
 CR_REAL8 = 0xDB  # double scalar or directional, no loss of precision
 
 
-def _replace_missing_u1(cur, new):
-    out = np.copy(cur)
-    out[cur == 255] = new
-    return out
-
-
-def _replace_missing_i4(cur, new):
-    out = np.copy(cur)
-    out[cur == -2147483648] = new
-    return out
-
-
-def _replace_missing_f4(cur, new):
-    out = np.copy(cur)
-    out[np.isnan(cur)] = new
-    return out
-
-
-def _replace_missing_f8(cur, new):
-    out = np.copy(cur)
-    out[np.isnan(cur)] = new
-    return out
-
-
 CELLREPR = {
     CR_UINT1: {
         "dtype": np.dtype("uint8"),
-        "fillmv": _replace_missing_u1,
+        "mv": 255,
     },
     CR_INT4: {
         "dtype": np.dtype("int32"),
-        "fillmv": _replace_missing_i4,
+        "mv": -2147483648,
     },
     CR_REAL4: {
         "dtype": np.dtype("float32"),
-        "fillmv": _replace_missing_f4,
+        "mv": None,  # NaN
     },
     CR_REAL8: {
         "dtype": np.dtype("float64"),
-        "fillmv": _replace_missing_f8,
+        "mv": None,  # NaN
     },
 }
 
-
-def from_file(path, mask=False):
-    """Load a .map file into a numpy array."""
-
+NBYTES_HEADER = 256
+
+
+def from_file(path, mask=False, window=None, dtype=None):
+    """
+    Load a .map file into a numpy array.
+
+    The data is memory-mapped rather than read, so only the parts of the file that are
+    used are loaded. It is mapped copy-on-write, so modifying the array never modifies the file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the .map file.
+    mask : bool, optional
+        Whether to replace missing values by NaN, which returns a floating point copy of the
+        data. Default is False, which returns the stored values.
+    window : tuple of slice, optional
+        The rows and columns to load, e.g. `(slice(100, 200), slice(None))`. Default is None,
+        which loads the whole map.
+    dtype : data-type, optional
+        The floating point dtype of masked data. Default is None, which uses the smallest
+        floating point dtype representing the stored values exactly, e.g. float32 for ldds.
+
+    Returns
+    -------
+    numpy.ndarray
+        The 2d map, a memory-mapped array unless `mask` is True.
+    """
     with open(path, "rb") as f:
-        bytes = f.read()
+        header = f.read(NBYTES_HEADER)
 
     nbytes_header = 64 + 2 + 2 + 8 + 8 + 8 + 8 + 4 + 4 + 8 + 8 + 8
-    _, cellRepr, _, _, _, _, nrRows, nrCols, _, _, _ = unpack("=hhddddIIddd", bytes[64:nbytes_header])
+    _, cellRepr, _, _, _, _, nrRows, nrCols, _, _, _ = unpack("=hhddddIIddd", header[64:nbytes_header])
 
     try:
         celltype = CELLREPR[cellRepr]
     except KeyError:
         raise ValueError(f"{path}: invalid cellRepr value ({cellRepr}) in header")
 
-    dtype = celltype["dtype"]
+    data = np.memmap(path, dtype=celltype["dtype"], mode="c", offset=NBYTES_HEADER, shape=(nrRows, nrCols))
+    if window is not None:
+        data = data[window]
 
-    size = dtype.itemsize * nrRows * nrCols
-    data = np.frombuffer(bytes[256 : 256 + size], dtype)
     if mask:
-        data = celltype["fillmv"](data.astype(np.float64), np.nan)
+        out = data.astype(np.result_type(data.dtype, np.float32) if dtype is None else dtype)
+        if celltype["mv"] is not None:
+            out[data == celltype["mv"]] = np.nan
+        data = out
 
-    return data.reshape((nrRows, nrCols))
+    return data
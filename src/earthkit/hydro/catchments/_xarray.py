@@ -4,7 +4,6 @@
 from functools import wraps
 
 import numpy as np
-import xarray as xr
 
 from earthkit.hydro._backends.find import get_array_backend
 from earthkit.hydro._utils.coords import get_core_dims, node_default_coord
@@ -30,6 +29,8 @@ def xarray(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        # imported on first call rather than with earthkit.hydro, as it is slow to import
+        import xarray as xr
 
         # Inspect the function signature and bind all arguments
         all_args = get_full_signature(func, *args, **kwargs)
@@ -1,10 +1,68 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import numpy as np
+
 from earthkit.hydro._core._find import _flow_find
 from earthkit.hydro._utils.decorators import mask
+from earthkit.hydro.subnetwork import from_mask
 from earthkit.hydro.upstream.array._operations import calculate_upstream_metric
 
+# restricting to the catchments only pays off if it drops a good part of the network
+MAX_CATCHMENT_FRACTION = 0.5
+
+# number of station sets whose catchment index is kept per river network
+MAX_CACHED_INDICES = 8
+
+
+def get_catchment_index(river_network, stations_1d):
+    """
+    Restricts a river network to the catchments of a set of stations.
+
+    The index is computed once per station set and cached on the river network, so
+    repeated calls (e.g. one per timestep) reuse it. Up to `MAX_CACHED_INDICES` indices
+    are kept until :meth:`RiverNetwork.clear_cache` is called.
+
+    Returns
+    -------
+    tuple or None
+        The subnetwork of all nodes upstream of any station, the original ids of its
+        nodes and edges, and the station ids in the subnetwork. None if the catchments
+        cover too much of the network for the restriction to be worthwhile.
+    """
+    # normalised, so that station sets of other dtypes cannot share the bytes of a different set
+    stations_1d = np.asarray(stations_1d, dtype=np.int64)
+    cached_indices = river_network._catchment_indices
+    key = stations_1d.tobytes()
+    if key in cached_indices:
+        return cached_indices[key]
+
+    # walk from the sinks up to mark every node draining into a station
+    in_catchment = np.zeros(river_network.n_nodes, dtype=bool)
+    in_catchment[stations_1d] = True
+    for did, uid, _ in reversed(river_network.groups):
+        in_catchment[uid[in_catchment[did]]] = True
+
+    index = None
+    n_catchment_nodes = int(in_catchment.sum())
+    if n_catchment_nodes <= MAX_CATCHMENT_FRACTION * river_network.n_nodes:
+        did, uid, eid = river_network._storage.sorted_data
+        in_catchment_edge = np.zeros(river_network.n_edges, dtype=bool)
+        in_catchment_edge[eid] = in_catchment[did] & in_catchment[uid]
+
+        node_relabel = np.cumsum(in_catchment) - 1
+        index = (
+            from_mask(river_network, node_mask=in_catchment),
+            np.flatnonzero(in_catchment),
+            np.flatnonzero(in_catchment_edge),
+            node_relabel[stations_1d],
+        )
+
+    if len(cached_indices) >= MAX_CACHED_INDICES:
+        cached_indices.pop(next(iter(cached_indices)))
+    cached_indices[key] = index
+    return index
+
 
 def calculate_catchment_metric(
     xp,
@@ -15,6 +73,16 @@ def calculate_catchment_metric(
     node_weights,
     edge_weights,
 ):
+    index = get_catchment_index(river_network, stations_1d) if xp.name == "numpy" else None
+    if index is not None:
+        # only nodes draining into a station contribute, so accumulate over the subnetwork alone
+        river_network, nodes, edges, stations_1d = index
+        field = xp.gather(field, nodes, axis=-1)
+        if node_weights is not None:
+            node_weights = xp.gather(node_weights, nodes, axis=-1)
+        if edge_weights is not None:
+            edge_weights = xp.gather(edge_weights, edges, axis=-1)
+
     upstream_metric_field = calculate_upstream_metric(
         xp,
         river_network,
@@ -3,7 +3,7 @@
 
 import numpy as np
 
-from ._network_storage import RiverNetworkStorage
+from ._network_storage import RiverNetworkStorage, compute_segments
 
 
 class RiverNetwork:
@@ -55,6 +55,18 @@ class RiverNetwork:
         self.data = [self._storage.sorted_data]
         self.groups = np.split(self._storage.sorted_data, self._storage.splits, axis=1)
 
+        # older stored networks predate segments, so derive them if possible
+        segments = getattr(self._storage, "segments", None)
+        if segments is None:
+            segments = compute_segments(self._storage.sorted_data, self._storage.splits)
+        self.segments = None if segments is None else split_segments(segments, self._storage.splits)
+
+        chains = getattr(self._storage, "chains", None)
+        self.chains = None if chains is None else split_chains(chains)
+
+        # station catchment restrictions reused by the catchment metrics
+        self._catchment_indices = {}
+
     def __str__(self):
         return f"RiverNetwork with {self.n_nodes} nodes and {self.n_edges} edges."
 
@@ -99,6 +111,7 @@ class RiverNetwork:
             self.groups = [convert(group, device=device, array_namespace=array_backend) for group in self.groups]
             self.mask = convert(self.mask, device=device, array_namespace=array_backend)
             self.data = [convert(self.data[0], device=device, array_namespace=array_backend)]
+            self.chains = self._convert_chains(lambda x: convert(x, device=device, array_namespace=array_backend))
         elif array_backend == "jax":
             assert device == "cpu"
             import jax.numpy as jnp
@@ -106,6 +119,7 @@ class RiverNetwork:
             self.groups = [jnp.array(x) for x in self.groups]
             self.mask = jnp.array(self.mask)
             self.data = [jnp.array(self.data[0])]
+            self.chains = self._convert_chains(jnp.array)
         elif array_backend == "tensorflow":
             assert device == "cpu"
             import tensorflow as tf
@@ -113,12 +127,14 @@ class RiverNetwork:
             self.groups = [tf.convert_to_tensor(x, dtype=tf.int32) for x in self.groups]
             self.mask = tf.convert_to_tensor(self.mask, dtype=tf.int32)
             self.data = [tf.convert_to_tensor(self.data[0], dtype=tf.int32)]
+            self.chains = self._convert_chains(lambda x: tf.convert_to_tensor(x, dtype=tf.int32))
         elif array_backend == "mlx":
             import mlx.core as mx
 
             self.groups = [mx.array(x) for x in self.groups]
             self.mask = mx.array(self.mask)
             self.data = [mx.array(self.data[0])]
+            self.chains = self._convert_chains(mx.array)
         else:
             raise NotImplementedError
 
@@ -129,6 +145,14 @@ class RiverNetwork:
             self.device = None
         return self
 
+    def _convert_chains(self, convert):
+        if self.chains is None:
+            return None
+        return [
+            (convert(junctions), convert(nodes), convert(positions), convert(index), max_position)
+            for junctions, nodes, positions, index, max_position in self.chains
+        ]
+
     def set_default_return_type(self, return_type):
         """
         Set the default return type for the river network.
@@ -146,6 +170,20 @@ class RiverNetwork:
             raise ValueError(f'Invalid return_type {return_type}. Valid types are "gridded", "masked"')
         self.return_type = return_type
 
+    def clear_cache(self):
+        """
+        Drop the catchment restrictions cached by the catchment metrics.
+
+        The catchment metrics keep the subnetworks of the last few station sets on the
+        river network, each up to half its size. Clearing them frees that memory, at the
+        cost of recomputing them on the next call.
+
+        Returns
+        -------
+        None
+        """
+        self._catchment_indices.clear()
+
     def export(self, fpath="river_network.joblib", compression=1):
         """
         Save the river network to a local file.
@@ -167,3 +205,31 @@ class RiverNetwork:
         import joblib
 
         joblib.dump(self._storage, fpath, compress=compression)
+
+
+def split_segments(segments, splits):
+    """
+    Split global run start indices into per-group arrays relative to each group's start.
+    """
+    per_group = np.split(segments, np.searchsorted(segments, splits))
+    group_starts = np.concatenate([[0], splits]).astype(segments.dtype)
+    return [group_segments - start for group_segments, start in zip(per_group, group_starts)]
+
+
+def split_chains(chains):
+    """
+    Split a ChainSchedule into per-stage (junctions, nodes, positions, index, max_position) tuples.
+    """
+    junctions = np.split(chains.junction_data, chains.junction_splits, axis=1)
+    nodes = np.split(chains.chain_nodes, chains.chain_splits)
+    positions = np.split(chains.chain_positions, chains.chain_splits)
+    return [
+        (
+            stage_junctions,
+            stage_nodes,
+            stage_positions,
+            np.arange(stage_nodes.shape[0], dtype=np.int64),
+            int(stage_positions.max(initial=0)),
+        )
+        for stage_junctions, stage_nodes, stage_positions in zip(junctions, nodes, positions)
+    ]
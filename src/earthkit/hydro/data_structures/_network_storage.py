@@ -1,6 +1,8 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import numpy as np
+
 
 class RiverNetworkStorage:
     def __init__(
@@ -17,6 +19,9 @@ class RiverNetworkStorage:
         shape,
         bifurcates=False,
         edge_weights=None,
+        segments=None,  # indices of sorted_data where a run of equal downstream ids starts
+        chains=None,  # optional ChainSchedule contracting unbranched chains
+        adjacency=None,  # optional Adjacency, built on first use by get_adjacency
     ):
         self.n_nodes = n_nodes
         self.n_edges = n_edges
@@ -30,4 +35,115 @@ class RiverNetworkStorage:
         self.mask = mask
         self.shape = shape
         self.edge_weights = edge_weights
+        self.segments = segments
+        self.chains = chains
+        self.adjacency = adjacency
         assert not (bifurcates and edge_weights is None)
+
+
+def compute_segments(sorted_data, splits):
+    """
+    Find where each run of equal downstream node ids starts in `sorted_data`.
+
+    Runs never cross a group boundary, so every group start is also a run start.
+
+    Parameters
+    ----------
+    sorted_data : numpy.ndarray
+        The (3, n_edges) array of downstream, upstream and edge ids grouped by topological level.
+    splits : numpy.ndarray
+        Indices of where to split `sorted_data` into groups.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        The sorted run start indices, or None if the downstream ids are not sorted within every group.
+    """
+    did = sorted_data[0]
+    n_edges = did.shape[0]
+    splits = np.asarray(splits, dtype=np.int64)
+    splits = splits[splits < n_edges]
+
+    ascending = did[1:] >= did[:-1]
+    ascending[splits[splits > 0] - 1] = True
+    if not np.all(ascending):
+        return None
+
+    starts = np.ones(n_edges, dtype=bool)
+    starts[1:] = did[1:] != did[:-1]
+    starts[splits] = True
+    return np.flatnonzero(starts)
+
+
+class ChainSchedule:
+    def __init__(
+        self,
+        junction_data,  # np.vstack((down_ids, up_ids, edge_ids)) of edges joining two chains, sorted by stage
+        junction_splits,  # indices of where to split junction_data into stages
+        chain_nodes,  # nodes sorted by stage, then chain, then position along the chain
+        chain_positions,  # position of each node along its chain, starting at 0 for the most upstream node
+        chain_splits,  # indices of where to split chain_nodes into stages
+    ):
+        self.junction_data = junction_data
+        self.junction_splits = junction_splits
+        self.chain_nodes = chain_nodes
+        self.chain_positions = chain_positions
+        self.chain_splits = chain_splits
+
+
+class Adjacency:
+    def __init__(
+        self,
+        upstream_offsets,  # upstream_nodes[upstream_offsets[i]:upstream_offsets[i + 1]] are upstream of node i
+        upstream_nodes,
+        upstream_edges,  # columns of sorted_data of the edges from upstream_nodes
+        downstream_nodes,  # downstream node of every node, n_nodes for sinks, or None if bifurcating
+    ):
+        self.upstream_offsets = upstream_offsets
+        self.upstream_nodes = upstream_nodes
+        self.upstream_edges = upstream_edges
+        self.downstream_nodes = downstream_nodes
+
+
+def compute_adjacency(n_nodes, sorted_data, bifurcates=False):
+    """
+    Index the upstream nodes of every node in CSR format, and the downstream node of every node.
+
+    Parameters
+    ----------
+    n_nodes : int
+        The number of nodes.
+    sorted_data : numpy.ndarray
+        The (3, n_edges) array of downstream, upstream and edge ids grouped by topological level.
+    bifurcates : bool, optional
+        Whether nodes can have several downstream nodes, in which case there are no downstream
+        pointers. Default is False.
+
+    Returns
+    -------
+    Adjacency
+        The upstream and downstream neighbours of every node.
+    """
+    down_ids, up_ids, _ = sorted_data
+    upstream_edges = np.argsort(down_ids, kind="stable")
+    upstream_offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+    upstream_offsets[1:] = np.cumsum(np.bincount(down_ids, minlength=n_nodes))
+
+    downstream_nodes = None
+    if not bifurcates:
+        downstream_nodes = np.full(n_nodes, n_nodes, dtype=np.int64)
+        downstream_nodes[up_ids] = down_ids
+
+    return Adjacency(upstream_offsets, up_ids[upstream_edges], upstream_edges, downstream_nodes)
+
+
+def get_adjacency(storage):
+    """
+    The adjacency of a river network storage, built on first use and kept on the storage.
+    """
+    # older stored networks predate the adjacency attribute
+    adjacency = getattr(storage, "adjacency", None)
+    if adjacency is None:
+        adjacency = compute_adjacency(storage.n_nodes, storage.sorted_data, storage.bifurcates)
+        storage.adjacency = adjacency
+    return adjacency
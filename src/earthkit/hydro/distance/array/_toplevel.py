@@ -11,6 +11,7 @@ def min(
     upstream=False,
     downstream=True,
     return_type=None,
+    out=None,
 ):
     r"""
     Calculates the minimum distance to all points from a set of start
@@ -51,6 +52,9 @@ def min(
         Whether or not to consider downstream distances. Default is True.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -64,6 +68,7 @@ def min(
         upstream=upstream,
         downstream=downstream,
         return_type=return_type,
+        out=out,
     )
 
 
@@ -74,6 +79,7 @@ def max(
     upstream=False,
     downstream=True,
     return_type=None,
+    out=None,
 ):
     r"""
     Calculates the maximum distance to all points from a set of start
@@ -114,6 +120,9 @@ def max(
         Whether or not to consider downstream distances. Default is True.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -127,6 +136,7 @@ def max(
         upstream=upstream,
         downstream=downstream,
         return_type=return_type,
+        out=out,
     )
 
 
@@ -135,6 +145,7 @@ def to_source(
     field=None,
     path="shortest",
     return_type=None,
+    out=None,
 ):
     r"""
     Calculates the maximum distance to all points from the river network sources.
@@ -171,6 +182,9 @@ def to_source(
         Whether to compute the longest or shortest path. Default is "shortest".
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -179,14 +193,14 @@ def to_source(
     """
     locations = river_network.sources
     if path == "longest":
-        return max(river_network, locations, field, False, True, return_type)
+        return max(river_network, locations, field, False, True, return_type, out)
     elif path == "shortest":
-        return min(river_network, locations, field, False, True, return_type)
+        return min(river_network, locations, field, False, True, return_type, out)
     else:
         raise ValueError("path must be 'longest' or 'shortest'")
 
 
-def to_sink(river_network, field=None, path="shortest", return_type=None):
+def to_sink(river_network, field=None, path="shortest", return_type=None, out=None):
     r"""
     Calculates the maximum distance to all points from the river network sinks.
 
@@ -222,6 +236,9 @@ def to_sink(river_network, field=None, path="shortest", return_type=None):
         Whether to compute the longest or shortest path. Default is "shortest".
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -230,8 +247,8 @@ def to_sink(river_network, field=None, path="shortest", return_type=None):
     """
     locations = river_network.sinks
     if path == "longest":
-        return max(river_network, locations, field, True, False, return_type)
+        return max(river_network, locations, field, True, False, return_type, out)
     elif path == "shortest":
-        return min(river_network, locations, field, True, False, return_type)
+        return min(river_network, locations, field, True, False, return_type, out)
     else:
         raise ValueError("path must be 'longest' or 'shortest'")
@@ -3,6 +3,7 @@
 
 from earthkit.hydro._core.online import calculate_online_metric
 from earthkit.hydro._utils.decorators import mask, multi_backend
+from earthkit.hydro._utils.profiling import call_rust
 
 
 def calculate_downstream_metric(
@@ -12,6 +13,7 @@ def calculate_downstream_metric(
     metric,
     node_weights,
     edge_weights,
+    overwrite_input=False,
 ):
     return calculate_online_metric(
         xp,
@@ -20,11 +22,12 @@ def calculate_downstream_metric(
         metric,
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
         flow_direction="up",
     )
 
 
-def percentile(river_network, field, weights, p, return_type):
+def percentile(river_network, field, weights, p, return_type, out=None):
     try:
         from earthkit.hydro import _rust
     except Exception as e:
@@ -32,11 +35,11 @@ def percentile(river_network, field, weights, p, return_type):
 
     def calculate_percentile(xp, river_network, field, weights, p):
         if weights is not None:
-            return _rust.calc_weighted_perc_downstream(
-                river_network.groups, field, weights, p, river_network.bifurcates
+            return call_rust(
+                _rust.calc_weighted_perc_downstream, river_network.groups, field, weights, p, river_network.bifurcates
             )
         else:
-            return _rust.calc_perc_downstream(river_network.groups, field, p, river_network.bifurcates)
+            return call_rust(_rust.calc_perc_downstream, river_network.groups, field, p, river_network.bifurcates)
 
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
@@ -51,11 +54,12 @@ def percentile(river_network, field, weights, p, return_type):
         field,
         weights,
         p,  # ignored
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def var(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def var(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -67,11 +71,13 @@ def var(xp, river_network, field, node_weights, edge_weights, return_type):
         "var",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def skewness(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def skewness(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -83,11 +89,13 @@ def skewness(xp, river_network, field, node_weights, edge_weights, return_type):
         "skewness",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def std(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def std(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -99,11 +107,13 @@ def std(xp, river_network, field, node_weights, edge_weights, return_type):
         "std",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def mean(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def mean(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -115,11 +125,13 @@ def mean(xp, river_network, field, node_weights, edge_weights, return_type):
         "mean",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def sum(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def sum(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -131,11 +143,13 @@ def sum(xp, river_network, field, node_weights, edge_weights, return_type):
         "sum",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def min(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def min(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -147,11 +161,13 @@ def min(xp, river_network, field, node_weights, edge_weights, return_type):
         "min",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def max(xp, river_network, field, node_weights, edge_weights, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "overwrite_input"])
+def max(xp, river_network, field, node_weights, edge_weights, return_type, out=None, overwrite_input=False):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
@@ -163,11 +179,13 @@ def max(xp, river_network, field, node_weights, edge_weights, return_type):
         "max",
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
+        out=out,
     )
 
 
 @multi_backend(jax_static_args=["xp", "river_network", "return_type"])
-def mode(xp, river_network, field, node_weights, edge_weights, return_type):
+def mode(xp, river_network, field, node_weights, edge_weights, return_type, out=None):
     try:
         from earthkit.hydro import _rust
     except Exception as e:
@@ -177,7 +195,7 @@ def mode(xp, river_network, field, node_weights, edge_weights, return_type):
         # Mode only supported for numpy backend with Rust
         if xp.name != "numpy":
             raise NotImplementedError("Mode is only supported for numpy backend with Rust")
-        return _rust.calc_mode_downstream(river_network.groups, field, river_network.bifurcates)
+        return call_rust(_rust.calc_mode_downstream, river_network.groups, field, river_network.bifurcates)
 
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
@@ -192,4 +210,5 @@ def mode(xp, river_network, field, node_weights, edge_weights, return_type):
         field,
         node_weights,
         edge_weights,  # ignored
+        out=out,
     )
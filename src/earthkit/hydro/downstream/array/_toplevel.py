@@ -1,10 +1,11 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+from earthkit.hydro._core.plan import AccumulationPlan
 from earthkit.hydro.downstream.array import _operations
 
 
-def percentile(river_network, field, p, node_weights=None, edge_weights=None, return_type=None):
+def percentile(river_network, field, p, node_weights=None, edge_weights=None, return_type=None, out=None):
     r"""
     Computes the weighted percentile of a field over all downstream nodes.
 
@@ -65,6 +66,9 @@ def percentile(river_network, field, p, node_weights=None, edge_weights=None, re
         Currently unsupported.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -83,10 +87,11 @@ def percentile(river_network, field, p, node_weights=None, edge_weights=None, re
         weights=node_weights,
         p=p,
         return_type=return_type,
+        out=out,
     )
 
 
-def var(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def var(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted variance of a field over all downstream nodes.
 
@@ -134,6 +139,11 @@ def var(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -146,10 +156,14 @@ def var(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def skewness(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def skewness(
+    river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False
+):
     r"""
     Computes the weighted skewness of a field over all downstream nodes.
 
@@ -193,6 +207,11 @@ def skewness(river_network, field, node_weights=None, edge_weights=None, return_
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -205,10 +224,12 @@ def skewness(river_network, field, node_weights=None, edge_weights=None, return_
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def std(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def std(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted standard deviation of a field over all
     downstream nodes.
@@ -259,6 +280,11 @@ def std(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -271,10 +297,12 @@ def std(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def mean(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def mean(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted mean of a field over all downstream nodes.
 
@@ -317,6 +345,11 @@ def mean(river_network, field, node_weights=None, edge_weights=None, return_type
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -329,10 +362,12 @@ def mean(river_network, field, node_weights=None, edge_weights=None, return_type
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def sum(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def sum(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted sum of a field over all downstream nodes.
 
@@ -371,6 +406,11 @@ def sum(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -383,10 +423,12 @@ def sum(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def min(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def min(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted minimum of a field over all downstream nodes.
 
@@ -425,6 +467,11 @@ def min(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -437,10 +484,12 @@ def min(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def max(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def max(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted maximum of a field over all downstream nodes.
 
@@ -479,6 +528,11 @@ def max(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -491,10 +545,12 @@ def max(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def mode(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def mode(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None):
     r"""
     Computes the mode (most frequent value) of a categorical field over all downstream nodes.
 
@@ -518,6 +574,9 @@ def mode(river_network, field, node_weights=None, edge_weights=None, return_type
         Not supported for mode calculation. Must be None.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -544,4 +603,37 @@ def mode(river_network, field, node_weights=None, edge_weights=None, return_type
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
     )
+
+
+def plan(river_network, metric, node_weights=None, edge_weights=None, return_type=None):
+    """
+    Prepares a weighted metric over all downstream nodes for repeated application.
+
+    Building the plan resolves the array backend, masks the node weights and checks the
+    arguments once. Calling it on a field computes the same result as the corresponding
+    `ekh.downstream.array` function, without repeating that work. This pays off when the
+    same metric is computed for many fields on a small network, e.g. in a calibration loop.
+
+    Parameters
+    ----------
+    river_network : RiverNetwork
+        A river network object.
+    metric : str
+        One of "sum", "mean", "var", "std", "skewness", "max" or "min".
+    node_weights : array-like, optional
+        Array of weights for each river network node or gridcell. Default is None (unweighted).
+    edge_weights : array-like, optional
+        Array of weights for each edge. Default is None (unweighted).
+    return_type : str, optional
+        Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+
+    Returns
+    -------
+    AccumulationPlan
+        A callable `plan(field, out=None)` returning the metric for every river network node
+        or gridcell, depending on `return_type`. For numpy, the result is written into `out`
+        if given.
+    """
+    return AccumulationPlan(river_network, metric, "up", node_weights, edge_weights, return_type)
@@ -7,7 +7,7 @@ from earthkit.hydro.length.array import __operations as _operations
 
 
 @multi_backend(allow_jax_jit=False)
-def min(xp, river_network, field, locations, upstream, downstream, return_type):
+def min(xp, river_network, field, locations, upstream, downstream, return_type, out):
     if field is None:
         field = xp.ones(river_network.n_nodes)
     locations, _, _ = locations_to_1d(xp, river_network, locations)
@@ -15,11 +15,11 @@ def min(xp, river_network, field, locations, upstream, downstream, return_type):
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
     decorated_func = mask(return_type == "gridded")(_operations.min)
-    return decorated_func(xp, river_network, field, locations, upstream, downstream)
+    return decorated_func(xp, river_network, field, locations, upstream, downstream, out=out)
 
 
 @multi_backend(allow_jax_jit=False)
-def max(xp, river_network, field, locations, upstream, downstream, return_type):
+def max(xp, river_network, field, locations, upstream, downstream, return_type, out):
     if field is None:
         field = xp.ones(river_network.n_nodes)
     locations, _, _ = locations_to_1d(xp, river_network, locations)
@@ -27,7 +27,7 @@ def max(xp, river_network, field, locations, upstream, downstream, return_type):
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
     decorated_func = mask(return_type == "gridded")(_operations.max)
-    return decorated_func(xp, river_network, field, locations, upstream, downstream)
+    return decorated_func(xp, river_network, field, locations, upstream, downstream, out=out)
 
 
 def to_source(*args, **kwargs):
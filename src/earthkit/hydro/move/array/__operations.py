@@ -4,7 +4,7 @@
 from earthkit.hydro._core.move import calculate_move_metric
 
 
-def upstream(xp, river_network, field, node_weights, edge_weights, metric):
+def upstream(xp, river_network, field, node_weights, edge_weights, metric, overwrite_input=False):
     return calculate_move_metric(
         xp,
         river_network,
@@ -12,11 +12,12 @@ def upstream(xp, river_network, field, node_weights, edge_weights, metric):
         metric,
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
         flow_direction="up",
     )
 
 
-def downstream(xp, river_network, field, node_weights, edge_weights, metric):
+def downstream(xp, river_network, field, node_weights, edge_weights, metric, overwrite_input=False):
     return calculate_move_metric(
         xp,
         river_network,
@@ -24,5 +25,6 @@ def downstream(xp, river_network, field, node_weights, edge_weights, metric):
         metric,
         node_weights,
         edge_weights,
+        overwrite_input=overwrite_input,
         flow_direction="down",
     )
@@ -5,19 +5,23 @@ import earthkit.hydro.move.array.__operations as array
 from earthkit.hydro._utils.decorators import mask, multi_backend
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type", "metric"])
-def upstream(xp, river_network, field, node_weights, edge_weights, metric, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "metric", "overwrite_input"])
+def upstream(xp, river_network, field, node_weights, edge_weights, metric, return_type, out, overwrite_input):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
     decorated_func = mask(return_type == "gridded")(array.upstream)
-    return decorated_func(xp, river_network, field, node_weights, edge_weights, metric)
+    return decorated_func(
+        xp, river_network, field, node_weights, edge_weights, metric, overwrite_input=overwrite_input, out=out
+    )
 
 
-@multi_backend(jax_static_args=["xp", "river_network", "return_type", "metric"])
-def downstream(xp, river_network, field, node_weights, edge_weights, metric, return_type):
+@multi_backend(jax_static_args=["xp", "river_network", "return_type", "metric", "overwrite_input"])
+def downstream(xp, river_network, field, node_weights, edge_weights, metric, return_type, out, overwrite_input):
     return_type = river_network.return_type if return_type is None else return_type
     if return_type not in ["gridded", "masked"]:
         raise ValueError("return_type must be either 'gridded' or 'masked'.")
     decorated_func = mask(return_type == "gridded")(array.downstream)
-    return decorated_func(xp, river_network, field, node_weights, edge_weights, metric)
+    return decorated_func(
+        xp, river_network, field, node_weights, edge_weights, metric, overwrite_input=overwrite_input, out=out
+    )
@@ -11,6 +11,8 @@ def upstream(
     edge_weights=None,
     metric="sum",
     return_type=None,
+    out=None,
+    overwrite_input=False,
 ):
     r"""
     Moves a field upstream.
@@ -52,6 +54,11 @@ def upstream(
         Aggregation function to apply. Options are 'var', 'std', 'skewness', 'mean', 'sum', 'min' and 'max'. Default is `'sum'`.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
 
     Returns
@@ -66,6 +73,8 @@ def upstream(
         edge_weights=edge_weights,
         metric=metric,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
@@ -76,6 +85,8 @@ def downstream(
     edge_weights=None,
     metric="sum",
     return_type=None,
+    out=None,
+    overwrite_input=False,
 ):
     r"""
     Moves a field downstream.
@@ -117,6 +128,11 @@ def downstream(
         Aggregation function to apply. Options are 'var', 'std', 'skewness', 'mean', 'sum', 'min' and 'max'. Default is `'sum'`.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
 
     Returns
@@ -131,4 +147,6 @@ def downstream(
         edge_weights=edge_weights,
         metric=metric,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
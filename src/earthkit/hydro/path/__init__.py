@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+from ._toplevel import downstream
+
+__all__ = ["downstream"]
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+from earthkit.hydro._backends.numpy_backend import NumPyBackend
+from earthkit.hydro._utils.decorators.masking import mask_last2_dims
+from earthkit.hydro._utils.locations import locations_to_1d
+from earthkit.hydro.data_structures import RiverNetwork
+from earthkit.hydro.data_structures._network_storage import get_adjacency
+
+np = NumPyBackend()
+
+
+def downstream(river_network: RiverNetwork, locations, field=None, max_distance=None, stations=None):
+    """
+    Traces the downstream paths from a set of start locations.
+
+    Every path follows the river network downstream from its location until a sink. All
+    paths are traced together, one step at a time, so the time taken is proportional to
+    the length of the longest path rather than to the size of the river network.
+
+    Parameters
+    ----------
+    river_network : RiverNetwork
+        A river network object without bifurcations.
+    locations : array-like or dict
+        A list of start nodes, one path being traced from each.
+    field : array-like or xarray object, optional
+        An array containing the distance from every river network node or gridcell to its downstream node,
+        as for :func:`earthkit.hydro.distance.min`. Default is `xp.ones(river_network.n_nodes)`,
+        which counts the steps along the paths.
+    max_distance : float, optional
+        If given, paths are truncated at their last node within this distance of their start location.
+        Default is None.
+    stations : array-like or dict, optional
+        If given, paths are truncated at the first of these nodes downstream of their start location,
+        which is included in the path. Default is None.
+
+    Returns
+    -------
+    offsets : numpy.ndarray
+        Array of shape (len(locations) + 1,) such that the i-th path is `nodes[offsets[i]:offsets[i + 1]]`.
+    nodes : numpy.ndarray
+        The nodes of all paths, each from its start location to its end.
+    distances : numpy.ndarray
+        The cumulative distance of every node of `nodes` from the start location of its path.
+    """
+    if river_network.array_backend != "numpy":
+        raise NotImplementedError
+
+    storage = river_network._storage
+    downstream_nodes = get_adjacency(storage).downstream_nodes
+    if downstream_nodes is None:
+        raise ValueError("Downstream paths are not unique in bifurcating river networks.")
+
+    starts, _, _ = locations_to_1d(np, river_network, locations)
+    n_paths = starts.shape[0]
+
+    if field is None:
+        step_distances = np.ones(storage.n_nodes)
+    else:
+        # xarray objects are used through their values
+        step_distances = np.asarray(field)
+        if river_network.shape is not None and step_distances.shape == tuple(river_network.shape):
+            step_distances = mask_last2_dims(np, step_distances, river_network.mask, step_distances.shape)
+        elif step_distances.shape != (storage.n_nodes,):
+            raise ValueError(
+                f"field must be of shape {(storage.n_nodes,)} (masked) or {river_network.shape} (gridded), "
+                f"not {step_distances.shape}."
+            )
+
+    is_station = None
+    if stations is not None:
+        stations, _, _ = locations_to_1d(np, river_network, stations)
+        is_station = np.zeros(storage.n_nodes, dtype=bool)
+        is_station[stations] = True
+
+    paths = np.arange(n_paths)
+    current = starts
+    distance = np.zeros(n_paths, dtype=step_distances.dtype)
+    path_ids, nodes, distances = [paths], [current], [distance]
+    while paths.shape[0] > 0:
+        distance = distance + step_distances[current]
+        current = downstream_nodes[current]
+        keep = current != storage.n_nodes
+        if max_distance is not None:
+            keep &= distance <= max_distance
+        paths, current, distance = paths[keep], current[keep], distance[keep]
+        path_ids.append(paths)
+        nodes.append(current)
+        distances.append(distance)
+        if is_station is not None:
+            keep = ~is_station[current]
+            paths, current, distance = paths[keep], current[keep], distance[keep]
+
+    # the k-th step of a path is its k-th node, so it is placed k nodes after the start of the path
+    steps = np.repeat(np.arange(len(path_ids)), [ids.shape[0] for ids in path_ids])
+    path_ids = np.concatenate(path_ids)
+    offsets = np.zeros(n_paths + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(path_ids, minlength=n_paths))
+    positions = offsets[path_ids] + steps
+
+    path_nodes = np.empty(positions.shape[0], dtype=starts.dtype)
+    path_nodes[positions] = np.concatenate(nodes)
+    path_distances = np.empty(positions.shape[0], dtype=step_distances.dtype)
+    path_distances[positions] = np.concatenate(distances)
+    return offsets, path_nodes, path_distances
@@ -2,19 +2,191 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import tempfile
+import re
+import time
+import weakref
+from contextlib import contextmanager
 from functools import wraps
 from hashlib import sha256
+from string import Formatter
 
 import joblib
-from earthkit.hydro._version import __version__ as ekh_version
 
+from earthkit.hydro._version import __version__ as ekh_version
 from earthkit.hydro.data_structures._network import RiverNetwork
 
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
+
 # read in only up to second decimal point
 # i.e. 0.1.dev90 -> 0.1
 ekh_version = ".".join(ekh_version.split(".")[:2])
 
+# storages already loaded in this process, kept only as long as a network uses them
+_loaded = weakref.WeakValueDictionary()
+
+# content hashes of local files, valid as long as their size and mtime are unchanged
+_file_hashes = {}
+
+
+def default_cache_dir():
+    """
+    The default river network cache directory.
+
+    This is `$EARTHKIT_HYDRO_CACHE_DIR` if set, otherwise `earthkit-hydro` in the user
+    cache directory (`$XDG_CACHE_HOME`, or `~/.cache`).
+
+    Returns
+    -------
+    str
+        The cache directory.
+    """
+    cache_dir = os.environ.get("EARTHKIT_HYDRO_CACHE_DIR")
+    if cache_dir is None:
+        user_cache_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+        cache_dir = os.path.join(user_cache_dir, "earthkit-hydro")
+    return cache_dir
+
+
+def hash_file(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        digest = sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return f"{_file_hashes[key]}-{stat.st_size}"
+
+
+def hash_dir(path):
+    # hashing the content of whole zarr stores is too slow, so use the size and mtime of every file
+    digest = sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            stat = os.stat(os.path.join(root, name))
+            relpath = os.path.relpath(os.path.join(root, name), path)
+            digest.update(f"{relpath}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def cache_key(path, river_network_format, source, repair=False, compress_chains=False):
+    """
+    Computes the cache key of a river network.
+
+    Local files are keyed on their content and size, local directories on the size and
+    mtime of their files, and anything else on `path` itself. A "cama_bin" nextxy.bin file
+    is also keyed on the params.txt file next to it. The key also includes the
+    river network format, the source, whether the network is repaired or has a chain schedule and
+    the earthkit-hydro version.
+
+    Returns
+    -------
+    str
+        The sha256 hex digest identifying the river network.
+    """
+    if source == "file" and os.path.isfile(path):
+        fingerprint = hash_file(path)
+        if river_network_format == "cama_bin":
+            # the grid and coordinates come from the params.txt file next to nextxy.bin
+            fingerprint += "|" + hash_file(os.path.join(os.path.dirname(path), "params.txt"))
+    elif source == "file" and os.path.isdir(path):
+        fingerprint = hash_dir(path)
+    else:
+        fingerprint = str(path)
+    key = f"{ekh_version}|{river_network_format}|{source}|{fingerprint}"
+    if repair:
+        key += "|repaired"
+    if compress_chains:
+        key += "|chains"
+    return sha256(key.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Holds an exclusive lock on `lock_path` across processes.
+
+    The lock is released by the operating system if the process dies.
+    """
+    with open(lock_path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def cache_fname_pattern(cache_fname):
+    """
+    Compiles a regex matching the names of the cache files of the `cache_fname` template, for any version.
+    """
+    fields = {"ekh_version": r"[\w.+-]+", "hash": "[0-9a-f]{64}"}
+    pattern = ""
+    for literal, field, _, _ in Formatter().parse(cache_fname):
+        pattern += re.escape(literal)
+        if field is not None:
+            pattern += fields[field]
+    return re.compile(pattern)
+
+
+def evict(cache_dir, max_size, keep, cache_fname):
+    """
+    Removes the least recently used cache files until `cache_dir` holds at most `max_size` bytes.
+
+    Only files named after the `cache_fname` template are considered, so other files in
+    `cache_dir` are neither counted nor removed. Lock and partially written files never
+    match it, and `keep` is never removed.
+    """
+    pattern = cache_fname_pattern(cache_fname)
+    entries = []
+    for name in os.listdir(cache_dir):
+        filepath = os.path.join(cache_dir, name)
+        if not pattern.fullmatch(name) or not os.path.isfile(filepath):
+            continue
+        stat = os.stat(filepath)
+        entries.append((stat.st_mtime, stat.st_size, filepath))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, filepath in sorted(entries):
+        if total <= max_size:
+            break
+        if filepath == keep:
+            continue
+        try:
+            os.remove(filepath)
+            print(f"Evicting river network from cache ({filepath}).")
+        except FileNotFoundError:  # already evicted by another process
+            pass
+        total -= size
+
+
+def read_cached(cache_filepath):
+    try:
+        river_network_storage = joblib.load(cache_filepath)
+    except FileNotFoundError:  # evicted by another process
+        return None
+    # mark as recently used for eviction
+    os.utime(cache_filepath)
+    return river_network_storage
+
 
 def cache(func):
     """
@@ -40,6 +212,10 @@ def cache(func):
         cache_dir=None,
         cache_fname="{ekh_version}_{hash}.joblib",
         cache_compression=1,
+        cache_max_size=10 * 1024**3,
+        repair=False,
+        compress_chains=False,
+        tile_rows=None,
     ):
         """
         Wrapper to load river network from cache if available, otherwise
@@ -59,41 +235,78 @@ def cache(func):
         use_cache : bool, optional
             Whether to use caching. Default is True.
         cache_dir : str, optional
-            The directory to store the cache files. Default is None, which constructs a temporary directory.
+            The directory to store the cache files. Default is None, which uses `default_cache_dir()`.
         cache_fname : str, optional
             The filename template for the cache files.
             Default is "{ekh_version}_{hash}.joblib".
         cache_compression : int, optional
             The compression level for the cache files. Default is 1.
+        cache_max_size : int, optional
+            The maximum total size of the cache files in bytes. Least recently used files are
+            evicted beyond it. Default is 10 GiB.
+        repair : bool, optional
+            Whether to repair the river network. Default is False.
+        compress_chains : bool, optional
+            Whether to build a schedule contracting unbranched chains. Default is False.
+        tile_rows : int, optional
+            The number of rows of d8 data read at a time. It does not change the network, so
+            it is not part of the cache key. Default is None.
 
         Returns
         -------
         earthkit.hydro.network_class.RiverNetwork
             The loaded river network.
         """
-        if cache_dir is None:
-            cache_dir = tempfile.mkdtemp(suffix="_earthkit_hydro")
-        if use_cache:
-            hashed_name = sha256(path.encode("utf-8")).hexdigest()
-            cache_dir = cache_dir.format(ekh_version=ekh_version, hash=hashed_name)
-            cache_fname = cache_fname.format(ekh_version=ekh_version, hash=hashed_name)
-            cache_filepath = os.path.join(cache_dir, cache_fname)
-
-            if os.path.isfile(cache_filepath):
-                print(f"Loading river network from cache ({cache_filepath}).")
-                return RiverNetwork(joblib.load(cache_filepath))
-            else:
-                print(f"River network not found in cache ({cache_filepath}).")
-                os.makedirs(cache_dir, exist_ok=True)
-        else:
+        options = {"repair": repair, "compress_chains": compress_chains, "tile_rows": tile_rows}
+        if not use_cache:
             print("Cache disabled.")
+            return func(path, river_network_format, source, **options)
+
+        hashed_name = cache_key(path, river_network_format, source, repair, compress_chains)
+
+        river_network_storage = _loaded.get(hashed_name)
+        if river_network_storage is not None:
+            return RiverNetwork(river_network_storage)
+
+        if source == "file" and river_network_format in ["precomputed", "precomputed_mmap"] and not repair:
+            # local precomputed networks load as fast as a cached copy, and memory-mapped ones would lose sharing
+            network = func(path, river_network_format, source, **options)
+            _loaded[hashed_name] = network._storage
+            return network
+
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        cache_dir = cache_dir.format(ekh_version=ekh_version, hash=hashed_name)
+        cache_filepath = os.path.join(cache_dir, cache_fname.format(ekh_version=ekh_version, hash=hashed_name))
+        os.makedirs(cache_dir, exist_ok=True)
+
+        if os.path.isfile(cache_filepath):
+            print(f"Loading river network from cache ({cache_filepath}).")
+            river_network_storage = read_cached(cache_filepath)
+
+        if river_network_storage is None:
+            # concurrent workers wait for the first one to create the network instead of repeating it
+            with file_lock(cache_filepath + ".lock"):
+                if os.path.isfile(cache_filepath):
+                    print(f"Loading river network from cache ({cache_filepath}).")
+                    river_network_storage = read_cached(cache_filepath)
+
+                if river_network_storage is None:
+                    print(f"River network not found in cache ({cache_filepath}).")
+                    river_network_storage = func(path, river_network_format, source, **options)._storage
 
-        network = func(path, river_network_format, source)
+                    tmp_filepath = f"{cache_filepath}.{os.getpid()}.{time.time_ns()}.tmp"
+                    try:
+                        joblib.dump(river_network_storage, tmp_filepath, compress=cache_compression)
+                        os.replace(tmp_filepath, cache_filepath)
+                    finally:
+                        if os.path.exists(tmp_filepath):
+                            os.remove(tmp_filepath)
+                    print(f"River network loaded, saving to cache ({cache_filepath}).")
 
-        if use_cache:
-            joblib.dump(network._storage, cache_filepath, compress=cache_compression)
-            print(f"River network loaded, saving to cache ({cache_filepath}).")
+                    evict(cache_dir, cache_max_size, keep=cache_filepath, cache_fname=cache_fname)
 
-        return network
+        _loaded[hashed_name] = river_network_storage
+        return RiverNetwork(river_network_storage)
 
     return wrapper
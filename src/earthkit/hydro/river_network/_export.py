@@ -36,8 +36,9 @@ def export(
         Where to export the river network.
     river_network_format : str
         The format of the river network data.
-        Currently supported formats are "pcr_d8", "esri_d8"
-        and "merit_d8".
+        Currently supported formats are "precomputed", "precomputed_mmap", "cama", "pcr_d8", "esri_d8"
+        and "merit_d8". "precomputed_mmap" writes an uncompressed directory at `path` that is
+        memory-mapped when loaded, so that processes loading it share a single copy in memory.
     compression : int
         The compression factor to use for the saved file. Only applied if river_network_format is precomputed.
 
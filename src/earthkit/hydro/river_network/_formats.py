@@ -1,6 +1,9 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import copy as cp
+import json
+import os
 from io import BytesIO
 from urllib.request import urlopen
 
@@ -8,9 +11,15 @@ import joblib
 import numpy as np
 import xarray as xr
 
-from earthkit.hydro._readers import assign_coords, from_cama_nextxy, from_d8, from_grit
-from earthkit.hydro._readers._cama import from_cama_nextxy_raw, load_cama_data
+from earthkit.hydro._readers import assign_coords, from_cama_nextxy, from_d8, from_grit, from_grit_columnar
+from earthkit.hydro._readers._cama import from_cama_nextxy_raw, load_cama_bin_data, load_cama_data
 from earthkit.hydro._readers._d8 import from_d8_raw, load_d8_data
+from earthkit.hydro.data_structures._network_storage import (
+    Adjacency,
+    ChainSchedule,
+    RiverNetworkStorage,
+    compute_adjacency,
+)
 
 
 def _encode_da(da, mv):
@@ -47,7 +56,9 @@ def _compute_offsets(river_network_storage):
 
 class Precomputed:
     def create(self, path, source):
-        if source == "file":
+        if source == "file" and os.path.isdir(path):
+            return PrecomputedMmap().create(path, source)
+        elif source == "file":
             return joblib.load(path)
         elif source == "url":
             with urlopen(path) as response:
@@ -56,15 +67,119 @@ class Precomputed:
             raise ValueError(f"Unsupported source for precomputed river network format: {source}.")
 
     def export_to(self, river_network_storage, path, compression):
+        # the adjacency is rebuilt on load, so that releases without it can still read the file
+        river_network_storage = cp.copy(river_network_storage)
+        vars(river_network_storage).pop("adjacency", None)
         joblib.dump(river_network_storage, path, compress=compression)
 
 
+class PrecomputedMmap:
+    """
+    An uncompressed directory of .npy arrays plus a json header, memory-mapped read-only on load.
+
+    Loading does not copy any array into memory, and processes loading the same directory
+    share a single page-cache copy of it.
+    """
+
+    version = 1
+    arrays = ("sorted_data", "sources", "sinks", "splits", "area", "mask", "edge_weights", "segments")
+    chain_arrays = ("junction_data", "junction_splits", "chain_nodes", "chain_positions", "chain_splits")
+    adjacency_arrays = ("upstream_offsets", "upstream_nodes", "upstream_edges", "downstream_nodes")
+
+    def create(self, path, source):
+        if source != "file":
+            raise ValueError(f"Unsupported source for memory-mapped river network format: {source}.")
+
+        with open(os.path.join(path, "header.json")) as f:
+            header = json.load(f)
+        if header["version"] > self.version:
+            raise ValueError(
+                f"River network at {path} uses memory-mapped format version {header['version']}, "
+                f"but only versions up to {self.version} are supported."
+            )
+
+        def load(name):
+            if name not in header["arrays"]:
+                return None
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        coords = None
+        if header["coords"] is not None:
+            coords = {name: load(f"coords_{i}") for i, name in enumerate(header["coords"])}
+
+        chains = None
+        if header["chains"]:
+            chains = ChainSchedule(*[load(name) for name in self.chain_arrays])
+
+        adjacency = None
+        if header.get("adjacency", False):
+            adjacency = Adjacency(*[load(name) for name in self.adjacency_arrays])
+
+        return RiverNetworkStorage(
+            header["n_nodes"],
+            header["n_edges"],
+            load("sorted_data"),
+            load("sources"),
+            load("sinks"),
+            coords,
+            load("splits"),
+            load("area"),
+            load("mask"),
+            tuple(header["shape"]),
+            header["bifurcates"],
+            load("edge_weights"),
+            load("segments"),
+            chains,
+            adjacency,
+        )
+
+    def export_to(self, river_network_storage, path, compression):
+        os.makedirs(path, exist_ok=True)
+        header_path = os.path.join(path, "header.json")
+        if os.path.exists(header_path):
+            os.remove(header_path)
+
+        arrays = {name: getattr(river_network_storage, name, None) for name in self.arrays}
+        coords = river_network_storage.coords
+        if coords is not None:
+            arrays.update({f"coords_{i}": values for i, values in enumerate(coords.values())})
+        chains = getattr(river_network_storage, "chains", None)
+        if chains is not None:
+            arrays.update({name: getattr(chains, name) for name in self.chain_arrays})
+        adjacency = getattr(river_network_storage, "adjacency", None)
+        if adjacency is None:
+            adjacency = compute_adjacency(
+                river_network_storage.n_nodes, river_network_storage.sorted_data, river_network_storage.bifurcates
+            )
+        arrays.update({name: getattr(adjacency, name) for name in self.adjacency_arrays})
+        arrays = {name: values for name, values in arrays.items() if values is not None}
+
+        for name, values in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(values))
+
+        header = {
+            "version": self.version,
+            "n_nodes": int(river_network_storage.n_nodes),
+            "n_edges": int(river_network_storage.n_edges),
+            "shape": [int(n) for n in river_network_storage.shape],
+            "bifurcates": bool(river_network_storage.bifurcates),
+            "coords": None if coords is None else list(coords.keys()),
+            "chains": chains is not None,
+            "adjacency": True,
+            "arrays": sorted(arrays),
+        }
+        # written last, so an interrupted export is never mistaken for a complete one
+        with open(header_path, "w") as f:
+            json.dump(header, f)
+
+
 class CaMa:
     missing_value = -9999
+    options = ("compress_chains",)
 
-    def create(self, path, source):
+    def create(self, path, source, compress_chains=False):
         data, coords = load_cama_data(path, "cama", source)
-        river_network_storage = from_cama_nextxy(*data)
+        river_network_storage = from_cama_nextxy(*data, compress_chains=compress_chains)
         return assign_coords(river_network_storage, data, coords)
 
     def load_partial(self, path, source):
@@ -104,14 +219,36 @@ class CaMa:
         ds.to_netcdf(path)
 
 
+class CaMaBin:
+    options = ("compress_chains",)
+
+    def create(self, path, source, compress_chains=False):
+        data, coords = self._load(path, source)
+        river_network_storage = from_cama_nextxy(*data, compress_chains=compress_chains)
+        return assign_coords(river_network_storage, data, coords)
+
+    def load_partial(self, path, source):
+        data, coords = self._load(path, source)
+        return from_cama_nextxy_raw(*data), coords
+
+    def _load(self, path, source):
+        if source != "file":
+            raise ValueError(f"Unsupported source for binary CaMa river network format: {source}.")
+        return load_cama_bin_data(path)
+
+
 class D8:
     name = None
     missing_value = None
     lut = None
-
-    def create(self, path, source):
-        data, coords = load_d8_data(path, self.name, source)
-        river_network_storage = from_d8(data, river_network_format=self.name)
+    options = ("compress_chains", "tile_rows")
+
+    def create(self, path, source, compress_chains=False, tile_rows=None):
+        # tiled reads only load the rows they need, so the data is not read in full beforehand
+        data, coords = load_d8_data(path, self.name, source, lazy=tile_rows is not None)
+        river_network_storage = from_d8(
+            data, river_network_format=self.name, compress_chains=compress_chains, tile_rows=tile_rows
+        )
         return assign_coords(river_network_storage, data, coords)
 
     def load_partial(self, path, source):
@@ -174,11 +311,21 @@ class Grit:
         return from_grit(path)
 
 
+class GritColumnar:
+    def create(self, path, source):
+        if source != "file":
+            raise ValueError(f"Unsupported source for columnar GRIT river network format: {source}.")
+        return from_grit_columnar(path)
+
+
 FORMATS = {
     "precomputed": Precomputed(),
+    "precomputed_mmap": PrecomputedMmap(),
     "cama": CaMa(),
+    "cama_bin": CaMaBin(),
     "pcr_d8": PCRD8(),
     "esri_d8": ESRID8(),
     "merit_d8": MeritD8(),
     "grit": Grit(),
+    "grit_parquet": GritColumnar(),
 }
@@ -1,8 +1,13 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+
 import numpy as np
 
+from earthkit.hydro._readers import assign_coords
+from earthkit.hydro._readers._core import create_network
+from earthkit.hydro._utils.profiling import call_rust
 from earthkit.hydro.data_structures._network_storage import RiverNetworkStorage
 
 from ._export import export
@@ -18,53 +23,64 @@ def set_sink_if_downstream_missing(up, down, mask, n_n, n_e, edge):
     return up, down, mask, n_n, n_e, edge
 
 
+def find_cycles(down_nodes):
+    use_rust = int(os.environ.get("USE_RUST", "-1"))
+
+    if use_rust == 0:
+        func = find_cycles_python
+    elif use_rust == 1:
+        from earthkit.hydro._rust import find_cycles_rust as func
+    else:
+        try:
+            from earthkit.hydro._rust import find_cycles_rust as func
+        except ImportError:
+            func = find_cycles_python
+
+    if func is find_cycles_python:
+        return func(down_nodes)
+    return call_rust(func, down_nodes.astype(np.uintp))
+
+
+def find_cycles_python(down_nodes):
+    # peels off nodes without upstream nodes one level at a time. As every node has at
+    # most one downstream node, the nodes never peeled off are exactly those on cycles
+    n_nodes = down_nodes.shape[0]
+    in_degree = np.bincount(down_nodes, minlength=n_nodes + 1)[:n_nodes]
+    in_cycle = np.ones(n_nodes, dtype=bool)
+    inlets = np.flatnonzero(in_degree == 0)
+
+    while inlets.size > 0:
+        in_cycle[inlets] = False
+        downstream = down_nodes[inlets]
+        downstream, counts = np.unique(downstream[downstream != n_nodes], return_counts=True)
+        in_degree[downstream] -= counts
+        inlets = downstream[in_degree[downstream] == 0]
+
+    return in_cycle
+
+
 def set_missing_if_cycle(up, down, mask, n_n, n_e, edge):
     # DETECT CYCLES
     down_nodes = np.full(n_n, fill_value=n_n, dtype=int)
     down_nodes[up] = down
-
-    current_nodes = up
-    remaining_up_nodes = up
-    nodes_in_cycles = np.array([], dtype=int)
-    for _ in range(n_n):
-        current_nodes = down_nodes[current_nodes]  # node_ids downstream of current_nodes
-        in_cycle = current_nodes == remaining_up_nodes
-        nodes_in_cycles = np.append(nodes_in_cycles, current_nodes[in_cycle])
-        remove_from_current = in_cycle | (current_nodes == n_n)
-        current_nodes = current_nodes[~remove_from_current]
-        remaining_up_nodes = remaining_up_nodes[~remove_from_current]
-        if current_nodes.shape[0] == 0:
-            break
+    in_cycle = find_cycles(down_nodes)
 
     # REMOVE DETECTED CYCLES
-    down_nodes[nodes_in_cycles] = n_n
-    upstream_neighbours = np.bincount(down_nodes, minlength=n_n)
-    without_connections = upstream_neighbours[nodes_in_cycles] == 0
-    nodes_in_cycles_without_connections = nodes_in_cycles[without_connections]
-    nodes_in_cycles_with_connections = nodes_in_cycles[~without_connections]
-    remove_node = np.zeros(n_n, dtype=bool)
-    remove_node[nodes_in_cycles_with_connections] = True
-    subset_of_mask = mask[mask]
-    subset_of_mask[nodes_in_cycles_without_connections] = False
-    new_mask = mask.copy()
-    new_mask[mask] = subset_of_mask
-    lost_nodes = nodes_in_cycles_without_connections.shape[0]
-    n_n -= lost_nodes
-    initial_cumsum = np.cumsum(mask) - 1
-    new_cumsum = np.cumsum(new_mask) - 1
-    new_cumsum = new_cumsum.reshape(new_mask.shape)
-    new_cumsum[~new_mask] = n_n
-    initial_cumsum = initial_cumsum.reshape(new_mask.shape)
-    dictionary = dict(zip(initial_cumsum[mask].flatten(), new_cumsum[mask].flatten()))
-    mapping = np.vectorize(dictionary.get)
-    valid_edges = ~remove_node[up]
+    # nodes in cycles become sinks, or missing if nothing else flows into them
+    down_nodes[in_cycle] = n_n
+    upstream_neighbours = np.bincount(down_nodes, minlength=n_n + 1)[:n_n]
+    missing = in_cycle & (upstream_neighbours == 0)
+    valid_edges = ~in_cycle[up]
     up = up[valid_edges]
     down = down[valid_edges]
-    up = mapping(up)
-    down = mapping(down)
-    missing_nodes = up == n_n
-    up = up[~missing_nodes]
-    down = down[~missing_nodes]
+
+    new_mask = mask.copy()
+    new_mask.flat[np.flatnonzero(mask)[missing]] = False
+    n_n -= int(missing.sum())
+    mapping = np.cumsum(~missing) - 1
+    mapping[missing] = n_n
+    up = mapping[up]
+    down = mapping[down]
     mask = new_mask
     n_e = up.shape[0]
     edge = np.arange(n_e)
@@ -88,6 +104,9 @@ def repair(input_path, output_path, river_network_format, input_source="file"):
     #. For offset/relative drainage directions river networks formats ("pcr_d8", "esri_d8" and "merit_d8"), cells flowing outside the domain are set to sinks
     #. Any missing values with a cell flowing into them are made into sinks
 
+    To use the repaired river network without exporting it, use
+    :func:`create` with `repair=True` instead.
+
     Parameters
     ----------
     input_path : str
@@ -108,12 +127,7 @@ def repair(input_path, output_path, river_network_format, input_source="file"):
     -------
     None. Writes a repaired river network to a local file at `output_path`, in the same format as the original.
     """
-    fmt = FORMATS.get(river_network_format)
-    if fmt is None or not hasattr(fmt, "load_partial"):
-        raise ValueError(f"Unsupported river network format for the repair method: {river_network_format}.")
-    (up, down, edge, mask, n_n, n_e), coords = fmt.load_partial(input_path, input_source)
-    up, down, mask, n_n, n_e, edge = set_sink_if_downstream_missing(up, down, mask, n_n, n_e, edge)
-    up, down, mask, n_n, n_e, edge = set_missing_if_cycle(up, down, mask, n_n, n_e, edge)
+    up, down, edge, mask, n_n, n_e, coords = repair_graph(input_path, river_network_format, input_source)
 
     store = RiverNetworkStorage(
         n_n,
@@ -130,3 +144,33 @@ def repair(input_path, output_path, river_network_format, input_source="file"):
         None,
     )
     export(store, output_path, river_network_format)
+
+
+def repair_graph(path, river_network_format, source):
+    fmt = FORMATS.get(river_network_format)
+    if fmt is None or not hasattr(fmt, "load_partial"):
+        raise ValueError(f"Unsupported river network format for the repair method: {river_network_format}.")
+    (up, down, edge, mask, n_n, n_e), coords = fmt.load_partial(path, source)
+    up, down, mask, n_n, n_e, edge = set_sink_if_downstream_missing(up, down, mask, n_n, n_e, edge)
+    up, down, mask, n_n, n_e, edge = set_missing_if_cycle(up, down, mask, n_n, n_e, edge)
+    return up, down, edge, mask, n_n, n_e, coords
+
+
+def create_repaired(path, river_network_format, source, compress_chains=False):
+    """
+    Repairs a river network and creates it in memory, without exporting it.
+
+    The repairing algorithm is the one of :func:`repair`.
+
+    Returns
+    -------
+    RiverNetworkStorage
+        The repaired river network.
+    """
+    up, down, _, mask, _, _, coords = repair_graph(path, river_network_format, source)
+    # create_network expects flat grid indices of the nodes
+    grid_indices = np.flatnonzero(mask)
+    river_network_storage = create_network(
+        grid_indices[up], grid_indices[down], mask.flatten(), mask.shape, compress_chains
+    )
+    return assign_coords(river_network_storage, None, coords)
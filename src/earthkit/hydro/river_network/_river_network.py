@@ -9,6 +9,7 @@ from earthkit.hydro.data_structures._network import RiverNetwork
 
 from ._cache import cache
 from ._formats import FORMATS
+from ._repair import create_repaired
 
 # read in major version
 # if dev version, try add +1 to major version
@@ -26,6 +27,10 @@ def create(
     cache_dir=None,
     cache_fname="{ekh_version}_{hash}.joblib",
     cache_compression=1,
+    cache_max_size=10 * 1024**3,
+    repair=False,
+    compress_chains=False,
+    tile_rows=None,
 ):
     """
     Creates a river network from the given path, format, and source.
@@ -37,31 +42,72 @@ def create(
         as netCDF, GRIB, GeoTIFF, zarr, etc.
     river_network_format : str
         The format of the river network data.
-        Supported formats are "precomputed", "cama", "pcr_d8", "esri_d8", "grit"
-        and "merit_d8".
+        Supported formats are "precomputed", "precomputed_mmap", "cama", "cama_bin", "pcr_d8", "esri_d8", "grit",
+        "grit_parquet" and "merit_d8". A "precomputed" path that is a directory is read as "precomputed_mmap",
+        whose arrays are memory-mapped read-only instead of loaded into memory. A "cama_bin" path is a
+        CaMa-Flood map directory, or its nextxy.bin file, which is memory-mapped using the grid of the
+        params.txt file next to it. A "grit_parquet" path is a directory holding `nodes` and `lines` tables
+        as GeoParquet (.parquet) or Arrow IPC (.arrow, .feather) files, of which only the needed columns are read.
     source : str
         The source of the river network data. Default is `'file'`.
         For possible sources see:
         https://earthkit-data.readthedocs.io/en/latest/guide/sources.html.
     use_cache : bool, optional
         Whether to cache the loaded/created river network for quicker reloading. Default is True.
+        Cached networks are keyed on the content of local files (or on the path for other
+        sources), the format and the earthkit-hydro version, and are reused across processes.
+        A network already loaded in this process is reused without reading it again.
     cache_dir : str, optional
-        Where to store the cached river networks. Default is None, which uses `tempfile.mkdtemp(suffix="_earthkit_hydro")`.
+        Where to store the cached river networks. Default is None, which uses
+        `$EARTHKIT_HYDRO_CACHE_DIR` if set, otherwise `earthkit-hydro` in the user cache directory.
     cache_fname : str, optional
         A string template for the cache filename convention.
     cache_compression : int, optional
         A compression factor for the cached files.
+    cache_max_size : int, optional
+        The maximum total size in bytes of the cached files in `cache_dir`. The least recently
+        used files are evicted beyond it. Default is 10 GiB.
+    repair : bool, optional
+        Whether to repair the river network as :func:`repair` does, directly in memory instead of
+        exporting it and creating the network from the export. Only supported for the formats
+        supported by :func:`repair`. The repaired network is cached separately. Default is False.
+    compress_chains : bool, optional
+        Whether to also build a schedule contracting unbranched chains of the river network,
+        which speeds up upstream accumulations on networks with long chains. Only supported for
+        the "cama", "cama_bin" and d8 formats. The network is cached separately. Default is False.
+    tile_rows : int, optional
+        If given, d8 data is read `tile_rows` rows at a time and no full grid array is created,
+        so that the peak memory of the creation scales with the number of river cells rather than with the
+        grid size. Only supported for the d8 formats without `repair`. Default is None, which reads the
+        data at once.
 
     Returns
     -------
     RiverNetwork
         The river network object created from the given data.
     """
+    options = {}
+    if compress_chains:
+        options["compress_chains"] = compress_chains
+    if tile_rows is not None:
+        options["tile_rows"] = tile_rows
+
+    if repair:
+        if tile_rows is not None:
+            raise ValueError("tile_rows is not supported when repairing the river network.")
+        return RiverNetwork(create_repaired(path, river_network_format, source, **options))
+
     fmt = FORMATS.get(river_network_format)
     if fmt is None:
         raise ValueError(f"Unsupported river network format: {river_network_format}.")
 
-    return RiverNetwork(fmt.create(path, source))
+    unsupported = sorted(set(options) - set(getattr(fmt, "options", ())))
+    if unsupported:
+        raise ValueError(
+            f"Unsupported options for river network format {river_network_format}: {', '.join(unsupported)}."
+        )
+
+    return RiverNetwork(fmt.create(path, source, **options))
 
 
 def load(
@@ -0,0 +1,260 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+import numpy as np
+import xarray as xr
+
+from earthkit.hydro._utils.coords import get_core_dims, node_default_coord
+from earthkit.hydro._utils.decorators.xarray import get_node_coords
+
+NETCDF_SUFFIXES = (".nc", ".nc4", ".netcdf")
+
+
+def apply(
+    func,
+    river_network,
+    field,
+    *args,
+    dim="time",
+    chunk_size=None,
+    sink=None,
+    name=None,
+    return_type=None,
+    input_core_dims=None,
+    **kwargs,
+):
+    """
+    Applies a river network operation chunk by chunk along a long dimension.
+
+    The field is processed in consecutive chunks of `chunk_size` steps along `dim`, so
+    only one chunk of the input and of the output is held in memory at a time. The
+    buffers holding the masked input and the gridded output are allocated once and
+    reused for every chunk, and inputs without `dim` (e.g. static node weights) are
+    masked only once. Each result chunk is either written incrementally to `sink` or
+    collected in memory.
+
+    Parameters
+    ----------
+    func : callable
+        The operation to apply, e.g. `ekh.upstream.sum` or `ekh.upstream.array.sum`.
+        It must return one value per river network node.
+    river_network : RiverNetwork
+        A river network object.
+    field : xarray.DataArray
+        An array containing field values defined on river network nodes or gridcells,
+        with a dimension `dim` to stream over. Dask-backed arrays are only computed one
+        chunk at a time.
+    *args
+        Further positional arguments passed to `func`.
+    dim : str, optional
+        The dimension to stream over. Default is "time".
+    chunk_size : int, optional
+        Number of steps along `dim` per chunk. Default is None, which uses the dask
+        chunk size of `field` along `dim`, or the full dimension if `field` is not chunked.
+    sink : str or path-like or zarr store, optional
+        Where to write the result. Paths ending in ".nc", ".nc4" or ".netcdf" are written
+        as netCDF (requires netCDF4), anything else as zarr (requires zarr). Default is
+        None, which returns the result in memory.
+    name : str, optional
+        Name of the output variable. Default is None, which uses the name of `field`,
+        or "out" if it has none.
+    return_type : str, optional
+        Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    input_core_dims : sequence of str, optional
+        The core dimensions of `field`. Default is None, which attempts to autodetect them.
+    **kwargs
+        Further keyword arguments passed to `func`. xarray arguments that contain `dim`
+        are streamed alongside `field`, all others are passed whole.
+
+    Returns
+    -------
+    xarray.DataArray or None
+        The result if `sink` is None, otherwise None.
+    """
+    if river_network.array_backend != "numpy":
+        raise NotImplementedError("Streaming is only supported for the numpy backend.")
+    if dim not in field.dims:
+        raise ValueError(f"Field has no dimension {dim!r} to stream over.")
+
+    core_dims = list(get_core_dims(field) if input_core_dims is None else input_core_dims)
+    if dim in core_dims:
+        raise ValueError(f"Cannot stream over the core dimension {dim!r}.")
+
+    return_type = river_network.return_type if return_type is None else return_type
+    return_grid = return_type == "gridded"
+    grid_input = len(core_dims) == 2
+    name = (field.name or "out") if name is None else name
+
+    # the array function is wrapped by the xarray decorator, if any
+    array_func = getattr(func, "__wrapped__", func)
+
+    field = field.transpose(dim, ..., *core_dims)
+    lead_dims = list(field.dims[1 : -len(core_dims)])
+
+    mask = np.asarray(river_network.mask)
+    args = [_prepare_arg(arg, field, dim, river_network) for arg in args]
+    kwargs = {k: _prepare_arg(v, field, dim, river_network) for k, v in kwargs.items()}
+
+    template, out_core_dims = _output_template(field, dim, lead_dims, core_dims, river_network, return_grid)
+    out_dims = [dim, *lead_dims, *out_core_dims]
+
+    n_steps = field.sizes[dim]
+    if chunk_size is None:
+        chunk_size = field.chunksizes[dim][0] if field.chunks is not None else n_steps
+
+    in_buffer = None
+    out_buffer = None
+    writer = _get_writer(sink, name, dim, template)
+    try:
+        for start in range(0, n_steps, chunk_size):
+            stop = min(start + chunk_size, n_steps)
+            values = np.asarray(field.isel({dim: slice(start, stop)}).values)
+
+            if grid_input:
+                values = values.reshape(values.shape[:-2] + (-1,))
+                if in_buffer is None:
+                    in_buffer = np.empty((chunk_size,) + values.shape[1:-1] + mask.shape, dtype=values.dtype)
+                values = np.take(values, mask, axis=-1, out=in_buffer[: stop - start], mode="clip")
+
+            out = array_func(
+                river_network,
+                values,
+                *[_chunk_arg(arg, dim, start, stop) for arg in args],
+                return_type="masked",
+                **{k: _chunk_arg(v, dim, start, stop) for k, v in kwargs.items()},
+            )
+            if out.shape[-1] != river_network.n_nodes:
+                raise ValueError("Streaming requires an operation returning one value per river network node.")
+
+            if return_grid:
+                if out_buffer is None:
+                    grid_size = int(np.prod(river_network.shape))
+                    out_buffer = np.full((chunk_size,) + out.shape[1:-1] + (grid_size,), np.nan, dtype=out.dtype)
+                gridded = out_buffer[: stop - start]
+                gridded[..., mask] = out
+                out = gridded.reshape(gridded.shape[:-1] + tuple(river_network.shape))
+
+            coords = template.isel({dim: slice(start, stop)}).coords
+            writer.write(xr.DataArray(out, dims=out_dims, coords=coords, name=name), start)
+    except BaseException:
+        writer.close()
+        raise
+
+    return writer.close()
+
+
+def _prepare_arg(arg, field, dim, river_network):
+    if not isinstance(arg, xr.DataArray):
+        return arg
+    arg = arg.transpose(*[d for d in field.dims if d in arg.dims])
+    if dim in arg.dims:
+        return arg
+    values = arg.values
+    if values.ndim >= 2 and values.shape[-2:] == tuple(river_network.shape):
+        # static inputs are masked once rather than once per chunk
+        values = values.reshape(values.shape[:-2] + (-1,))[..., river_network.mask]
+    return values
+
+
+def _chunk_arg(arg, dim, start, stop):
+    if isinstance(arg, xr.DataArray):
+        return arg.isel({dim: slice(start, stop)}).values
+    return arg
+
+
+def _output_template(field, dim, lead_dims, core_dims, river_network, return_grid):
+    coords = {}
+    for d in [dim, *lead_dims]:
+        coords[d] = field[d].variable if d in field.coords else np.arange(field.sizes[d])
+    for k, v in field.coords.items():
+        if k not in coords and set(v.dims) <= {dim, *lead_dims}:
+            coords[k] = v.variable
+
+    if return_grid:
+        out_core_dims = list(river_network.coords.keys())
+        for k, v in river_network.coords.items():
+            coords[k] = (k, np.asarray(v))
+    elif len(core_dims) == 1:
+        out_core_dims = core_dims
+        node_dim = core_dims[0]
+        coords[node_dim] = field[node_dim].variable if node_dim in field.coords else np.arange(river_network.n_nodes)
+        for k, v in field.coords.items():
+            if k not in coords and v.dims == (node_dim,):
+                coords[k] = v.variable
+    else:
+        out_core_dims = [node_default_coord]
+        coords[node_default_coord] = np.arange(river_network.n_nodes)
+        for k, v in get_node_coords(river_network).items():
+            coords[k] = (node_default_coord, v)
+
+    return xr.Dataset(coords=coords), out_core_dims
+
+
+def _get_writer(sink, name, dim, template):
+    if sink is None:
+        return _MemoryWriter(dim)
+    if isinstance(sink, (str, os.PathLike)) and os.fspath(sink).endswith(NETCDF_SUFFIXES):
+        return _NetCDFWriter(sink, name, dim, template)
+    return _ZarrWriter(sink, name, dim)
+
+
+class _MemoryWriter:
+    def __init__(self, dim):
+        self.dim = dim
+        self.chunks = []
+
+    def write(self, result, start):
+        # the buffers are reused for the next chunk
+        self.chunks.append(result.copy(deep=True))
+
+    def close(self):
+        if not self.chunks:
+            return None
+        return xr.concat(self.chunks, dim=self.dim)
+
+
+class _ZarrWriter:
+    def __init__(self, store, name, dim):
+        self.store = store
+        self.name = name
+        self.dim = dim
+
+    def write(self, result, start):
+        ds = result.to_dataset(name=self.name)
+        if start == 0:
+            ds.to_zarr(self.store, mode="w")
+        else:
+            ds.to_zarr(self.store, append_dim=self.dim)
+
+    def close(self):
+        return None
+
+
+class _NetCDFWriter:
+    def __init__(self, path, name, dim, template):
+        self.path = path
+        self.name = name
+        self.dim = dim
+        self.template = template
+        self.dataset = None
+        self.variable = None
+
+    def write(self, result, start):
+        if self.dataset is None:
+            try:
+                import netCDF4
+            except ModuleNotFoundError:
+                raise ModuleNotFoundError(
+                    "netCDF4 is required for streaming to a netCDF sink.\nTo install it, run `pip install netCDF4`"
+                )
+            # xarray writes the full coordinates, the data is then filled in chunk by chunk
+            self.template.to_netcdf(self.path, mode="w")
+            self.dataset = netCDF4.Dataset(self.path, "a")
+            self.variable = self.dataset.createVariable(self.name, result.dtype, result.dims)
+        self.variable[start : start + result.sizes[self.dim]] = result.values
+
+    def close(self):
+        if self.dataset is not None:
+            self.dataset.close()
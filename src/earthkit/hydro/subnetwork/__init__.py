@@ -1,6 +1,6 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
-from ._toplevel import crop, from_mask
+from ._toplevel import crop, from_locations, from_mask
 
-__all__ = ["crop", "from_mask"]
+__all__ = ["crop", "from_locations", "from_mask"]
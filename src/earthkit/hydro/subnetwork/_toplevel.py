@@ -4,8 +4,12 @@
 import copy as cp
 
 from earthkit.hydro._backends.numpy_backend import NumPyBackend
+from earthkit.hydro._readers._grit import get_edge_indices
+from earthkit.hydro._readers.chains import compute_chain_schedule
 from earthkit.hydro._utils.decorators.masking import mask_last2_dims
+from earthkit.hydro._utils.locations import locations_to_1d
 from earthkit.hydro.data_structures import RiverNetwork
+from earthkit.hydro.data_structures._network_storage import compute_segments, get_adjacency
 
 np = NumPyBackend()
 
@@ -14,6 +18,9 @@ def from_mask(river_network: RiverNetwork, node_mask=None, edge_mask=None, copy=
     """
     Create a subnetwork from a river network.
 
+    Only the retained edges are copied. Coordinates and arrays unaffected by the masks
+    are shared with the original river network.
+
     Parameters
     ----------
     river_network : RiverNetwork
@@ -33,41 +40,131 @@ def from_mask(river_network: RiverNetwork, node_mask=None, edge_mask=None, copy=
     if river_network.array_backend != "numpy" or copy is not True:
         raise NotImplementedError
 
+    storage = river_network._storage
     if node_mask is None and edge_mask is None:
-        return cp.deepcopy(river_network)
+        return RiverNetwork(cp.copy(storage))
 
     if node_mask is not None and node_mask.shape[-2:] == river_network.shape:
         node_mask = mask_last2_dims(np, node_mask, river_network.mask, node_mask.shape)
 
-    node_relabel = np.empty(river_network.n_nodes, dtype=int)
-    node_relabel[node_mask] = np.arange(node_mask.sum())
-
-    storage = cp.deepcopy(river_network._storage)
-    if edge_mask is not None and node_mask is not None:
-        valid_edges = edge_mask[storage.sorted_data[2]] & (
-            node_mask[storage.sorted_data[0]] & node_mask[storage.sorted_data[1]]
-        )
-    elif edge_mask is None:
-        valid_edges = node_mask[storage.sorted_data[0]] & node_mask[storage.sorted_data[1]]
-    else:
-        valid_edges = edge_mask[storage.sorted_data[2]]
-
-    original_order_edge_mask = np.empty(river_network.n_edges, dtype=bool)
-    original_order_edge_mask[storage.sorted_data[2]] = valid_edges
-    edge_relabel = np.empty(river_network.n_edges, dtype=int)
-    edge_relabel[original_order_edge_mask] = np.arange(original_order_edge_mask.sum())
-
-    storage.sorted_data = storage.sorted_data[..., valid_edges]
-    storage.sorted_data[0] = node_relabel[storage.sorted_data[0]]
-    storage.sorted_data[1] = node_relabel[storage.sorted_data[1]]
-    storage.sorted_data[2] = edge_relabel[storage.sorted_data[2]]
-
-    storage.splits = np.cumsum(valid_edges)[storage.splits - 1]
-    storage.mask = storage.mask[node_mask]
-    storage.n_nodes = storage.mask.shape[0]
-    storage.n_edges = storage.sorted_data.shape[1]
+    down_ids, up_ids, edge_ids = storage.sorted_data
+    valid_edges = np.ones(storage.n_edges, dtype=bool) if edge_mask is None else edge_mask[edge_ids]
+    if node_mask is not None:
+        valid_edges &= node_mask[down_ids] & node_mask[up_ids]
+    nodes = np.arange(storage.n_nodes) if node_mask is None else np.flatnonzero(node_mask)
 
-    return RiverNetwork(storage)
+    return RiverNetwork(subset_storage(storage, nodes, np.flatnonzero(valid_edges)))
+
+
+def from_locations(river_network: RiverNetwork, locations):
+    """
+    Create a subnetwork of the catchments of the given locations.
+
+    The catchments are found by walking upstream from the locations, so once the upstream
+    index of the river network is built, the time taken is proportional to the size of the
+    catchments rather than of the river network. Bifurcating river networks additionally
+    track the visited nodes in an array over the whole river network.
+
+    Parameters
+    ----------
+    river_network : RiverNetwork
+        Original river network from which to create a subnetwork.
+    locations : array-like or dict
+        A list of source nodes.
+
+    Returns
+    -------
+    RiverNetwork
+        The subnetwork of all nodes upstream of any of the locations, including the locations.
+    """
+    if river_network.array_backend != "numpy":
+        raise NotImplementedError
+
+    storage = river_network._storage
+    stations, _, _ = locations_to_1d(np, river_network, locations)
+    adjacency = get_adjacency(storage)
+
+    inlets = stations = np.unique(stations)
+    # without bifurcations, a node can only be reached again from a location upstream of another location
+    visited = np.zeros(storage.n_nodes, dtype=bool) if storage.bifurcates else None
+    if visited is not None:
+        visited[inlets] = True
+    nodes, edges = [inlets], []
+    while inlets.shape[0] > 0:
+        indices = get_edge_indices(adjacency.upstream_offsets, inlets)
+        edges.append(adjacency.upstream_edges[indices])
+        inlets = np.unique(adjacency.upstream_nodes[indices])
+        if visited is None:
+            # locations upstream of other locations are already walked from
+            position = np.minimum(np.searchsorted(stations, inlets), stations.shape[0] - 1)
+            inlets = inlets[stations[position] != inlets]
+        else:
+            inlets = inlets[~visited[inlets]]
+            visited[inlets] = True
+        nodes.append(inlets)
+
+    nodes = np.sort(np.concatenate(nodes))
+    edges = np.sort(np.concatenate(edges))
+    return RiverNetwork(subset_storage(storage, nodes, edges))
+
+
+def subset_storage(storage, nodes, edges):
+    """
+    Restricts a river network storage to some of its nodes and edges.
+
+    Parameters
+    ----------
+    storage : RiverNetworkStorage
+        The original river network storage.
+    nodes : numpy.ndarray
+        The sorted ids of the retained nodes.
+    edges : numpy.ndarray
+        The sorted columns of `storage.sorted_data` of the retained edges, whose nodes must be retained.
+
+    Returns
+    -------
+    RiverNetworkStorage
+        A storage sharing the coordinates and shape of `storage`, with new nodes and edges
+        numbered in the same order as in `storage`.
+    """
+    sorted_data = storage.sorted_data[:, edges]
+    n_nodes = nodes.shape[0]
+    n_edges = edges.shape[0]
+
+    # relabelling preserves the order of nodes and edges, so the downstream ids of every group stay sorted
+    original_edge_ids = sorted_data[2].copy()
+    sorted_data[0] = np.searchsorted(nodes, sorted_data[0])
+    sorted_data[1] = np.searchsorted(nodes, sorted_data[1])
+    edge_order = np.argsort(original_edge_ids)
+    sorted_data[2, edge_order] = np.arange(n_edges)
+
+    # groups without any retained edge are dropped
+    splits = np.unique(np.searchsorted(edges, storage.splits))
+    splits = splits[(splits > 0) & (splits < n_edges)]
+
+    has_downstream = np.zeros(n_nodes, dtype=bool)
+    has_downstream[sorted_data[1]] = True
+    has_upstream = np.zeros(n_nodes, dtype=bool)
+    has_upstream[sorted_data[0]] = True
+
+    subset = cp.copy(storage)
+    subset.n_nodes = n_nodes
+    subset.n_edges = n_edges
+    subset.sorted_data = sorted_data
+    subset.splits = splits
+    subset.sources = np.flatnonzero(~has_upstream)
+    subset.sinks = np.flatnonzero(~has_downstream)
+    subset.mask = storage.mask[nodes]
+    subset.coords = None if storage.coords is None else dict(storage.coords)
+    if getattr(storage, "area", None) is not None:
+        subset.area = storage.area[nodes]
+    if storage.edge_weights is not None:
+        subset.edge_weights = storage.edge_weights[original_edge_ids[edge_order]]
+    subset.segments = compute_segments(sorted_data, splits)
+    subset.adjacency = None
+    if getattr(storage, "chains", None) is not None:
+        subset.chains = compute_chain_schedule(n_nodes, sorted_data, splits)
+    return subset
 
 
 def crop(river_network: RiverNetwork, copy=True):
@@ -90,7 +187,7 @@ def crop(river_network: RiverNetwork, copy=True):
     if river_network.array_backend != "numpy" or copy is not True:
         raise NotImplementedError
 
-    storage = cp.deepcopy(river_network._storage)
+    storage = cp.copy(river_network._storage)
 
     rows, cols = np.unravel_index(storage.mask, shape=(storage.shape))
 
@@ -101,6 +198,8 @@ def crop(river_network: RiverNetwork, copy=True):
 
     storage.mask = np.ravel_multi_index((rows - row_min, cols - col_min), dims=storage.shape)
 
+    # the edges are unchanged and shared with the original network, coords are cropped as views
+    storage.coords = dict(storage.coords)
     for i, key in enumerate(storage.coords.keys()):
         if i == 0:
             storage.coords[key] = storage.coords[key][row_min : row_max + 1]
@@ -1,6 +1,6 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
-from ._toplevel import max, mean, min, mode, percentile, skewness, std, sum, var
+from ._toplevel import max, mean, min, mode, percentile, plan, skewness, std, sum, var
 
-__all__ = ["max", "mean", "min", "mode", "percentile", "skewness", "std", "sum", "var"]
+__all__ = ["max", "mean", "min", "mode", "percentile", "plan", "skewness", "std", "sum", "var"]
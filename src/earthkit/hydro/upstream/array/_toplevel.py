@@ -1,10 +1,11 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+from earthkit.hydro._core.plan import AccumulationPlan
 from earthkit.hydro.upstream.array import _operations
 
 
-def percentile(river_network, field, p, node_weights=None, edge_weights=None, return_type=None):
+def percentile(river_network, field, p, node_weights=None, edge_weights=None, return_type=None, out=None):
     r"""
     Computes the weighted percentile of a field over all upstream nodes.
 
@@ -63,6 +64,9 @@ def percentile(river_network, field, p, node_weights=None, edge_weights=None, re
         Currently unsupported.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -81,10 +85,11 @@ def percentile(river_network, field, p, node_weights=None, edge_weights=None, re
         weights=node_weights,
         p=p,
         return_type=return_type,
+        out=out,
     )
 
 
-def var(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def var(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted variance of a field over all upstream nodes.
 
@@ -132,6 +137,11 @@ def var(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -144,10 +154,14 @@ def var(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def skewness(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def skewness(
+    river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False
+):
     r"""
     Computes the weighted skewness of a field over all upstream nodes.
 
@@ -191,6 +205,11 @@ def skewness(river_network, field, node_weights=None, edge_weights=None, return_
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -203,10 +222,12 @@ def skewness(river_network, field, node_weights=None, edge_weights=None, return_
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def std(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def std(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted standard deviation of a field over all
     upstream nodes.
@@ -257,6 +278,11 @@ def std(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -269,10 +295,12 @@ def std(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def mean(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def mean(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted mean of a field over all upstream nodes.
 
@@ -315,6 +343,11 @@ def mean(river_network, field, node_weights=None, edge_weights=None, return_type
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -327,10 +360,12 @@ def mean(river_network, field, node_weights=None, edge_weights=None, return_type
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def sum(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def sum(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted sum of a field over all upstream nodes.
 
@@ -369,6 +404,11 @@ def sum(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -381,10 +421,12 @@ def sum(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def min(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def min(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted minimum of a field over all upstream nodes.
 
@@ -423,6 +465,11 @@ def min(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -435,10 +482,12 @@ def min(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def max(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def max(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None, overwrite_input=False):
     r"""
     Computes the weighted maximum of a field over all upstream nodes.
 
@@ -477,6 +526,11 @@ def max(river_network, field, node_weights=None, edge_weights=None, return_type=
         Array of weights for each edge. Default is None (unweighted).
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
+    overwrite_input : bool, optional
+        Whether masked `field` values may be overwritten to avoid a copy. Default is False.
 
     Returns
     -------
@@ -489,10 +543,12 @@ def max(river_network, field, node_weights=None, edge_weights=None, return_type=
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
+        overwrite_input=overwrite_input,
     )
 
 
-def mode(river_network, field, node_weights=None, edge_weights=None, return_type=None):
+def mode(river_network, field, node_weights=None, edge_weights=None, return_type=None, out=None):
     r"""
     Computes the mode (most common value) of categorical data over all upstream nodes.
 
@@ -533,6 +589,9 @@ def mode(river_network, field, node_weights=None, edge_weights=None, return_type
         Not supported for mode calculation. Must be None.
     return_type : str, optional
         Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+    out : array-like, optional
+        C-contiguous array of the result's shape and dtype to write the result into. Default is None,
+        which allocates a new array. Only supported for the numpy, cupy and torch backends.
 
     Returns
     -------
@@ -559,4 +618,37 @@ def mode(river_network, field, node_weights=None, edge_weights=None, return_type
         node_weights=node_weights,
         edge_weights=edge_weights,
         return_type=return_type,
+        out=out,
     )
+
+
+def plan(river_network, metric, node_weights=None, edge_weights=None, return_type=None):
+    """
+    Prepares a weighted metric over all upstream nodes for repeated application.
+
+    Building the plan resolves the array backend, masks the node weights and checks the
+    arguments once. Calling it on a field computes the same result as the corresponding
+    `ekh.upstream.array` function, without repeating that work. This pays off when the
+    same metric is computed for many fields on a small network, e.g. in a calibration loop.
+
+    Parameters
+    ----------
+    river_network : RiverNetwork
+        A river network object.
+    metric : str
+        One of "sum", "mean", "var", "std", "skewness", "max" or "min".
+    node_weights : array-like, optional
+        Array of weights for each river network node or gridcell. Default is None (unweighted).
+    edge_weights : array-like, optional
+        Array of weights for each edge. Default is None (unweighted).
+    return_type : str, optional
+        Either "masked", "gridded" or None. If None (default), uses `river_network.return_type`.
+
+    Returns
+    -------
+    AccumulationPlan
+        A callable `plan(field, out=None)` returning the metric for every river network node
+        or gridcell, depending on `return_type`. For numpy, the result is written into `out`
+        if given.
+    """
+    return AccumulationPlan(river_network, metric, "down", node_weights, edge_weights, return_type)
@@ -32,3 +32,45 @@ def test_catchments_sum(river_network, field, locations, expected, array_backend
     print("Result:", result)
     print("Expected:", expected)
     np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [("cama_nextxy", cama_nextxy_1), ("cama_nextxy", cama_nextxy_2), ("d8_ldd", d8_ldd_1)],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("metric", ["sum", "mean", "max"])
+def test_catchments_restricted_to_stations(river_network, metric):
+    """Test that small station sets give the same result as a full upstream accumulation."""
+    rng = np.random.default_rng(0)
+    field = rng.random((2, river_network.n_nodes))
+    node_weights = rng.random(river_network.n_nodes)
+    edge_weights = rng.random(river_network.n_edges)
+    expected = getattr(ekh.upstream.array, metric)(
+        river_network, field, node_weights, edge_weights, return_type="masked"
+    )
+
+    for stations in [np.array([0]), np.array([1, 3]), np.arange(river_network.n_nodes)]:
+        result = getattr(ekh.catchments.array, metric)(
+            river_network, field, locations=stations, node_weights=node_weights, edge_weights=edge_weights
+        )
+        np.testing.assert_allclose(result, expected[..., stations], rtol=1e-6)
+
+    # the catchment index of each station set is computed once
+    assert len(river_network._catchment_indices) == 3
+
+
+@pytest.mark.parametrize("river_network", [("cama_nextxy", cama_nextxy_2)], indirect=["river_network"])
+def test_catchments_sum_station_dtypes(river_network):
+    field = np.random.default_rng(0).random(river_network.n_nodes)
+    station = river_network.sources[0]
+    expected = ekh.upstream.array.sum(river_network, field, return_type="masked")
+
+    # an int64 station set shares its bytes with the int32 set of the station and node 0
+    for stations in [np.array([station], dtype=np.int64), np.array([station, 0], dtype=np.int32)]:
+        result = ekh.catchments.array.sum(river_network, field, locations=stations)
+        np.testing.assert_allclose(result, expected[stations], rtol=1e-6)
+
+    assert river_network._catchment_indices
+    river_network.clear_cache()
+    assert not river_network._catchment_indices
@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from _test_inputs.readers import *
+
+import earthkit.hydro as ekh
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [("cama_nextxy", cama_nextxy_1), ("d8_ldd", d8_ldd_1)],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("metric", ["sum", "max", "min", "mean", "var"])
+@pytest.mark.parametrize("return_type", ["masked", "gridded"])
+def test_downstream_plan(river_network, metric, return_type):
+    """Test that a plan matches the corresponding downstream function, with and without out."""
+    rng = np.random.default_rng(0)
+    node_weights = rng.random(river_network.n_nodes)
+    edge_weights = rng.random(river_network.n_edges)
+    plan = ekh.downstream.array.plan(river_network, metric, node_weights, edge_weights, return_type=return_type)
+
+    out = None
+    for _ in range(2):
+        field = rng.random((3, river_network.n_nodes))
+        expected = getattr(ekh.downstream.array, metric)(
+            river_network, field, node_weights, edge_weights, return_type=return_type
+        )
+        np.testing.assert_allclose(plan(field), expected, rtol=1e-6, equal_nan=True)
+
+        if out is None:
+            out = np.empty_like(expected)
+        assert plan(field, out=out) is out
+        np.testing.assert_allclose(out, expected, rtol=1e-6, equal_nan=True)
@@ -1,13 +1,16 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import sys
+
 import numpy as np
 import pytest
 from _test_inputs.accumulation import *
 from _test_inputs.readers import *
-from utils import convert_to_2d
+from utils import convert_to_2d, flow_accumulate_reference
 
 import earthkit.hydro as ekh
+from earthkit.hydro._core import accumulate
 
 
 @pytest.mark.parametrize(
@@ -54,3 +57,62 @@ def test_downstream_metric_sum(river_network, input_field, flow_downstream, mv,
     print(flow_downstream)
     assert output_field.dtype == flow_downstream.dtype
     np.testing.assert_allclose(output_field, flow_downstream, rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [("cama_nextxy", cama_nextxy_1), ("d8_ldd", d8_ldd_1)],
+    indirect=["river_network"],
+)
+def test_downstream_sum_rust_dispatch(river_network, monkeypatch):
+    # without the extension, auto-detection falls back to numpy
+    monkeypatch.delenv("USE_RUST", raising=False)
+    monkeypatch.setitem(sys.modules, "earthkit.hydro._rust", None)
+    assert accumulate.get_rust_flow() is None
+
+    calls = []
+
+    def kernel(*args):
+        calls.append(args)
+        return flow_accumulate_reference(*args)
+
+    monkeypatch.setattr(accumulate, "get_rust_flow", lambda: kernel)
+    rng = np.random.default_rng(0)
+    field = rng.standard_normal((2, 3, river_network.n_nodes))
+    ekh.downstream.array.sum(river_network, field, edge_weights=rng.uniform(size=river_network.n_edges))
+    assert len(calls) == 1
+
+    # the kernel takes one weight per edge, so batched edge weights fall back to numpy
+    ekh.downstream.array.sum(river_network, field, edge_weights=rng.uniform(size=(2, 3, river_network.n_edges)))
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "river_network, input_field, flow_downstream",
+    [
+        (("cama_nextxy", cama_nextxy_1), input_field_1c, downstream_metric_sum_1c),
+        (("cama_nextxy", cama_nextxy_1), input_field_1e, downstream_metric_sum_1e),
+    ],
+    indirect=["river_network"],
+)
+def test_downstream_sum_out(river_network, input_field, flow_downstream, monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    field = input_field.astype(np.float64)
+    expected = flow_downstream.astype(np.float64)
+
+    out = np.empty(river_network.n_nodes)
+    result = ekh.downstream.array.sum(river_network, field.copy(), return_type="masked", out=out)
+    assert result is out
+    np.testing.assert_allclose(out, expected, rtol=1e-6, equal_nan=True)
+
+    out = np.empty(river_network.shape)
+    result = ekh.downstream.array.sum(river_network, field.copy(), return_type="gridded", out=out)
+    assert result is out
+    expected_grid = np.full(int(np.prod(river_network.shape)), np.nan)
+    expected_grid[river_network.mask] = expected
+    np.testing.assert_allclose(out, expected_grid.reshape(river_network.shape), rtol=1e-6, equal_nan=True)
+
+    # the accumulation runs in place in the field
+    result = ekh.downstream.array.sum(river_network, field, return_type="masked", overwrite_input=True)
+    assert result is field
+    np.testing.assert_allclose(field, expected, rtol=1e-6, equal_nan=True)
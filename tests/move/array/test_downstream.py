@@ -28,3 +28,15 @@ def test_calculate_upstream_metric_max(river_network, flow_downstream):
     print(flow_downstream)
     assert output_field.dtype == flow_downstream.dtype
     np.testing.assert_allclose(output_field, flow_downstream)
+
+
+@pytest.mark.parametrize("river_network", [("cama_nextxy", cama_nextxy_1)], indirect=["river_network"])
+@pytest.mark.parametrize("dtype", [np.int64, np.float32])
+def test_move_downstream_overwrite_input_dtype(river_network, dtype):
+    field = np.arange(river_network.n_nodes).astype(dtype)
+    node_weights = np.full(river_network.n_nodes, 0.1)
+    expected = ekh.move.array.downstream(river_network, field.astype(np.float64), node_weights, return_type="masked")
+
+    result = ekh.move.array.downstream(river_network, field, node_weights, return_type="masked", overwrite_input=True)
+    np.testing.assert_allclose(result, expected)
+    np.testing.assert_array_equal(field, np.arange(river_network.n_nodes).astype(dtype))
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+import xarray as xr
+from _test_inputs.readers import cama_nextxy_1, cama_nextxy_2, d8_ldd_1, d8_ldd_2
+
+import earthkit.hydro as ekh
+
+
+def expected_path(downstream, start, max_distance=np.inf, stations=()):
+    nodes, distances = [start], [0]
+    while downstream[nodes[-1]] != -1 and distances[-1] + 1 <= max_distance:
+        nodes.append(downstream[nodes[-1]])
+        distances.append(distances[-1] + 1)
+        if nodes[-1] in stations:
+            break
+    return nodes, distances
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [
+        ("cama_nextxy", cama_nextxy_1),
+        ("d8_ldd", d8_ldd_1),
+        ("d8_ldd", d8_ldd_2),
+    ],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("max_distance, stations", [(None, None), (2, None), (None, [1, 5, 10])])
+def test_downstream(river_network, max_distance, stations):
+    locations = list(range(0, river_network.n_nodes, 3))
+
+    offsets, nodes, distances = ekh.path.downstream(
+        river_network, locations, max_distance=max_distance, stations=stations
+    )
+
+    down_ids, up_ids, _ = river_network._storage.sorted_data
+    downstream = np.full(river_network.n_nodes, -1)
+    downstream[up_ids] = down_ids
+    assert offsets.shape == (len(locations) + 1,)
+    for i, start in enumerate(locations):
+        expected_nodes, expected_distances = expected_path(
+            downstream, start, np.inf if max_distance is None else max_distance, stations or ()
+        )
+        np.testing.assert_array_equal(nodes[offsets[i] : offsets[i + 1]], expected_nodes)
+        np.testing.assert_array_equal(distances[offsets[i] : offsets[i + 1]], expected_distances)
+
+
+def to_layout(river_network, field, layout):
+    if layout == "masked":
+        return field
+    grid = np.full(river_network.shape, np.nan)
+    grid.flat[river_network.mask] = field
+    if layout == "gridded":
+        return grid
+    return xr.DataArray(grid, dims=list(river_network.coords), coords=river_network.coords)
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [
+        ("cama_nextxy", cama_nextxy_2),
+        ("d8_ldd", d8_ldd_1),
+    ],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("layout", ["masked", "gridded", "xarray"])
+def test_downstream_field(river_network, layout):
+    field = np.random.default_rng(0).uniform(size=river_network.n_nodes)
+    locations = [0, river_network.n_nodes // 2]
+
+    offsets, nodes, distances = ekh.path.downstream(river_network, locations, to_layout(river_network, field, layout))
+
+    for i, start in enumerate(locations):
+        expected = ekh.distance.array.min(river_network, [start], field, return_type="masked")
+        path = nodes[offsets[i] : offsets[i + 1]]
+        np.testing.assert_allclose(distances[offsets[i] : offsets[i + 1]], expected[path])
+        # the path holds every node reachable downstream of its start
+        np.testing.assert_array_equal(np.sort(path), np.flatnonzero(np.isfinite(expected)))
+
+
+@pytest.mark.parametrize("river_network", [("d8_ldd", d8_ldd_1)], indirect=["river_network"])
+def test_downstream_field_shape(river_network):
+    with pytest.raises(ValueError, match="field must be of shape"):
+        ekh.path.downstream(river_network, [0], np.ones(river_network.n_nodes + 1))
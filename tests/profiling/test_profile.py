@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import numpy as np
+import pytest
+from _test_inputs.readers import *
+
+import earthkit.hydro as ekh
+from earthkit.hydro._core import accumulate
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [("cama_nextxy", cama_nextxy_1), ("d8_ldd", d8_ldd_1)],
+    indirect=["river_network"],
+)
+def test_profile_upstream_sum(river_network, tmp_path, monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    field = np.full(river_network.shape, 1.0)
+    trace = tmp_path / "trace.jsonl"
+
+    with ekh.profile(trace=trace) as prof:
+        ekh.upstream.array.sum(river_network, field, return_type="gridded")
+
+    events = [record["event"] for record in prof.records]
+    assert events.count("call") == 1
+    assert events.count("mask") == 1
+    assert events.count("unmask") == 1
+    assert all(record["op"] == "upstream.sum" for record in prof.records)
+
+    levels = [record for record in prof.records if record["event"] == "level"]
+    assert sorted(record["level"] for record in levels) == list(range(len(river_network.groups)))
+    assert sum(record["edges"] for record in levels) == river_network.n_edges
+    assert sum(record["bytes_gathered"] for record in levels) == river_network.n_edges * 8
+
+    summary = prof.summary()["upstream.sum"]
+    assert summary["level"]["count"] == len(levels)
+    assert summary["level"]["edges"] == river_network.n_edges
+
+    with open(trace) as f:
+        assert [json.loads(line) for line in f] == prof.records
+
+    # nothing is collected outside of the context
+    ekh.upstream.array.sum(river_network, field, return_type="gridded")
+    assert len(prof.records) == len(events)
+
+
+@pytest.mark.parametrize("river_network", [("cama_nextxy", cama_nextxy_1)], indirect=["river_network"])
+@pytest.mark.parametrize("node_major_min_batch", [1, np.inf])
+def test_profile_level_bytes(river_network, node_major_min_batch, monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    monkeypatch.setattr(accumulate, "NODE_MAJOR_MIN_BATCH", node_major_min_batch)
+    field = np.ones((4, 25, river_network.n_nodes))
+
+    with ekh.profile() as prof:
+        ekh.upstream.array.sum(river_network, field, return_type="masked")
+
+    # every edge moves the 100 values of its upstream node, whatever the layout
+    summary = prof.summary()["upstream.sum"]["level"]
+    assert summary["bytes_gathered"] == river_network.n_edges * 100 * 8
+    assert summary["bytes_scattered"] == river_network.n_edges * 100 * 8
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from _test_inputs.readers import cama_nextxy_1, d8_ldd_1, d8_ldd_2
+
+from earthkit.hydro._readers import from_cama_nextxy, from_d8
+from earthkit.hydro.data_structures._network_storage import get_adjacency
+
+
+@pytest.mark.parametrize("storage", [from_d8(d8_ldd_1), from_d8(d8_ldd_2), from_cama_nextxy(*cama_nextxy_1)])
+def test_adjacency(storage):
+    adjacency = get_adjacency(storage)
+    assert get_adjacency(storage) is adjacency
+
+    down_ids, up_ids, _ = storage.sorted_data
+    for node in range(storage.n_nodes):
+        start, end = adjacency.upstream_offsets[node : node + 2]
+        np.testing.assert_array_equal(np.sort(adjacency.upstream_nodes[start:end]), np.sort(up_ids[down_ids == node]))
+        np.testing.assert_array_equal(down_ids[adjacency.upstream_edges[start:end]], node)
+        np.testing.assert_array_equal(up_ids[adjacency.upstream_edges[start:end]], adjacency.upstream_nodes[start:end])
+
+    expected = np.full(storage.n_nodes, storage.n_nodes)
+    expected[up_ids] = down_ids
+    np.testing.assert_array_equal(adjacency.downstream_nodes, expected)
+    np.testing.assert_array_equal(np.flatnonzero(adjacency.downstream_nodes == storage.n_nodes), storage.sinks)
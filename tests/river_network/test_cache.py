@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+import numpy as np
+import xarray as xr
+from _test_inputs.readers import *
+
+import earthkit.hydro as ekh
+
+
+def write_ldd(data, path):
+    coords = {"lat": np.arange(data.shape[0]), "lon": np.arange(data.shape[1])}
+    da = xr.DataArray(data.astype(np.int32), dims=("lat", "lon"), coords=coords, name="ldd")
+    da.encoding = {"_FillValue": 255}
+    da.to_netcdf(path)
+
+
+def test_cache_reuse_and_invalidation(tmp_path):
+    path = str(tmp_path / "ldd.nc")
+    cache_dir = str(tmp_path / "cache")
+    write_ldd(d8_ldd_1, path)
+
+    net = ekh.river_network.create(path, "pcr_d8", cache_dir=cache_dir)
+    # a network already loaded in this process is not read again
+    assert ekh.river_network.create(path, "pcr_d8", cache_dir=cache_dir)._storage is net._storage
+    assert len([f for f in os.listdir(cache_dir) if f.endswith(".joblib")]) == 1
+
+    # a changed file at the same path must not return the stale network
+    write_ldd(d8_ldd_2, path)
+    changed = ekh.river_network.create(path, "pcr_d8", cache_dir=cache_dir)
+    assert changed._storage is not net._storage
+    expected = ekh.river_network.create(path, "pcr_d8", use_cache=False)
+    np.testing.assert_array_equal(changed._storage.sorted_data, expected._storage.sorted_data)
+
+    # networks with a chain schedule are cached separately
+    compressed = ekh.river_network.create(path, "pcr_d8", cache_dir=cache_dir, compress_chains=True)
+    assert compressed._storage.chains is not None
+    assert changed._storage.chains is None
+    assert ekh.river_network.create(path, "pcr_d8", cache_dir=cache_dir)._storage is changed._storage
+
+
+def test_cache_eviction(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    # unrelated files sharing the cache directory are left alone
+    os.makedirs(cache_dir)
+    user_file = os.path.join(cache_dir, "notes.joblib")
+    with open(user_file, "w") as f:
+        f.write("not a river network")
+    paths = []
+    for i, ldd in enumerate([d8_ldd_1, d8_ldd_2]):
+        paths.append(str(tmp_path / f"ldd_{i}.nc"))
+        write_ldd(ldd, paths[-1])
+
+    for path in paths:
+        ekh.river_network.create(path, "pcr_d8", cache_dir=cache_dir, cache_max_size=1)
+
+    # only the most recently written network is kept, next to the unrelated file
+    assert len([f for f in os.listdir(cache_dir) if f.endswith(".joblib")]) == 2
+    assert os.path.isfile(user_file)
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from _test_inputs.readers import cama_nextxy_1
+
+import earthkit.hydro as ekh
+from earthkit.hydro._readers import from_cama_nextxy
+
+
+def write_cama_bin(map_dir, x, y):
+    ny, nx = x.shape
+    params = [
+        f"{nx:12d}  !! grid number (east-west)",
+        f"{ny:12d}  !! grid number (north-south)",
+        f"{1:12d}  !! floodplain layer",
+        f"{1.0:12.8f}  !! grid size  [deg]",
+        f"{0.0:12.3f}  !! west  edge [deg]",
+        f"{float(nx):12.3f}  !! east  edge [deg]",
+        f"{float(ny):12.3f}  !! north edge [deg]",
+        f"{0.0:12.3f}  !! south edge [deg]",
+    ]
+    (map_dir / "params.txt").write_text("\n".join(params) + "\n")
+    np.stack([x, y]).astype("<i4").tofile(map_dir / "nextxy.bin")
+
+
+def test_cama_bin(tmp_path):
+    x, y = cama_nextxy_1
+    write_cama_bin(tmp_path, x, y)
+    expected = from_cama_nextxy(x, y)
+
+    for path in [tmp_path, tmp_path / "nextxy.bin"]:
+        network = ekh.river_network.create(str(path), "cama_bin", use_cache=False)
+
+        assert network.n_nodes == expected.n_nodes
+        np.testing.assert_array_equal(network._storage.mask, expected.mask)
+        np.testing.assert_array_equal(network._storage.sorted_data, expected.sorted_data)
+        ny, nx = x.shape
+        np.testing.assert_allclose(network.coords["lat"], np.arange(ny)[::-1] + 0.5)
+        np.testing.assert_allclose(network.coords["lon"], np.arange(nx) + 0.5)
+
+
+def test_cama_bin_compress_chains(tmp_path):
+    x, y = cama_nextxy_1
+    write_cama_bin(tmp_path, x, y)
+    field = np.random.default_rng(0).uniform(size=x.shape)
+
+    network = ekh.river_network.create(str(tmp_path), "cama_bin", use_cache=False)
+    compressed = ekh.river_network.create(str(tmp_path), "cama_bin", use_cache=False, compress_chains=True)
+
+    assert network._storage.chains is None
+    assert compressed._storage.chains is not None
+    np.testing.assert_allclose(ekh.upstream.array.sum(compressed, field), ekh.upstream.array.sum(network, field))
+
+
+def test_create_compress_chains_unsupported(tmp_path):
+    with pytest.raises(ValueError, match="compress_chains"):
+        ekh.river_network.create(str(tmp_path / "network"), "grit_parquet", use_cache=False, compress_chains=True)
+
+
+def test_cama_bin_size_mismatch(tmp_path):
+    x, y = cama_nextxy_1
+    write_cama_bin(tmp_path, x, y)
+    # a file of int64 values does not match the int32 grid of params.txt
+    np.stack([x, y]).astype("<i8").tofile(tmp_path / "nextxy.bin")
+
+    with pytest.raises(ValueError, match=r"params\.txt"):
+        ekh.river_network.create(str(tmp_path), "cama_bin", use_cache=False)
+
+
+def test_cama_bin_cache_params(tmp_path):
+    map_dir = tmp_path / "map"
+    map_dir.mkdir()
+    cache_dir = str(tmp_path / "cache")
+    x, y = cama_nextxy_1
+    write_cama_bin(map_dir, x, y)
+    path = str(map_dir / "nextxy.bin")
+
+    network = ekh.river_network.create(path, "cama_bin", cache_dir=cache_dir)
+    # a changed grid origin in params.txt must not return the network with stale coordinates
+    params = (map_dir / "params.txt").read_text().replace(f"{0.0:12.3f}  !! west", f"{10.0:12.3f}  !! west")
+    (map_dir / "params.txt").write_text(params)
+    moved = ekh.river_network.create(path, "cama_bin", cache_dir=cache_dir)
+
+    assert moved._storage is not network._storage
+    np.testing.assert_allclose(moved.coords["lon"], network.coords["lon"] + 10)
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+from struct import pack
+
+import numpy as np
+import pytest
+import xarray as xr
+from _test_inputs.readers import d8_ldd_1, d8_ldd_2
+
+import earthkit.hydro as ekh
+from earthkit.hydro._readers import from_d8
+from earthkit.hydro._utils.readers import CR_INT4, CR_REAL4, CR_UINT1, from_file
+
+
+@pytest.mark.parametrize("data", [d8_ldd_1, d8_ldd_2])
+@pytest.mark.parametrize("tile_rows", [1, 2, 1000])
+def test_from_d8_tiled(data, tile_rows):
+    expected = from_d8(data)
+    result = from_d8(data, tile_rows=tile_rows)
+
+    assert result.n_nodes == expected.n_nodes
+    assert result.n_edges == expected.n_edges
+    assert result.shape == expected.shape
+    np.testing.assert_array_equal(result.mask, expected.mask)
+    np.testing.assert_array_equal(result.sorted_data, expected.sorted_data)
+    np.testing.assert_array_equal(result.splits, expected.splits)
+    np.testing.assert_array_equal(result.sources, expected.sources)
+    np.testing.assert_array_equal(result.sinks, expected.sinks)
+
+
+def test_from_d8_tiled_esri():
+    # a 2x3 grid flowing east into a sink, with missing values on the second row
+    data = np.array([[1, 1, 0], [255, 255, 4]])
+    expected = from_d8(data, "esri_d8")
+    result = from_d8(data, "esri_d8", tile_rows=1)
+
+    np.testing.assert_array_equal(result.mask, expected.mask)
+    np.testing.assert_array_equal(result.sorted_data, expected.sorted_data)
+
+
+def write_map(path, data, cell_repr):
+    header = bytearray(256)
+    header[64:132] = pack("=hhddddIIddd", 0, cell_repr, 0, 0, 0, 0, data.shape[0], data.shape[1], 0, 0, 0)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(data.tobytes())
+
+
+@pytest.mark.parametrize(
+    "cell_repr, dtype, mv, masked_dtype",
+    [
+        (CR_UINT1, np.uint8, 255, np.float32),
+        (CR_INT4, np.int32, -2147483648, np.float64),
+        (CR_REAL4, np.float32, np.nan, np.float32),
+    ],
+)
+def test_from_file(tmp_path, cell_repr, dtype, mv, masked_dtype):
+    data = np.arange(12, dtype=dtype).reshape(3, 4)
+    data[1, 2] = mv
+    path = str(tmp_path / "test.map")
+    write_map(path, data, cell_repr)
+
+    result = from_file(path)
+    assert isinstance(result, np.memmap)
+    np.testing.assert_array_equal(result, data)
+
+    window = (slice(1, 3), slice(1, 3))
+    np.testing.assert_array_equal(from_file(path, window=window), data[window])
+
+    expected = data.astype(masked_dtype)
+    expected[1, 2] = np.nan
+    result = from_file(path, mask=True, window=window)
+    assert result.dtype == masked_dtype
+    np.testing.assert_array_equal(result, expected[window])
+    assert from_file(path, mask=True, dtype=np.float64).dtype == np.float64
+
+
+@pytest.mark.parametrize("suffix", [".map", ".nc"])
+def test_create_tiled(tmp_path, suffix):
+    path = str(tmp_path / f"ldd{suffix}")
+    data = d8_ldd_1.astype(np.uint8)
+    if suffix == ".map":
+        write_map(path, data, CR_UINT1)
+    else:
+        coords = {"lat": np.arange(data.shape[0]), "lon": np.arange(data.shape[1])}
+        xr.DataArray(data, dims=("lat", "lon"), coords=coords, name="ldd").to_netcdf(path)
+    expected = from_d8(d8_ldd_1)
+
+    result = ekh.river_network.create(path, "pcr_d8", use_cache=False, tile_rows=2)._storage
+    np.testing.assert_array_equal(result.mask, expected.mask)
+    np.testing.assert_array_equal(result.sorted_data, expected.sorted_data)
+
+    with pytest.raises(ValueError, match="tile_rows"):
+        ekh.river_network.create(path, "pcr_d8", use_cache=False, tile_rows=2, repair=True)
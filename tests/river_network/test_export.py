@@ -1,12 +1,14 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import joblib
 import numpy as np
 import pytest
 import xarray as xr
 from _test_inputs.readers import *
 
 import earthkit.hydro as ekh
+from earthkit.hydro.data_structures._network_storage import get_adjacency
 
 
 def generate_ldd(data, mv):
@@ -71,3 +73,51 @@ def test_create_export(tmp_path, ldd, mv, river_network_format):
         net = ekh.river_network.create(file, fmt)
         exported_sum = ekh.upstream.sum(net, np.arange(net.n_nodes))
         np.testing.assert_array_equal(original_sum, exported_sum)
+
+
+@pytest.mark.parametrize(
+    "ldd, mv, river_network_format",
+    [
+        (d8_ldd_1, 255, "pcr_d8"),
+        (cama_nextxy_1, -9, "cama"),
+    ],
+)
+def test_export_precomputed_mmap(tmp_path, ldd, mv, river_network_format):
+    original = str(tmp_path / "original.nc")
+    ds = generate_ldd(ldd, mv)
+    ds.to_netcdf(original)
+
+    net = ekh.river_network.create(original, river_network_format, use_cache=False)
+    original_sum = ekh.upstream.sum(net, np.arange(net.n_nodes))
+
+    exported = str(tmp_path / "exported_mmap")
+    ekh.river_network.export(net, exported, "precomputed_mmap")
+    # the adjacency is exported without being cached on the exported network
+    assert net._storage.adjacency is None
+
+    for fmt in ["precomputed_mmap", "precomputed"]:
+        loaded = ekh.river_network.create(exported, fmt, use_cache=False)
+        assert isinstance(loaded._storage.sorted_data, np.memmap)
+        assert not loaded._storage.sorted_data.flags.writeable
+        assert loaded.coords.keys() == net.coords.keys()
+        adjacency = loaded._storage.adjacency
+        assert isinstance(adjacency.upstream_nodes, np.memmap)
+        np.testing.assert_array_equal(adjacency.downstream_nodes, get_adjacency(net._storage).downstream_nodes)
+        exported_sum = ekh.upstream.sum(loaded, np.arange(loaded.n_nodes))
+        np.testing.assert_array_equal(original_sum, exported_sum)
+
+
+def test_export_precomputed_without_adjacency(tmp_path):
+    original = str(tmp_path / "original.nc")
+    generate_ldd(d8_ldd_1, 255).to_netcdf(original)
+    net = ekh.river_network.create(original, "pcr_d8", use_cache=False)
+    adjacency = get_adjacency(net._storage)
+
+    exported = str(tmp_path / "exported.joblib")
+    ekh.river_network.export(net, exported, "precomputed")
+
+    # files stay readable by releases without the adjacency, which is rebuilt on first use
+    assert "adjacency" not in vars(joblib.load(exported))
+    assert net._storage.adjacency is adjacency
+    loaded = ekh.river_network.create(exported, "precomputed", use_cache=False)
+    np.testing.assert_array_equal(get_adjacency(loaded._storage).downstream_nodes, adjacency.downstream_nodes)
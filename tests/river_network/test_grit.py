@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+
+import earthkit.hydro as ekh
+from earthkit.hydro._readers._core import get_sources
+from earthkit.hydro._readers._grit import compute_topological_labels_bifurcations
+
+try:
+    from earthkit.hydro._rust import compute_topological_labels_bifurcations_rust  # noQA: F401
+
+    RUST = True
+except ImportError:
+    RUST = False
+
+
+def csr(up_ids, down_ids, n_nodes):
+    order = np.lexsort((down_ids, up_ids))
+    up_ids, down_ids = up_ids[order], down_ids[order]
+    offsets = np.zeros(n_nodes + 1, dtype=int)
+    offsets[1:] = np.cumsum(np.bincount(up_ids, minlength=n_nodes))
+    return up_ids, down_ids, offsets
+
+
+@pytest.mark.parametrize("use_rust", ["0", pytest.param("1", marks=pytest.mark.skipif(not RUST, reason="no Rust"))])
+def test_topological_labels_bifurcations(use_rust, monkeypatch):
+    monkeypatch.setenv("USE_RUST", use_rust)
+    # 0 bifurcates into 1 and 2, which rejoin at 3 via a longer branch 2 -> 4 -> 3
+    up_ids = np.array([0, 0, 1, 2, 4, 3, 5])
+    down_ids = np.array([1, 2, 3, 4, 3, 6, 6])
+    up_ids, down_ids, offsets = csr(up_ids, down_ids, 7)
+    sources = get_sources(7, down_ids)
+    sinks = get_sources(7, up_ids)
+
+    labels = compute_topological_labels_bifurcations(down_ids, offsets, sources, sinks)
+
+    # longest distance from a source, with the sink in the last group
+    np.testing.assert_array_equal(labels, [0, 1, 1, 3, 2, 0, 4])
+
+
+@pytest.mark.parametrize("use_rust", ["0", pytest.param("1", marks=pytest.mark.skipif(not RUST, reason="no Rust"))])
+def test_topological_labels_bifurcations_cycle(use_rust, monkeypatch):
+    monkeypatch.setenv("USE_RUST", use_rust)
+    _, down_ids, offsets = csr(np.array([0, 1, 2]), np.array([1, 2, 1]), 3)
+
+    with pytest.raises(ValueError, match="cycle"):
+        compute_topological_labels_bifurcations(down_ids, offsets, np.array([0]), np.array([], dtype=int))
+
+
+def test_topological_labels_bifurcations_empty(monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    empty = np.array([], dtype=int)
+
+    labels = compute_topological_labels_bifurcations(empty, np.zeros(1, dtype=int), empty, empty)
+
+    assert labels.shape == (0,)
+
+
+def wkb_points(x, y):
+    return [b"\x01" + np.uint32(1).tobytes() + np.array([xi, yi], dtype="<f8").tobytes() for xi, yi in zip(x, y)]
+
+
+@pytest.mark.parametrize("ext", ["parquet", "arrow"])
+def test_grit_columnar(ext, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    # a bifurcation at node 10 rejoining at node 40, with nodes stored out of order
+    x = np.array([0.0, 1.0, 2.0, 0.5, 1.5])
+    y = np.array([3.0, 2.0, 2.0, 1.0, 0.0])
+    node_ids = np.array([10, 30, 20, 40, 50])
+    nodes = pa.table({"global_id": node_ids, "geometry": pa.array(wkb_points(x, y), type=pa.binary())})
+    lines = pa.table(
+        {
+            "upstream_node_id": [10, 10, 20, 30, 40],
+            "downstream_node_id": [20, 30, 40, 40, 50],
+            "width_adjusted": [1.0, 3.0, None, 2.0, 5.0],
+            "unused": ["a", "b", "c", "d", "e"],
+        }
+    )
+    if ext == "parquet":
+        pyarrow.parquet.write_table(nodes, tmp_path / "nodes.parquet")
+        pyarrow.parquet.write_table(lines, tmp_path / "lines.parquet")
+    else:
+        pyarrow.feather.write_feather(nodes, tmp_path / "nodes.arrow", compression="uncompressed")
+        pyarrow.feather.write_feather(lines, tmp_path / "lines.arrow", compression="uncompressed")
+
+    network = ekh.river_network.create(str(tmp_path), "grit_parquet", use_cache=False)
+
+    assert network.n_nodes == 5
+    assert network.n_edges == 5
+    np.testing.assert_array_equal(network.coords["y"], [3.0, 2.0, 2.0, 1.0, 0.0])
+    np.testing.assert_array_equal(network.coords["x"], [0.0, 1.0, 2.0, 0.5, 1.5])
+    # the bifurcation splits by width, with missing widths counting as 1
+    did, uid, eid = network._storage.sorted_data
+    weights = dict(zip(zip(uid.tolist(), did.tolist()), network.edge_weights[eid]))
+    assert weights[(0, 2)] == pytest.approx(0.25)
+    assert weights[(0, 1)] == pytest.approx(0.75)
+
+    accumulated = ekh.upstream.array.sum(network, np.ones(5), edge_weights=network.edge_weights, return_type="masked")
+    np.testing.assert_allclose(accumulated, [1, 1.75, 1.25, 4, 5])
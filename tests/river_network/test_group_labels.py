@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+
+from earthkit.hydro._readers._core import get_sources
+from earthkit.hydro._readers.group_labels import compute_topological_labels
+
+try:
+    from earthkit.hydro._rust import compute_topological_labels_rust  # noQA: F401
+
+    RUST = True
+except ImportError:
+    RUST = False
+
+
+@pytest.mark.parametrize("use_rust", ["0", pytest.param("1", marks=pytest.mark.skipif(not RUST, reason="no Rust"))])
+def test_topological_labels(use_rust, monkeypatch):
+    monkeypatch.setenv("USE_RUST", use_rust)
+    # 0 -> 1 -> 2 -> 4 and 3 -> 2 join at 2, 5 is isolated and 6 -> 7
+    downstream_nodes = np.array([1, 2, 4, 2, 8, 8, 7, 8], dtype=np.uintp)
+    n_nodes = downstream_nodes.shape[0]
+    sources = get_sources(n_nodes, downstream_nodes[downstream_nodes != n_nodes]).astype(np.uintp)
+    sinks = np.flatnonzero(downstream_nodes == n_nodes).astype(np.uintp)
+
+    labels = compute_topological_labels(sources, sinks, downstream_nodes, n_nodes)
+
+    np.testing.assert_array_equal(labels, [0, 1, 2, 0, 3, 3, 0, 3])
+
+
+def test_topological_labels_cycle(monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    # 2 -> 0 <-> 1 is a cycle
+    downstream_nodes = np.array([1, 0, 0], dtype=np.uintp)
+
+    with pytest.raises(ValueError, match="cycle"):
+        compute_topological_labels(np.array([2], dtype=np.uintp), np.array([], dtype=np.uintp), downstream_nodes, 3)
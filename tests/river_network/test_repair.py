@@ -6,6 +6,14 @@ import pytest
 import xarray as xr
 
 import earthkit.hydro as ekh
+from earthkit.hydro.river_network._repair import set_missing_if_cycle
+
+try:
+    from earthkit.hydro._rust import find_cycles_rust  # noQA: F401
+
+    RUST = True
+except ImportError:
+    RUST = False
 
 
 def generate_ldd(data):
@@ -996,3 +1004,45 @@ def test_repair(tmp_path, input_da, output_da, fmt):
     print(result.values)
 
     xr.testing.assert_equal(result, output_da)
+
+
+@pytest.mark.parametrize(
+    "input_da, output_da, fmt",
+    [
+        (INPUT1, OUTPUT1, "pcr_d8"),
+        (INPUT2, OUTPUT2, "pcr_d8"),
+        (INPUT3, OUTPUT3, "pcr_d8"),
+        (INPUT4, OUTPUT4, "esri_d8"),
+    ],
+)
+def test_create_repaired(tmp_path, input_da, output_da, fmt):
+    input_file = str(tmp_path / "input.txt")
+    output_file = str(tmp_path / "output.txt")
+
+    input_da.to_netcdf(input_file)
+
+    network = ekh.river_network.create(input_file, fmt, use_cache=False, repair=True)
+    ekh.river_network.export(network, output_file, fmt)
+
+    result = xr.open_dataset(output_file, mask_and_scale=False)["ldd"]
+
+    xr.testing.assert_equal(result, output_da)
+
+
+@pytest.mark.parametrize("use_rust", ["0", pytest.param("1", marks=pytest.mark.skipif(not RUST, reason="no Rust"))])
+def test_set_missing_if_cycle(use_rust, monkeypatch):
+    monkeypatch.setenv("USE_RUST", use_rust)
+    # 0 flows into the cycle 1 <-> 2, 3 flows into itself and 4 -> 5 is valid
+    up = np.array([0, 1, 2, 3, 4])
+    down = np.array([1, 2, 1, 3, 5])
+    mask = np.ones((1, 7), dtype=bool)
+
+    up, down, mask, n_n, n_e, edge = set_missing_if_cycle(up, down, mask, 7, 5, np.arange(5))
+
+    # 1 still has 0 flowing into it so becomes a sink, 2 and 3 become missing
+    np.testing.assert_array_equal(mask, [[True, True, False, False, True, True, True]])
+    assert n_n == 5
+    assert n_e == 2
+    np.testing.assert_array_equal(up, [0, 2])
+    np.testing.assert_array_equal(down, [1, 3])
+    np.testing.assert_array_equal(edge, [0, 1])
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+import xarray as xr
+from _test_inputs.accumulation import *
+from _test_inputs.readers import *
+
+import earthkit.hydro as ekh
+
+
+def stacked_field(input_field, n_steps):
+    return xr.DataArray(
+        np.stack([input_field * (i + 1) for i in range(n_steps)]),
+        dims=["time", "node_index"],
+        coords={"time": np.arange(n_steps), "node_index": np.arange(len(input_field))},
+    )
+
+
+@pytest.mark.parametrize(
+    "river_network, input_field, expected",
+    [
+        (
+            ("cama_nextxy", cama_nextxy_1),
+            input_field_1c,
+            upstream_metric_sum_1c,
+        ),
+    ],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_streaming_apply_upstream_sum(river_network, input_field, expected, chunk_size):
+    """Test that streaming matches applying the operation to each time step."""
+    field_da = stacked_field(input_field, 7)
+
+    result = ekh.streaming.apply(ekh.upstream.sum, river_network, field_da, chunk_size=chunk_size, return_type="masked")
+
+    assert isinstance(result, xr.DataArray)
+    assert result.dims == ("time", "node_index")
+    np.testing.assert_array_equal(result["time"].values, np.arange(7))
+    for i in range(7):
+        np.testing.assert_allclose(result.values[i], expected * (i + 1), rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    "river_network, input_field",
+    [
+        (
+            ("cama_nextxy", cama_nextxy_1),
+            input_field_1c,
+        ),
+    ],
+    indirect=["river_network"],
+)
+def test_streaming_apply_zarr_sink(river_network, input_field, tmp_path):
+    """Test that streamed chunks are appended to a zarr sink."""
+    pytest.importorskip("zarr")
+    field_da = stacked_field(input_field, 5)
+
+    sink = tmp_path / "out.zarr"
+    assert (
+        ekh.streaming.apply(ekh.upstream.sum, river_network, field_da, chunk_size=2, sink=sink, return_type="gridded")
+        is None
+    )
+
+    result = xr.open_zarr(sink)["out"]
+    reference = ekh.upstream.sum(river_network, field_da, return_type="gridded")
+    np.testing.assert_allclose(result.values, reference.values, rtol=1e-6, equal_nan=True)
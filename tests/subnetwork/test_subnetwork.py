@@ -110,3 +110,66 @@ def test_crop(river_network):
 
     # Check that it's a different object
     assert cropped is not subnetwork
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [
+        ("cama_nextxy", cama_nextxy_1),
+        ("cama_nextxy", cama_nextxy_2),
+    ],
+    indirect=["river_network"],
+)
+def test_from_mask_segments(river_network):
+    """Test that a subnetwork's scatter segments stay consistent with its edges."""
+    node_mask = np.ones(river_network.n_nodes, dtype=bool)
+    node_mask[::3] = False
+
+    subnetwork = ekh.subnetwork.from_mask(river_network, node_mask=node_mask)
+    assert subnetwork.segments is not None
+
+    field = np.random.default_rng(0).standard_normal(subnetwork.n_nodes)
+    result = ekh.upstream.array.max(subnetwork, field, return_type="masked")
+
+    subnetwork.segments = None
+    expected = ekh.upstream.array.max(subnetwork, field, return_type="masked")
+    np.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [
+        ("cama_nextxy", cama_nextxy_1),
+        ("d8_ldd", d8_ldd_1),
+    ],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("nested", [False, True])
+def test_from_locations(river_network, nested):
+    """Test that a subnetwork of locations holds exactly their catchments."""
+    down_ids, up_ids, _ = river_network._storage.sorted_data
+    downstream = np.full(river_network.n_nodes, -1)
+    downstream[up_ids] = down_ids
+    # nested locations have one location in the catchment of the other
+    stations = [int(up_ids[0]), int(down_ids[0])] if nested else [0, river_network.n_nodes // 2]
+
+    subnetwork = ekh.subnetwork.from_locations(river_network, stations)
+
+    # nodes are in a catchment if one of the stations is downstream of them
+    node_mask = np.zeros(river_network.n_nodes, dtype=bool)
+    for start in range(river_network.n_nodes):
+        node = start
+        while node != -1 and node not in stations:
+            node = downstream[node]
+        node_mask[start] = node != -1
+    expected = ekh.subnetwork.from_mask(river_network, node_mask=node_mask)
+
+    assert subnetwork.n_nodes == expected.n_nodes
+    np.testing.assert_array_equal(subnetwork.mask, expected.mask)
+    np.testing.assert_array_equal(subnetwork._storage.sorted_data, expected._storage.sorted_data)
+
+    field = np.random.default_rng(0).standard_normal(subnetwork.n_nodes)
+    np.testing.assert_allclose(
+        ekh.upstream.array.sum(subnetwork, field, return_type="masked"),
+        ekh.upstream.array.sum(expected, field, return_type="masked"),
+    )
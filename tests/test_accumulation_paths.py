@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+
+import numpy as np
+import pytest
+from _test_inputs.readers import cama_nextxy_1, cama_nextxy_2, d8_ldd_1
+from utils import flow_accumulate_reference
+
+import earthkit.hydro as ekh
+from earthkit.hydro._core import accumulate
+from earthkit.hydro._readers.chains import compute_chain_schedule
+from earthkit.hydro.data_structures import RiverNetwork
+
+
+# each optional accumulation path is enabled by a function taking the monkeypatch fixture,
+# the river network and the flow direction, and returning the river network to use
+def node_major(monkeypatch, river_network, direction):
+    monkeypatch.setattr(accumulate, "NODE_MAJOR_MIN_BATCH", 1)
+    return river_network
+
+
+def rust(monkeypatch, river_network, direction):
+    pytest.importorskip("earthkit.hydro._rust")
+    monkeypatch.setenv("USE_RUST", "1")
+    return river_network
+
+
+def rust_reference(monkeypatch, river_network, direction):
+    # the glue around the kernel, with a numpy stand-in for the kernel itself
+    monkeypatch.setattr(accumulate, "get_rust_flow", lambda: flow_accumulate_reference)
+    return river_network
+
+
+def chains(monkeypatch, river_network, direction):
+    if direction != "upstream":
+        pytest.skip("chain schedules only apply to upstream accumulations")
+    storage = copy.copy(river_network._storage)
+    storage.chains = compute_chain_schedule(storage.n_nodes, storage.sorted_data, storage.splits)
+    river_network = RiverNetwork(storage)
+    assert len(river_network.chains) <= len(river_network.groups)
+    return river_network
+
+
+PATHS = {
+    "chains": chains,
+    "node_major": node_major,
+    "rust": rust,
+    "rust_reference": rust_reference,
+}
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [("cama_nextxy", cama_nextxy_1), ("cama_nextxy", cama_nextxy_2), ("d8_ldd", d8_ldd_1)],
+    indirect=["river_network"],
+)
+@pytest.mark.parametrize("direction", ["upstream", "downstream"])
+@pytest.mark.parametrize("metric", ["sum", "max", "min", "mean", "var"])
+@pytest.mark.parametrize("path", sorted(PATHS))
+def test_accumulation_path(river_network, direction, metric, path, monkeypatch):
+    """Test that an optional accumulation path gives the same result as the plain numpy path."""
+    rng = np.random.default_rng(0)
+    field = rng.standard_normal((4, 3, river_network.n_nodes))
+    node_weights = rng.uniform(size=river_network.n_nodes)
+    edge_weights = rng.uniform(size=river_network.n_edges)
+    func = getattr(getattr(ekh, direction).array, metric)
+
+    monkeypatch.setenv("USE_RUST", "0")
+    monkeypatch.setattr(accumulate, "NODE_MAJOR_MIN_BATCH", np.inf)
+    expected = func(river_network, field, node_weights, edge_weights, return_type="masked")
+
+    river_network = PATHS[path](monkeypatch, river_network, direction)
+    result = func(river_network, field, node_weights, edge_weights, return_type="masked")
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
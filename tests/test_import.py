@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(code):
+    # in a fresh interpreter, as earthkit.hydro is already fully imported by the other tests
+    code += "\nimport sys, json; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+def test_import_is_lazy():
+    modules = imported_modules("import earthkit.hydro")
+
+    for name in ["xarray", "joblib", "earthkit.utils", "earthkit.hydro.upstream", "earthkit.hydro.river_network"]:
+        assert name not in modules
+
+
+@pytest.mark.parametrize("subpackage", ["catchments", "distance", "downstream", "length", "move", "upstream"])
+def test_array_import_without_xarray(subpackage):
+    modules = imported_modules(f"import earthkit.hydro as ekh\nekh.{subpackage}.array")
+
+    assert f"earthkit.hydro.{subpackage}.array" in modules
+    assert "xarray" not in modules
+
+
+def test_subpackage_access():
+    import earthkit.hydro as ekh
+
+    assert ekh.upstream.sum is not None
+    assert "upstream" in dir(ekh)
+    name = "not_a_subpackage"
+    with pytest.raises(AttributeError, match=name):
+        getattr(ekh, name)
@@ -1,13 +1,19 @@
 # SPDX-FileCopyrightText: 2026- European Centre for Medium-Range Weather Forecasts (ECMWF)
 # SPDX-License-Identifier: Apache-2.0
 
+import sys
+
 import numpy as np
 import pytest
 from _test_inputs.accumulation import *
 from _test_inputs.readers import *
-from utils import convert_to_2d
+from utils import convert_to_2d, flow_accumulate_reference
 
 import earthkit.hydro as ekh
+from earthkit.hydro._core import accumulate
+from earthkit.hydro._readers import from_cama_nextxy
+from earthkit.hydro._readers._core import create_network
+from earthkit.hydro.data_structures import RiverNetwork
 
 
 @pytest.mark.parametrize(
@@ -54,3 +60,110 @@ def test_upstream_metric_sum(river_network, input_field, flow_downstream, mv, ar
     print(flow_downstream)
     assert output_field.dtype == flow_downstream.dtype
     np.testing.assert_allclose(output_field, flow_downstream, rtol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "river_network",
+    [("cama_nextxy", cama_nextxy_1), ("d8_ldd", d8_ldd_1)],
+    indirect=["river_network"],
+)
+def test_upstream_sum_rust_dispatch(river_network, monkeypatch):
+    # without the extension, auto-detection falls back to numpy
+    monkeypatch.delenv("USE_RUST", raising=False)
+    monkeypatch.setitem(sys.modules, "earthkit.hydro._rust", None)
+    assert accumulate.get_rust_flow() is None
+
+    calls = []
+
+    def kernel(*args):
+        calls.append(args)
+        return flow_accumulate_reference(*args)
+
+    monkeypatch.setattr(accumulate, "get_rust_flow", lambda: kernel)
+    rng = np.random.default_rng(0)
+    field = rng.standard_normal((2, 3, river_network.n_nodes))
+    ekh.upstream.array.sum(river_network, field, edge_weights=rng.uniform(size=river_network.n_edges))
+    assert len(calls) == 1
+
+    # the kernel takes one weight per edge, so batched edge weights fall back to numpy
+    ekh.upstream.array.sum(river_network, field, edge_weights=rng.uniform(size=(2, 3, river_network.n_edges)))
+    assert len(calls) == 1
+
+
+def test_upstream_sum_rust_empty(monkeypatch):
+    calls = []
+    monkeypatch.setattr(accumulate, "get_rust_flow", lambda: lambda *args: calls.append(args))
+    empty_network = RiverNetwork(
+        create_network(np.array([], dtype=int), np.array([], dtype=int), np.zeros(4, bool), (2, 2))
+    )
+    river_network = RiverNetwork(from_cama_nextxy(*cama_nextxy_1))
+
+    # empty networks and empty batches have nothing to accumulate, so they never reach the kernel
+    for network, field in [(empty_network, np.zeros((3, 0))), (river_network, np.zeros((0, river_network.n_nodes)))]:
+        result = ekh.upstream.array.sum(network, field, return_type="masked")
+        assert result.shape == field.shape
+    assert not calls
+
+
+@pytest.mark.parametrize(
+    "river_network, input_field, flow_downstream",
+    [
+        (("cama_nextxy", cama_nextxy_1), input_field_1c, upstream_metric_sum_1c),
+        (("d8_ldd", d8_ldd_1), input_field_1a, upstream_metric_sum_1a),
+    ],
+    indirect=["river_network"],
+)
+def test_upstream_sum_out(river_network, input_field, flow_downstream, monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    field = input_field.astype(np.float64)
+    expected = flow_downstream.astype(np.float64)
+
+    out = np.empty(river_network.n_nodes)
+    result = ekh.upstream.array.sum(river_network, field.copy(), return_type="masked", out=out)
+    assert result is out
+    np.testing.assert_allclose(out, expected, rtol=1e-6, equal_nan=True)
+
+    out = np.empty(river_network.shape)
+    result = ekh.upstream.array.sum(river_network, field.copy(), return_type="gridded", out=out)
+    assert result is out
+    expected_grid = np.full(int(np.prod(river_network.shape)), np.nan)
+    expected_grid[river_network.mask] = expected
+    np.testing.assert_allclose(out, expected_grid.reshape(river_network.shape), rtol=1e-6, equal_nan=True)
+
+    # the accumulation runs in place in the field
+    result = ekh.upstream.array.sum(river_network, field, return_type="masked", overwrite_input=True)
+    assert result is field
+    np.testing.assert_allclose(field, expected, rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("river_network", [("cama_nextxy", cama_nextxy_1)], indirect=["river_network"])
+def test_upstream_sum_out_invalid(river_network):
+    field = np.ones((2, river_network.n_nodes))
+    ny, nx = river_network.shape
+
+    # a transposed out cannot be reshaped without a copy, so it would silently stay unwritten
+    out = np.zeros((2, nx, ny)).transpose(0, 2, 1)
+    with pytest.raises(ValueError, match="C-contiguous"):
+        ekh.upstream.array.sum(river_network, field, return_type="gridded", out=out)
+
+    with pytest.raises(ValueError, match="shape"):
+        ekh.upstream.array.sum(river_network, field, return_type="gridded", out=np.empty((2, ny * nx)))
+    with pytest.raises(ValueError, match="shape"):
+        ekh.upstream.array.sum(river_network, field, return_type="masked", out=np.empty(river_network.n_nodes))
+    with pytest.raises(ValueError, match="dtype"):
+        ekh.upstream.array.sum(river_network, field, return_type="masked", out=np.empty(field.shape, np.float32))
+
+
+@pytest.mark.parametrize("river_network", [("cama_nextxy", cama_nextxy_1)], indirect=["river_network"])
+@pytest.mark.parametrize("dtype", [np.int64, np.float32])
+def test_upstream_sum_overwrite_input_dtype(river_network, dtype, monkeypatch):
+    monkeypatch.setenv("USE_RUST", "0")
+    field = np.arange(river_network.n_nodes).astype(dtype)
+    node_weights = np.full(river_network.n_nodes, 0.1)
+    expected = ekh.upstream.array.sum(river_network, field.astype(np.float64), node_weights, return_type="masked")
+
+    # the weighted field does not fit the field's dtype, so it is not accumulated in place
+    result = ekh.upstream.array.sum(river_network, field, node_weights, return_type="masked", overwrite_input=True)
+    assert result.dtype == np.float64
+    np.testing.assert_allclose(result, expected)
+    np.testing.assert_array_equal(field, np.arange(river_network.n_nodes).astype(dtype))
@@ -39,3 +39,12 @@ def test_upstream_sum_xarray(river_network, input_field, expected, mv):
 
     # Check values
     np.testing.assert_allclose(result.values, expected, rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("river_network", [("cama_nextxy", cama_nextxy_1)], indirect=["river_network"])
+@pytest.mark.parametrize("kwargs", [{"out": None}, {"overwrite_input": True}])
+def test_upstream_sum_xarray_rejects_array_only_args(river_network, kwargs):
+    field_da = xr.DataArray(np.ones(river_network.n_nodes), dims=["node_index"])
+
+    with pytest.raises(TypeError, match=r"earthkit\.hydro\.upstream\.array\.sum"):
+        ekh.upstream.sum(river_network, field_da, return_type="masked", **kwargs)
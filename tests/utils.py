@@ -74,3 +74,14 @@ def to_dataarray(river_network, values):
 def make_field(river_network, seed=0):
     """A deterministic pseudo-random field defined over the network's nodes."""
     return np.random.default_rng(seed).standard_normal(river_network.n_nodes)
+
+
+def flow_accumulate_reference(topo_groups, field, n_nodes, edge_weights, op, reverse):
+    """A numpy stand-in for the Rust ``flow_accumulate`` kernel, with the same signature."""
+    reduce = {"sum": np.add, "max": np.maximum, "min": np.minimum}[op]
+    state = field.reshape(-1, n_nodes).copy()
+    for did, uid, eid in topo_groups[::-1] if reverse else topo_groups:
+        source, target = (did, uid) if reverse else (uid, did)
+        values = state[:, source] if edge_weights is None else state[:, source] * edge_weights[eid]
+        reduce.at(state, (slice(None), target), values)
+    return state.reshape(-1)